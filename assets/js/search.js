@@ -0,0 +1,150 @@
+/*
+ * Site search over the sharded index written by search_index.py.
+ *
+ * meta.json (stemming rules) and docs.json (titles, URLs, summaries) are
+ * fetched on first use; after that a query only downloads the shards its
+ * terms fall in, and each shard is fetched once per page view.
+ */
+(function () {
+  'use strict';
+
+  var root = document.getElementById('site-search');
+  if (!root) {
+    return;
+  }
+
+  var indexUrl = root.getAttribute('data-index');
+  var baseurl = root.getAttribute('data-baseurl') || '';
+  var input = root.querySelector('input[type="search"]');
+  var status = root.querySelector('.site-search-status');
+  var results = root.querySelector('.site-search-results');
+  var index = null;
+  var shards = {};
+
+  function getJSON(url) {
+    return fetch(url).then(function (response) {
+      return response.ok ? response.json() : {};
+    });
+  }
+
+  function load() {
+    if (!index) {
+      index = Promise.all([getJSON(indexUrl + 'meta.json'), getJSON(indexUrl + 'docs.json')])
+        .then(function (parts) {
+          var meta = parts[0];
+          return {meta: meta, docs: parts[1], stopWords: new Set(meta.stop_words || [])};
+        });
+    }
+    return index;
+  }
+
+  // Must match stem() in search_index.py
+  function stem(word, rules) {
+    for (var i = 0; i < rules.length; i++) {
+      var suffix = rules[i][0];
+      if (word.length - suffix.length >= rules[i][2] && word.slice(-suffix.length) === suffix) {
+        word = word.slice(0, word.length - suffix.length) + rules[i][1];
+        break;
+      }
+    }
+    if (word.length > 4 && word.charAt(word.length - 1) === 'e') {
+      word = word.slice(0, -1);
+    }
+    return word;
+  }
+
+  function tokenize(text, ctx) {
+    var words = text.toLowerCase().match(/[a-z0-9]+/g) || [];
+    var terms = [];
+    words.forEach(function (word) {
+      if (word.length > 1 && !ctx.stopWords.has(word)) {
+        var term = stem(word, ctx.meta.stem_rules);
+        if (terms.indexOf(term) === -1) {
+          terms.push(term);
+        }
+      }
+    });
+    return terms;
+  }
+
+  function shard(prefix) {
+    if (!(prefix in shards)) {
+      shards[prefix] = getJSON(indexUrl + 'shards/' + encodeURIComponent(prefix) + '.json');
+    }
+    return shards[prefix];
+  }
+
+  // Same ranking as search() in search_index.py
+  function search(query) {
+    return load().then(function (ctx) {
+      var terms = tokenize(query, ctx);
+      var total = Object.keys(ctx.docs).length;
+      return Promise.all(terms.map(function (term) {
+        return shard(term.slice(0, ctx.meta.shard_prefix)).then(function (postings) {
+          return postings[term] || [];
+        });
+      })).then(function (lists) {
+        var scores = {};
+        lists.forEach(function (postings) {
+          if (!postings.length) {
+            return;
+          }
+          var idf = Math.log(1 + total / postings.length);
+          postings.forEach(function (posting) {
+            scores[posting[0]] = (scores[posting[0]] || 0) + idf * (1 + Math.log(posting[1]));
+          });
+        });
+        return Object.keys(scores)
+          .filter(function (id) { return ctx.docs[id]; })
+          .sort(function (a, b) { return scores[b] - scores[a] || (a < b ? -1 : 1); })
+          .slice(0, 20)
+          .map(function (id) { return ctx.docs[id]; });
+      });
+    });
+  }
+
+  function render(query, docs) {
+    results.innerHTML = '';
+    docs.forEach(function (doc) {
+      var item = document.createElement('li');
+      var link = document.createElement('a');
+      link.href = baseurl + doc.url;
+      link.textContent = doc.title;
+      item.appendChild(link);
+      if (doc.summary) {
+        var summary = document.createElement('p');
+        summary.textContent = doc.summary;
+        item.appendChild(summary);
+      }
+      results.appendChild(item);
+    });
+    status.textContent = query ? docs.length + (docs.length === 1 ? ' result' : ' results') : '';
+  }
+
+  var pending = 0;
+  function update() {
+    var query = input.value.trim();
+    var ticket = ++pending;
+    if (!query) {
+      render('', []);
+      return;
+    }
+    search(query).then(function (docs) {
+      if (ticket === pending) {
+        render(query, docs);
+      }
+    });
+  }
+
+  var timer = null;
+  input.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(update, 150);
+  });
+
+  var initial = new URLSearchParams(window.location.search).get('q');
+  if (initial) {
+    input.value = initial;
+    update();
+  }
+})();
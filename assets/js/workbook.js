@@ -0,0 +1,123 @@
+/*
+ * Paging and filtering for the sheet pages written by workbook_pages.py.
+ *
+ * The page ships the first rows as a static table. Further pages of rows
+ * (rows-NNN.json) are fetched as the reader pages to them; filtering
+ * fetches the remaining ones once and then matches in memory.
+ */
+(function () {
+  'use strict';
+
+  function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, function (c) {
+      return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+    });
+  }
+
+  function setup(root) {
+    var rowsUrl = root.getAttribute('data-rows');
+    var pageCount = parseInt(root.getAttribute('data-pages'), 10) || 0;
+    var pageSize = parseInt(root.getAttribute('data-page-size'), 10) || 500;
+    var total = parseInt(root.getAttribute('data-count'), 10) || 0;
+    var columns = JSON.parse(root.getAttribute('data-columns') || '[]');
+    var input = root.querySelector('.workbook-filter');
+    var container = root.querySelector('.workbook-rows');
+    var pager = root.querySelector('.workbook-pager');
+    var pages = {};
+    var current = 1;
+    var matches = null;
+    var pending = 0;
+
+    function fetchPage(number) {
+      if (!pages[number]) {
+        var name = 'rows-' + String(number).padStart(3, '0') + '.json';
+        pages[number] = fetch(rowsUrl + name).then(function (response) {
+          return response.ok ? response.json() : [];
+        });
+      }
+      return pages[number];
+    }
+
+    function render(rows, page, count) {
+      var html = ['<table class="table table-sm workbook-table"><thead><tr>'];
+      columns.forEach(function (column) {
+        html.push('<th>' + escapeHtml(column) + '</th>');
+      });
+      html.push('</tr></thead><tbody>');
+      rows.forEach(function (row) {
+        html.push('<tr>');
+        for (var i = 0; i < columns.length; i++) {
+          html.push('<td>' + escapeHtml(row[i] || '') + '</td>');
+        }
+        html.push('</tr>');
+      });
+      html.push('</tbody></table>');
+      container.innerHTML = html.join('');
+
+      var last = Math.max(1, Math.ceil(count / pageSize));
+      pager.innerHTML =
+        '<button type="button" class="btn btn-sm btn-outline-secondary" data-page="' + (page - 1) + '"' +
+        (page <= 1 ? ' disabled' : '') + '>&larr; Previous</button> ' +
+        '<span>Page ' + page + ' of ' + last + ' (' + count + ' rows)</span> ' +
+        '<button type="button" class="btn btn-sm btn-outline-secondary" data-page="' + (page + 1) + '"' +
+        (page >= last ? ' disabled' : '') + '>Next &rarr;</button>';
+    }
+
+    function show(page) {
+      current = page;
+      if (matches) {
+        render(matches.slice((page - 1) * pageSize, page * pageSize), page, matches.length);
+        return;
+      }
+      fetchPage(page).then(function (rows) {
+        if (!matches && current === page) {
+          render(rows, page, total);
+        }
+      });
+    }
+
+    function filter() {
+      var words = input.value.toLowerCase().split(/\s+/).filter(Boolean);
+      var request = ++pending;
+      if (!words.length) {
+        matches = null;
+        show(1);
+        return;
+      }
+      var all = [];
+      for (var number = 1; number <= pageCount; number++) {
+        all.push(fetchPage(number));
+      }
+      Promise.all(all).then(function (chunks) {
+        if (request !== pending) {
+          return;
+        }
+        matches = [];
+        chunks.forEach(function (rows) {
+          rows.forEach(function (row) {
+            var text = row.join(' ').toLowerCase();
+            if (words.every(function (word) { return text.indexOf(word) !== -1; })) {
+              matches.push(row);
+            }
+          });
+        });
+        show(1);
+      });
+    }
+
+    var timer = null;
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(filter, 150);
+    });
+    pager.addEventListener('click', function (event) {
+      var page = parseInt(event.target.getAttribute('data-page'), 10);
+      if (page) {
+        show(page);
+      }
+    });
+    show(1);
+  }
+
+  Array.prototype.forEach.call(document.querySelectorAll('.workbook-sheet'), setup);
+})();
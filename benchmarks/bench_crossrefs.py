@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Cross-reference rewriting benchmark
+
+Compares the old one-regex-per-section rewrite with CrossReferenceRewriter
+on synthetic guides of 20, 200 and 2,000 sections.
+
+Usage:
+    python3 benchmarks/bench_crossrefs.py
+    python3 benchmarks/bench_crossrefs.py --sizes 20 200 --sample 10
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from convert_to_jekyll_improved import CrossReferenceRewriter  # noqa: E402
+
+WORDS = [
+    "security", "risk", "control", "asset", "identity", "access", "threat",
+    "incident", "response", "program", "governance", "vendor", "recovery",
+    "network", "cloud", "awareness", "policy", "audit", "data", "endpoint",
+]
+
+
+def make_sections(count: int) -> List[Dict]:
+    """Build section metadata with unique titles."""
+    rng = random.Random(count)
+    sections = []
+    for number in range(1, count + 1):
+        words = [w.capitalize() for w in rng.sample(WORDS, 3)]
+        title = f"{' '.join(words)} Guide {number}"
+        slug = title.lower().replace(' ', '-')
+        sections.append({
+            'number': number,
+            'title': title,
+            'raw_title': f"**{title}**",
+            'slug': slug,
+            'permalink': f"/{slug}/",
+        })
+    return sections
+
+
+def make_document(sections: List[Dict], rng: random.Random, links: int = 40, size_kb: int = 30) -> str:
+    """Build a markdown document of roughly size_kb with links to random sections."""
+    paragraphs = []
+    while sum(len(p) for p in paragraphs) < size_kb * 1024:
+        paragraphs.append(' '.join(rng.choice(WORDS) for _ in range(80)))
+    for _ in range(links):
+        target = rng.choice(sections)
+        index = rng.randrange(len(paragraphs))
+        paragraphs[index] += f"\n\nSee [{target['title']}](../old-link.md) and [plain link](https://example.com)."
+    return '\n\n'.join(paragraphs)
+
+
+def legacy_rewrite(content: str, sections: List[Dict]) -> str:
+    """The previous update_links_between_sections() inner loop."""
+    for other_section in sections:
+        patterns = [
+            rf'\[([^\]]*{re.escape(other_section["raw_title"])}[^\]]*)\]\([^)]*\)',
+            rf'\[([^\]]*{re.escape(other_section["title"])}[^\]]*)\]\([^)]*\)',
+        ]
+        for pattern in patterns:
+            target_permalink = other_section.get('permalink', f"/{other_section['slug']}/")
+            content = re.sub(pattern, f'[\\1]({target_permalink})', content)
+    return content
+
+
+def run(size: int, sample: int) -> Dict:
+    """Time both engines on `sample` documents and project to the full guide."""
+    rng = random.Random(size)
+    sections = make_sections(size)
+    documents = [make_document(sections, rng) for _ in range(min(sample, size))]
+
+    start = time.perf_counter()
+    legacy = [legacy_rewrite(doc, sections) for doc in documents]
+    legacy_per_doc = (time.perf_counter() - start) / len(documents)
+
+    start = time.perf_counter()
+    rewriter = CrossReferenceRewriter(sections)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    rewritten = [rewriter.rewrite(doc) for doc in documents]
+    rewriter_per_doc = (time.perf_counter() - start) / len(documents)
+
+    if legacy != rewritten:
+        raise AssertionError(f"Rewriter output differs from legacy output at {size} sections")
+
+    return {
+        'sections': size,
+        'legacy_ms_per_doc': legacy_per_doc * 1000,
+        'rewriter_ms_per_doc': rewriter_per_doc * 1000,
+        'legacy_total_s': legacy_per_doc * size,
+        'rewriter_total_s': build_time + rewriter_per_doc * size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cross-reference rewriting")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 200, 2000])
+    parser.add_argument('--sample', type=int, default=5,
+                        help="documents actually rewritten per size; totals are projected")
+    args = parser.parse_args()
+
+    print(f"{'sections':>8}  {'legacy ms/doc':>14}  {'rewriter ms/doc':>16}  "
+          f"{'legacy total s':>15}  {'rewriter total s':>17}  {'speedup':>8}")
+    for size in args.sizes:
+        result = run(size, args.sample)
+        speedup = result['legacy_total_s'] / result['rewriter_total_s']
+        print(f"{result['sections']:>8}  {result['legacy_ms_per_doc']:>14.2f}  "
+              f"{result['rewriter_ms_per_doc']:>16.2f}  {result['legacy_total_s']:>15.2f}  "
+              f"{result['rewriter_total_s']:>17.2f}  {speedup:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
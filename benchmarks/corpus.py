@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Synthetic CISOinaBox source tree generator
+
+Builds a content repository shaped like the real one: numbered
+"NN - Title" section directories with a Readme.md, optional assets, and a
+minimal Jekyll site directory for the converter to write into.
+
+Usage:
+    python3 benchmarks/corpus.py /tmp/corpus --sections 200 --doc-kb 40
+"""
+
+import argparse
+import random
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+SITE_ROOT = Path(__file__).resolve().parent.parent
+
+TOPIC_WORDS = [
+    "Risk", "Threat", "Controls", "Architecture", "Engineering", "Management",
+    "Leadership", "Awareness", "Operations", "Governance", "Compliance",
+    "Continuity", "Vulnerability", "Frameworks", "Identity", "Cloud", "Vendor",
+    "Privacy", "Network", "Endpoint", "Data", "Incident", "Response", "Resources",
+]
+FILLER_WORDS = [
+    "security", "program", "policy", "asset", "team", "process", "control",
+    "review", "attack", "access", "monitoring", "baseline", "maturity", "budget",
+    "board", "metrics", "evidence", "exposure", "patch", "backup", "training",
+]
+ASSET_EXTENSIONS = ['pdf', 'xlsx', 'png', 'docx']
+
+CONFIG_TEMPLATE = """title: Benchmark Site
+baseurl: "/bench"
+
+# Navigation Bar
+navbar-links:
+  Resources:
+    - Contributing: "/contributing/"
+
+markdown: kramdown
+"""
+
+
+def section_titles(count: int, rng: random.Random) -> List[str]:
+    titles = []
+    for number in range(1, count + 1):
+        words = rng.sample(TOPIC_WORDS, 2)
+        titles.append(f"{words[0]} and {words[1]} Guide {number}")
+    return titles
+
+
+def paragraph(rng: random.Random, words: int = 90) -> str:
+    text = ' '.join(rng.choice(FILLER_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def make_readme(number: int, titles: List[str], rng: random.Random, doc_kb: int,
+                cross_links: int, assets: List[str]) -> str:
+    """A readme of roughly doc_kb kilobytes with headings, cross-links and asset links."""
+    parts = [f"# {titles[number - 1]}\n"]
+    heading = 1
+    while sum(len(part) for part in parts) < doc_kb * 1024:
+        if len(parts) % 6 == 1:
+            parts.append(f"## Part {heading}\n")
+            heading += 1
+        parts.append(paragraph(rng) + '\n')
+
+    for _ in range(cross_links):
+        target = rng.randrange(len(titles))
+        parts.insert(rng.randrange(1, len(parts)),
+                     f"See [{titles[target]}](../{target + 1:02d}/Readme.md) for more.\n")
+    for asset in assets:
+        label = asset.rsplit('.', 1)[0]
+        parts.append(f"- [{label}]({asset.replace(' ', '%20')})\n")
+    return '\n'.join(parts)
+
+
+def generate_corpus(root: Path, sections: int = 22, doc_kb: int = 30, cross_links: int = 10,
+                    assets: int = 1, asset_kb: int = 64, seed: int = 0) -> Dict:
+    """Create source sections under root and an empty site under root/site."""
+    rng = random.Random(seed)
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    titles = section_titles(sections, rng)
+    total_bytes = 0
+    for number, title in enumerate(titles, start=1):
+        section_dir = root / f"{number:02d} - {title}"
+        section_dir.mkdir()
+
+        asset_names = []
+        for index in range(assets):
+            extension = ASSET_EXTENSIONS[(number + index) % len(ASSET_EXTENSIONS)]
+            name = f"Section {number} Asset {index + 1}.{extension}"
+            (section_dir / name).write_bytes(rng.randbytes(asset_kb * 1024))
+            asset_names.append(name)
+
+        readme = make_readme(number, titles, rng, doc_kb, cross_links, asset_names)
+        (section_dir / 'Readme.md').write_text(readme, encoding='utf-8')
+        total_bytes += len(readme)
+
+    site = root / 'site'
+    (site / 'docs').mkdir(parents=True)
+    (site / '_config.yml').write_text(CONFIG_TEMPLATE, encoding='utf-8')
+    for script in ('rebuild_navigation.py', 'categorization.py', 'page_metadata.py', 'build_profile.py',
+                   'site_output.py', 'site_navigation.py'):
+        shutil.copy2(SITE_ROOT / script, site / script)
+
+    return {'root': root, 'site': site, 'sections': sections, 'content_bytes': total_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic CISOinaBox source tree")
+    parser.add_argument('root', type=Path)
+    parser.add_argument('--sections', type=int, default=22)
+    parser.add_argument('--doc-kb', type=int, default=30)
+    parser.add_argument('--cross-links', type=int, default=10)
+    parser.add_argument('--assets', type=int, default=1)
+    parser.add_argument('--asset-kb', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.root, args.sections, args.doc_kb, args.cross_links,
+                             args.assets, args.asset_kb, args.seed)
+    print(f"✅ Generated {corpus['sections']} sections ({corpus['content_bytes'] // 1024} KB) in {corpus['root']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Converter benchmark suite
+
+Generates synthetic source trees, runs ImprovedCISOToJekyllConverter.convert()
+and rebuild_navigation.py against them, and times each phase separately:
+discovery, processing, categorization, cross-linking, search indexing,
+navigation and validation. Three scenarios are measured per size: a cold build, a warm
+no-op rebuild, and a rebuild after editing one section.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py                      # print results
+    python3 benchmarks/run_benchmarks.py --save-baseline      # refresh benchmarks/baseline.json
+    python3 benchmarks/run_benchmarks.py --compare --tolerance 0.5   # CI regression check
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import runpy
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+import convert_to_jekyll_improved as converter_module  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+PHASES = ['discovery', 'processing', 'categorization', 'cross-linking', 'search', 'navigation', 'validation']
+SCENARIOS = ['cold', 'warm', 'edit']
+
+# Phases shorter than this are too noisy to flag as regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+
+class PhaseTimer:
+    """Exclusive wall time per phase: time spent in a nested phase is not
+    counted again in the phase that called it."""
+
+    def __init__(self):
+        self.totals = {phase: 0.0 for phase in PHASES}
+        self.stack = []
+        self.restore = []
+
+    def _enter(self, phase: str):
+        now = time.perf_counter()
+        if self.stack:
+            outer, started = self.stack[-1]
+            self.totals[outer] += now - started
+        self.stack.append((phase, now))
+
+    def _exit(self):
+        now = time.perf_counter()
+        phase, started = self.stack.pop()
+        self.totals[phase] += now - started
+        if self.stack:
+            self.stack[-1] = (self.stack[-1][0], now)
+
+    def wrap(self, owner, name: str, phase: str):
+        """Time calls to owner.name as phase until restore_all()."""
+        original = getattr(owner, name)
+        timer = self
+
+        def timed(*args, **kwargs):
+            timer._enter(phase)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                timer._exit()
+
+        had_own = name in vars(owner)
+        setattr(owner, name, timed)
+        self.restore.append((owner, name, original if had_own else None))
+
+    def restore_all(self):
+        for owner, name, original in reversed(self.restore):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self.restore = []
+
+
+def run_converter(root: Path, site: Path) -> Dict:
+    """One convert() run with per-phase timing."""
+    converter = converter_module.ImprovedCISOToJekyllConverter(str(root), str(site))
+    timer = PhaseTimer()
+    timer.wrap(converter, 'find_sections', 'discovery')
+    for name in ('scan_section_inputs', 'process_section', 'resolve_output_page', 'generate_markdown_file'):
+        timer.wrap(converter, name, 'processing')
+    timer.wrap(converter.category_engine, 'categorize', 'categorization')
+    timer.wrap(converter_module.CrossReferenceRewriter, '__init__', 'cross-linking')
+    timer.wrap(converter_module.CrossReferenceRewriter, 'rewrite', 'cross-linking')
+    timer.wrap(converter_module, 'document_terms', 'search')
+    timer.wrap(converter_module, 'summarize', 'search')
+    timer.wrap(converter_module.SearchIndex, 'update', 'search')
+    timer.wrap(converter, 'generate_navigation', 'navigation')
+    timer.wrap(converter, 'update_navigation', 'navigation')
+    timer.wrap(converter, 'validate_site', 'validation')
+
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = converter.convert()
+    finally:
+        timer.restore_all()
+    total = time.perf_counter() - started
+
+    if report['errors']:
+        raise RuntimeError(f"Converter reported errors: {report['errors'][:3]}")
+    return {'total': total, 'phases': timer.totals, 'rebuilt': report['sections_rebuilt']}
+
+
+def run_navigation(site: Path) -> float:
+    """Time rebuild_navigation.py against the generated site."""
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        runpy.run_path(str(site / 'rebuild_navigation.py'), run_name='__main__')
+    return time.perf_counter() - started
+
+
+def edit_one_section(root: Path):
+    readme = sorted(root.glob('* - */Readme.md'))[0]
+    with open(readme, 'a', encoding='utf-8') as f:
+        f.write('\nAn edit made by the benchmark.\n')
+
+
+def run_size(sections: int, options: argparse.Namespace) -> Dict:
+    """Best-of-N timings for each scenario at one corpus size."""
+    best = {}
+
+    def keep_best(scenario: str, result: Dict):
+        if scenario not in best or result['total'] < best[scenario]['total']:
+            best[scenario] = result
+
+    for _ in range(options.repeat):
+        with tempfile.TemporaryDirectory(prefix='ciso-bench-') as tmp:
+            corpus = generate_corpus(Path(tmp) / 'corpus', sections, options.doc_kb,
+                                     options.cross_links, options.assets)
+            steps: List[tuple] = [('cold', None), ('warm', None), ('edit', edit_one_section)]
+            for scenario, prepare in steps:
+                if prepare:
+                    prepare(corpus['root'])
+                result = run_converter(corpus['root'], corpus['site'])
+                result['rebuild_navigation'] = run_navigation(corpus['site'])
+                keep_best(scenario, result)
+    return best
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions beyond tolerance, as printable lines."""
+    regressions = []
+    for size, scenarios in baseline.get('results', {}).items():
+        for scenario, expected in scenarios.items():
+            actual = results.get(size, {}).get(scenario)
+            if not actual:
+                continue
+            checks = [('total', expected['total'], actual['total']),
+                      ('rebuild_navigation', expected['rebuild_navigation'], actual['rebuild_navigation'])]
+            checks += [(phase, expected['phases'][phase], actual['phases'][phase]) for phase in expected['phases']]
+            for name, before, after in checks:
+                if after > before * (1 + tolerance) and after - before > MIN_REGRESSION_SECONDS:
+                    regressions.append(f"{size} {scenario} {name}: {before * 1000:.1f} ms → {after * 1000:.1f} ms "
+                                       f"(+{(after / before - 1) * 100 if before else float('inf'):.0f}%)")
+    return regressions
+
+
+def print_results(results: Dict):
+    header = f"{'size':>6} {'scenario':>8} {'total':>9} " + ' '.join(f"{phase[:12]:>12}" for phase in PHASES) + f" {'rebuild_nav':>11}"
+    print(header)
+    for size, scenarios in results.items():
+        for scenario in SCENARIOS:
+            result = scenarios[scenario]
+            phases = ' '.join(f"{result['phases'][phase] * 1000:>10.1f}ms" for phase in PHASES)
+            print(f"{size:>6} {scenario:>8} {result['total'] * 1000:>7.1f}ms {phases} "
+                  f"{result['rebuild_navigation'] * 1000:>9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CISOinaBox converter")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[22, 200])
+    parser.add_argument('--doc-kb', type=int, default=30)
+    parser.add_argument('--cross-links', type=int, default=10)
+    parser.add_argument('--assets', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3, help="keep the best of N runs")
+    parser.add_argument('--output', type=Path, help="write results JSON here")
+    parser.add_argument('--save-baseline', nargs='?', type=Path, const=DEFAULT_BASELINE,
+                        help=f"write results as the new baseline (default {DEFAULT_BASELINE.name})")
+    parser.add_argument('--compare', nargs='?', type=Path, const=DEFAULT_BASELINE,
+                        help="fail if any phase is slower than this baseline beyond --tolerance")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown as a fraction (0.25 = 25%%)")
+    options = parser.parse_args()
+
+    results = {f"s{size}": run_size(size, options) for size in options.sizes}
+    document = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'options': {'doc_kb': options.doc_kb, 'cross_links': options.cross_links,
+                    'assets': options.assets, 'repeat': options.repeat},
+        'results': results,
+    }
+    print_results(results)
+
+    for path in (options.output, options.save_baseline):
+        if path:
+            path.write_text(json.dumps(document, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+            print(f"💾 Wrote {path}")
+
+    if options.compare:
+        baseline = json.loads(options.compare.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, options.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {options.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  • {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {options.tolerance:.0%} against {options.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,61 +5,46 @@
 #   ./build.sh              # Build the site only
 #   ./build.sh serve        # Build and serve on port 4000 (default)
 #   ./build.sh serve 4001   # Build and serve on custom port
+#                           # (preview_server.py: cached, gzip/brotli, ETags, live reload, baseurl)
+#   FORCE=1 ./build.sh      # Ignore the build manifest and rebuild every section
+#   JOBS=4 ./build.sh       # Process sections on 4 worker threads (0 = one per CPU)
+#   ./build.sh watch        # Rebuild affected pages on every source edit
+#   ./build.sh preview      # Build, render docs/ in Python (no Ruby/Jekyll) and serve that on port 4000
+#   ./build.sh preview 4001 #   ... on a custom port
+#   PROFILE=build-profile.json ./build.sh   # Write per-phase/per-section timings
+#   PERMALINK_POLICY=hand-authored,section-number ./build.sh   # Precedence for duplicate permalinks
+#   NAV_OUTPUT=data ./build.sh   # Write navigation to _data/navigation.yml and leave _config.yml alone
+#   STREAM=1 ./build.sh     # Hold no section text between passes (memory stays near one section)
+#   CHECK_LINKS=1 ./build.sh   # Also re-check external links whose cached result is stale
+#
+# Every step runs in one Python process (site_cli.py); see `python3 site_cli.py --help`.
 
 set -e
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 cd "$SCRIPT_DIR"
 
-echo "=== Building CISOinaBox Site ==="
-
-# Step 1: Run the conversion script (cleans docs/ and regenerates)
-echo ""
-echo ">> Running conversion script..."
-python3 convert_to_jekyll_improved.py
+OPTIONS=(${FORCE:+--force} ${JOBS:+--jobs "$JOBS"} ${PERMALINK_POLICY:+--permalink-policy "$PERMALINK_POLICY"}
+         ${NAV_OUTPUT:+--nav-output "$NAV_OUTPUT"} ${STREAM:+--stream})
 
-# Step 2: Remove any leftover duplicates that the converter might have missed
-echo ""
-echo ">> Checking for duplicates..."
-declare -A seen_permalinks
-dupes_found=0
-for f in docs/*.markdown; do
-    permalink=$(grep "^permalink:" "$f" | sed 's/permalink: *//' | tr -d '/')
-    if [[ -n "${seen_permalinks[$permalink]}" ]]; then
-        echo "   Removing duplicate: $f (conflicts with ${seen_permalinks[$permalink]})"
-        # Keep the one that's NOT auto-generated (prefer hand-crafted files)
-        if [[ "$f" == *ciso-resources* ]]; then
-            rm "$f"
-        elif [[ "${seen_permalinks[$permalink]}" == *ciso-resources* ]]; then
-            rm "${seen_permalinks[$permalink]}"
-            seen_permalinks[$permalink]="$f"
-        else
-            rm "$f"
-        fi
-        dupes_found=$((dupes_found + 1))
-    else
-        seen_permalinks[$permalink]="$f"
-    fi
-done
-if [[ $dupes_found -eq 0 ]]; then
-    echo "   No duplicates found"
+if [[ "$1" == "watch" ]]; then
+    exec python3 site_cli.py watch "${OPTIONS[@]}"
 fi
 
-# Step 3: Rebuild navigation to match the final set of pages
-echo ""
-echo ">> Rebuilding navigation..."
-python3 rebuild_navigation.py
+if [[ "$1" == "preview" ]]; then
+    exec python3 site_cli.py serve --build --preview "${2:-4000}" "${OPTIONS[@]}"
+fi
 
-echo ""
-echo "=== Build Complete ==="
-echo "   Pages: $(ls docs/*.markdown | wc -l)"
-echo ""
+# Convert the sections changed since the last build (keeping one page per
+# permalink, reporting any page it drops), write navigation for the final
+# set of pages (only if it changed), and write .gz/.br siblings for a site
+# Jekyll has already built (only files that changed since the last run are
+# recompressed)
+BUILD_OPTIONS=("${OPTIONS[@]}" ${PROFILE:+--profile "$PROFILE"} ${CHECK_LINKS:+--check-external})
 
-# Step 4: Optionally serve the site
 if [[ "$1" == "serve" ]]; then
-    PORT="${2:-4000}"
-    echo ">> Serving site on http://localhost:$PORT"
-    echo "   Press Ctrl+C to stop"
-    echo ""
-    python3 -m http.server "$PORT" --directory _site
+    # Serves _site, reloading open pages when it changes
+    exec python3 site_cli.py serve --build "${2:-4000}" "${BUILD_OPTIONS[@]}"
 fi
+
+python3 site_cli.py build "${BUILD_OPTIONS[@]}"
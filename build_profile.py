@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Build instrumentation for the converter
+
+Records wall time, bytes read and written, file opens and regex operations
+per phase and per section. A profiler is activated for the duration of a
+build; module-level helpers count against whichever profiler is active, so
+code outside the converter class (hashing, front matter reads, the asset
+store) is measured without passing the profiler around.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+COUNTERS = ('bytes_read', 'bytes_written', 'file_opens', 'regex_ops')
+
+
+def _empty_metrics() -> Dict:
+    metrics = {'wall_ms': 0.0}
+    metrics.update((counter, 0) for counter in COUNTERS)
+    return metrics
+
+
+class BuildProfiler:
+    """Phase and per-section metrics for one build."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+        self.phases = {}
+        self.sections = {}
+        self.totals = dict.fromkeys(COUNTERS, 0)
+        self.events = []
+        self.current_phase = None
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def _event(self, name: str, category: str, start_us: float, end_us: float, args: Dict):
+        self.events.append({
+            'name': name, 'cat': category, 'ph': 'X',
+            'ts': round(start_us, 1), 'dur': round(end_us - start_us, 1),
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args
+        })
+
+    @contextmanager
+    def phase(self, name: str):
+        """Attribute time and counters to a build phase."""
+        with self.lock:
+            metrics = self.phases.setdefault(name, _empty_metrics())
+        previous, self.current_phase = self.current_phase, name
+        start = self._now_us()
+        try:
+            yield metrics
+        finally:
+            end = self._now_us()
+            self.current_phase = previous
+            with self.lock:
+                metrics['wall_ms'] += (end - start) / 1000
+                self._event(name, 'phase', start, end, {})
+
+    @contextmanager
+    def section(self, key: str, stage: str):
+        """Attribute time and counters on this thread to a section."""
+        with self.lock:
+            metrics = self.sections.setdefault(key, _empty_metrics())
+        previous, self.local.section = getattr(self.local, 'section', None), key
+        start = self._now_us()
+        try:
+            yield metrics
+        finally:
+            end = self._now_us()
+            self.local.section = previous
+            with self.lock:
+                metrics['wall_ms'] += (end - start) / 1000
+                self._event(f"{stage} {key}", 'section', start, end, {'phase': self.current_phase})
+
+    def count(self, counter: str, amount: int = 1):
+        with self.lock:
+            self.totals[counter] += amount
+            if self.current_phase:
+                self.phases[self.current_phase][counter] += amount
+            section = getattr(self.local, 'section', None)
+            if section:
+                self.sections[section][counter] += amount
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            return {
+                'phases': {name: _rounded(metrics) for name, metrics in self.phases.items()},
+                'sections': {key: _rounded(metrics) for key, metrics in sorted(self.sections.items())},
+                'totals': dict(self.totals, wall_ms=round((time.perf_counter() - self.origin) * 1000, 3))
+            }
+
+    def write(self, path: Path, trace_format: str = 'json', extra: Optional[Dict] = None):
+        """Write metrics as JSON, or as a Chrome trace (chrome://tracing, Perfetto)."""
+        if trace_format == 'chrome':
+            document = {'traceEvents': self.events, 'displayTimeUnit': 'ms', 'otherData': self.to_dict()}
+        else:
+            document = self.to_dict()
+        if extra:
+            (document['otherData'] if trace_format == 'chrome' else document).update(extra)
+        Path(path).write_text(json.dumps(document, indent=2) + '\n', encoding='utf-8')
+
+
+def _rounded(metrics: Dict) -> Dict:
+    return dict(metrics, wall_ms=round(metrics['wall_ms'], 3))
+
+
+class _NullProfiler:
+    """Stand-in when no build is being profiled."""
+
+    def count(self, counter: str, amount: int = 1):
+        pass
+
+
+_active = _NullProfiler()
+
+
+def active():
+    return _active
+
+
+@contextmanager
+def activate(profiler: BuildProfiler):
+    """Make profiler the target of count_* helpers for the duration of a build."""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def count_read(nbytes: int):
+    _active.count('file_opens')
+    _active.count('bytes_read', nbytes)
+
+
+def count_write(nbytes: int):
+    _active.count('file_opens')
+    _active.count('bytes_written', nbytes)
+
+
+def count_regex(operations: int = 1):
+    _active.count('regex_ops', operations)
+
+
+# cProfile follows only the thread that enables it; while run_with_hooks()
+# profiles a build, worker threads profile their tasks into this list
+_worker_profilers = None
+_worker_profilers_lock = threading.Lock()
+
+
+@contextmanager
+def worker_profile():
+    """Profile a task on a worker thread into the running cProfile session, if any."""
+    profilers = _worker_profilers
+    if profilers is None:
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ profiles every thread from one profiler and allows no second
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _worker_profilers_lock:
+            profilers.append(profiler)
+
+
+def run_with_hooks(func: Callable, cprofile_path: Optional[Path] = None,
+                   trace_memory: bool = False, top: int = 15):
+    """Call func under optional cProfile and tracemalloc, returning (result, findings).
+
+    Tasks run under worker_profile() on other threads are merged into the profile.
+    """
+    global _worker_profilers
+    findings = {}
+    profiler = None
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    if cprofile_path:
+        import cProfile
+        _worker_profilers = []
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        result = func()
+    finally:
+        if profiler:
+            import pstats
+            profiler.disable()
+            workers, _worker_profilers = _worker_profilers, None
+            stats = pstats.Stats(profiler)
+            for worker in workers:
+                stats.add(worker)
+            stats.dump_stats(str(cprofile_path))
+            hot = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            findings['hot_functions'] = [
+                {'function': f"{Path(filename).name}:{line}({name})", 'calls': calls,
+                 'total_s': round(total, 4), 'cumulative_s': round(cumulative, 4)}
+                for (filename, line, name), (_, calls, total, cumulative, _) in hot
+            ]
+        if trace_memory:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            findings['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            findings['top_allocations'] = [
+                {'site': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                for stat in snapshot.statistics('lineno')[:top]
+            ]
+    return result, findings
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Keyword-based navigation categorization shared by the converter and
+rebuild_navigation.py
+
+Usage:
+    python3 categorization.py docs/cyber-insurance.markdown   # show per-category scores
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Navigation categories in display order. Keywords are matched against word
+# tokens; each keyword token also matches longer words it starts ("risk"
+# matches "risks"), so multi-word keywords work as phrases.
+NAV_CATEGORIES = {
+    "Getting Started": {
+        "keywords": ["getting started", "overview", "introduction"],
+        "description": "Basic introduction and getting started guide"
+    },
+    "Risk & Threat Management": {
+        "keywords": ["risk", "threat", "adversary", "attack surface"],
+        "description": "Risk assessment and threat intelligence"
+    },
+    "Security Controls": {
+        "keywords": ["cis18", "controls", "architecture", "engineering", "product security", "business process"],
+        "description": "Technical security controls and architecture"
+    },
+    "Security Program": {
+        "keywords": ["management", "leadership", "awareness", "operations", "incident response"],
+        "description": "Security program management and operations"
+    },
+    "Compliance & Resilience": {
+        "keywords": ["governance", "compliance", "continuity", "disaster recovery", "vulnerability"],
+        "description": "Compliance, governance, and resilience planning"
+    },
+    "Advanced Topics": {
+        "keywords": ["frameworks", "careers", "cyber insurance", "resources"],
+        "description": "Advanced topics and career development"
+    }
+}
+
+# A keyword counts once per field it appears in. Headings are already part of
+# the body, so they carry no extra weight: "Vulnerability Management and Risk"
+# ties 25-25 between Security Program and Compliance & Resilience on title and
+# body, and any heading weight breaks that tie away from Security Program,
+# where the site has always listed it. At 0 the heading scan is skipped.
+FIELD_WEIGHTS = {
+    'title': 10,
+    'headings': 0,
+    'body': 3
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+HEADING_PATTERN = re.compile(r'^#{1,6}[ \t]+(.*)$', re.MULTILINE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class CategoryEngine:
+    """Scores documents against every category's keywords in one pass per field.
+
+    Keywords are compiled once into an index keyed by their first token, so
+    each document token costs a handful of dictionary lookups no matter how
+    many categories or keywords there are.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]],
+                 field_weights: Optional[Dict[str, float]] = None,
+                 default: Optional[str] = None):
+        self.categories = list(categories)
+        self.field_weights = dict(FIELD_WEIGHTS if field_weights is None else field_weights)
+        self.default = default if default is not None else self.categories[0]
+
+        # keyword text -> (tokens, category indexes)
+        self.keywords = {}
+        for index, name in enumerate(self.categories):
+            for keyword in categories[name]:
+                tokens = tuple(tokenize(keyword))
+                if tokens:
+                    self.keywords.setdefault(keyword, (tokens, []))[1].append(index)
+
+        self.index = {}
+        for keyword, (tokens, _) in self.keywords.items():
+            self.index.setdefault(tokens[0], []).append(keyword)
+        self.prefix_lengths = sorted({len(first) for first in self.index})
+        self._candidate_cache = {}
+
+    @classmethod
+    def from_nav_categories(cls, nav_categories: Dict[str, Dict], **kwargs) -> 'CategoryEngine':
+        return cls({name: info['keywords'] for name, info in nav_categories.items()}, **kwargs)
+
+    def split_fields(self, title: str, content: str) -> Dict[str, List[str]]:
+        """Tokenize each weighted field once. The body is the whole document."""
+        return {
+            'title': tokenize(title),
+            'headings': tokenize('\n'.join(HEADING_PATTERN.findall(content))) if self.field_weights.get('headings') else [],
+            'body': tokenize(content) if self.field_weights.get('body') else []
+        }
+
+    def _candidates(self, token: str) -> Tuple[str, ...]:
+        """Keywords whose first token starts this token, cached across documents."""
+        cached = self._candidate_cache.get(token)
+        if cached is None:
+            cached = tuple(
+                keyword
+                for length in self.prefix_lengths if length <= len(token)
+                for keyword in self.index.get(token[:length], ())
+            )
+            self._candidate_cache[token] = cached
+        return cached
+
+    def match_keywords(self, tokens: List[str]) -> List[str]:
+        """Keywords present in a token stream.
+
+        Single-word keywords only need the document's distinct tokens; phrases
+        are confirmed only at the positions where their first word occurs.
+        """
+        found = set()
+        phrase_starts = {}
+        for token in set(tokens):
+            for keyword in self._candidates(token):
+                if len(self.keywords[keyword][0]) == 1:
+                    found.add(keyword)
+                else:
+                    phrase_starts.setdefault(token, []).append(keyword)
+
+        for token, keywords in phrase_starts.items():
+            position = -1
+            while keywords:
+                try:
+                    position = tokens.index(token, position + 1)
+                except ValueError:
+                    break
+                for keyword in keywords:
+                    keyword_tokens = self.keywords[keyword][0]
+                    window = tokens[position:position + len(keyword_tokens)]
+                    if len(window) == len(keyword_tokens) and all(
+                        word.startswith(part) for word, part in zip(window, keyword_tokens)
+                    ):
+                        found.add(keyword)
+                keywords = [keyword for keyword in keywords if keyword not in found]
+        return sorted(found)
+
+    def explain(self, title: str, content: str = '') -> Dict[str, Dict]:
+        """Per-category score and the keywords that produced it, for debugging."""
+        details = {name: {'score': 0, 'matches': {}} for name in self.categories}
+        for field, tokens in self.split_fields(title, content).items():
+            weight = self.field_weights.get(field, 0)
+            if not weight or not tokens:
+                continue
+            for keyword in self.match_keywords(tokens):
+                for index in self.keywords[keyword][1]:
+                    entry = details[self.categories[index]]
+                    entry['score'] += weight
+                    entry['matches'].setdefault(field, []).append(keyword)
+        return details
+
+    def score(self, title: str, content: str = '') -> Dict[str, float]:
+        """Per-category scores."""
+        return {name: info['score'] for name, info in self.explain(title, content).items()}
+
+    def categorize(self, title: str, content: str = '', default: Optional[str] = None) -> Tuple[str, Dict[str, float]]:
+        """Best category and the scores behind it; ties go to the earlier category."""
+        scores = self.score(title, content)
+        best = max(scores, key=scores.get)
+        if scores[best] == 0:
+            best = default if default is not None else self.default
+        return best, scores
+
+
+def main():
+    """Print category scores for markdown files."""
+    engine = CategoryEngine.from_nav_categories(NAV_CATEGORIES)
+    for filename in sys.argv[1:]:
+        content = Path(filename).read_text(encoding='utf-8')
+        match = re.search(r'^title:\s*["\']?(.*?)["\']?\s*$', content, flags=re.MULTILINE)
+        title = match.group(1) if match else Path(filename).stem
+        category, _ = engine.categorize(title, content)
+        print(f"{filename}: {category}")
+        for name, info in engine.explain(title, content).items():
+            matches = '; '.join(f"{field}: {', '.join(words)}" for field, words in info['matches'].items())
+            print(f"  {info['score']:>4}  {name}" + (f"  ({matches})" if matches else ''))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,100 +4,747 @@ Improved CISOinaBox to Jekyll Converter
 Enhanced with better title generation, logical grouping, and link validation
 """
 
+import argparse
+import hashlib
+import json
 import os
+import posixpath
 import re
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+from urllib.parse import quote, unquote
+
+import build_profile
+from build_profile import count_read, count_regex, count_write
+from categorization import NAV_CATEGORIES, CategoryEngine
+from link_checker import ExternalLinkChecker, describe, external_urls, text_urls
+from page_metadata import BUILD_CACHE_DIR, FrontMatterIndex, PageMetadataCache
+from related_pages import RelatedPages
+from search_index import SearchIndex, document_terms, summarize
+from site_navigation import NAV_OUTPUTS, Menu, add_page_sections, build_navigation, write_navigation
+from site_output import remove_output, site_baseurl, write_if_changed
+from workbook_pages import WorkbookPages
+
+# Every module whose code shapes the output (preview_render is imported only
+# for --preview); generator_fingerprint() hashes them all with this file.
+BUILD_MODULES = ('build_profile', 'categorization', 'link_checker', 'link_requests', 'page_metadata',
+                 'preview_render', 'related_pages', 'search_index', 'site_navigation', 'site_output',
+                 'workbook_pages')
+
+MANIFEST_VERSION = 1
+ASSET_TYPES = ['pdf', 'doc', 'docx', 'xls', 'xlsx', 'png', 'jpg', 'jpeg']
+README_FILES = ['Readme.md', 'README.md', 'readme.md']
+# Section directories are "NN - Name"; numbered directories inside a
+# section are its subsections, to any depth
+SECTION_DIR_PATTERN = re.compile(r'^(\d+) - (.+)$')
+# Markdown links and images whose target is a downloadable asset:
+# (opening "[text](" or "![alt](", target, anchor/query/title and ")")
+ASSET_LINK_PATTERN = re.compile(
+    r'(!?\[[^\]]*\]\(\s*<?)([^)<>#?"]*?\.(?:' + '|'.join(ASSET_TYPES) + r'))(>?(?:[#?][^)\s]*)?(?:\s+"[^"]*")?\s*\))',
+    re.IGNORECASE
+)
+# The first "# Title" line of a document
+H1_PATTERN = re.compile(r'^[ \t]*# [ \t]*(\S.*)$', re.MULTILINE)
+# Section fields kept in the conversion report
+REPORT_FIELDS = ('key', 'number', 'section_number', 'parent', 'title', 'slug', 'category', 'permalink')
+
+# Precedence rules for pages under docs/ that claim the same permalink. A
+# policy applies rules in order until one ranks a page ahead; 'path' is
+# always the final tie-break so the outcome never depends on listing order.
+PERMALINK_RULES = {
+    'section-number': lambda page: not page['section_match'],
+    'hand-authored': lambda page: page['generated'],
+    'generated': lambda page: not page['generated'],
+    'path': lambda page: page['rel'],
+}
+DEFAULT_PERMALINK_POLICY = ('section-number', 'hand-authored', 'path')
+
+
+def normalize_permalink(permalink: str) -> str:
+    """'/a/b', 'a/b/' and '/a/b/' are the same page to Jekyll."""
+    stripped = permalink.strip().strip('/')
+    return f'/{stripped}/' if stripped else '/'
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    count_read(size)
+    return digest.hexdigest()
+
+
+def file_record(path: Path, previous: Optional[Dict] = None) -> Optional[Dict]:
+    """Return size, mtime and hash of a file, reusing the previous hash if its stat is unchanged."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        return previous
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': hash_file(path)}
+
+
+def reflink(source: Path, target: Path):
+    """Copy-on-write clone source to target; raises OSError where unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflinks are not supported on this platform")
+    
+    FICLONE = 0x40049409
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+class AssetStore:
+    """Content-addressed view of the site's assets/ directory.
+    
+    Each file is hashed at most once per run, and not at all when its size and
+    mtime match the last run. Copies are skipped when the destination already
+    holds the same bytes, and files with identical content share one copy on
+    disk through reflinks or hardlinks where the filesystem allows. The store
+    is saved as an asset manifest so later stages can resolve assets without
+    touching the filesystem.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, output_dir: Path, manifest_path: Path, source_dir: Optional[Path] = None):
+        self.output_dir = output_dir
+        self.assets_dir = output_dir / 'assets'
+        self.manifest_path = manifest_path
+        self.source_dir = source_dir
+        self.lock = threading.RLock()
+        self.outputs = {}
+        self.sources = {}
+        self.by_hash = {}
+        self.stats = {'copied': 0, 'linked': 0, 'unchanged': 0, 'deduplicated': 0}
+        
+        previous = self._load()
+        self._previous_sources = previous.get('sources', {})
+        self._scan(previous.get('outputs', {}))
+    
+    def _load(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            manifest = json.loads(text)
+        except (OSError, ValueError):
+            return {}
+        return manifest if manifest.get('version') == self.VERSION else {}
+    
+    def _scan(self, previous_outputs: Dict):
+        """Index every file under assets/, hashing only new or changed ones."""
+        for root, dirs, files in os.walk(self.assets_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(files):
+                if name.startswith('.'):
+                    continue
+                rel = (Path(root) / name).relative_to(self.output_dir).as_posix()
+                record = file_record(self.output_dir / rel, previous_outputs.get(rel))
+                if record:
+                    self._index(rel, dict(record, source=previous_outputs.get(rel, {}).get('source')))
+    
+    def _index(self, rel: str, record: Dict):
+        with self.lock:
+            old = self.outputs.get(rel)
+            if old:
+                self.by_hash.get(old['sha256'], set()).discard(rel)
+            self.outputs[rel] = record
+            self.by_hash.setdefault(record['sha256'], set()).add(rel)
+    
+    def source_record(self, path: Path) -> Optional[Dict]:
+        """Hash a source asset once per run."""
+        key = str(path)
+        with self.lock:
+            if key in self.sources:
+                return self.sources[key]
+        record = file_record(path, self._previous_sources.get(key))
+        with self.lock:
+            self.sources[key] = record
+        return record
+    
+    def exists(self, rel: str) -> bool:
+        """Whether assets/... path rel (relative to the site root) is in the store."""
+        with self.lock:
+            return rel in self.outputs
+    
+    def resolve(self, rel: str) -> Optional[Dict]:
+        with self.lock:
+            return self.outputs.get(rel)
+    
+    def _twin(self, sha256: str, rel: str) -> Optional[Path]:
+        with self.lock:
+            for other in sorted(self.by_hash.get(sha256, ())):
+                if other != rel:
+                    return self.output_dir / other
+        return None
+    
+    def _place(self, target: Path, candidates: List[Tuple[Callable, Path]]) -> int:
+        """Materialise target atomically from the first strategy that works."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f'.{target.name}.{threading.get_ident()}.tmp')
+        for index, (strategy, origin) in enumerate(candidates):
+            try:
+                strategy(origin, temp)
+                os.replace(temp, target)
+                if strategy is shutil.copy2:
+                    count_write(target.stat().st_size)
+                return index
+            except OSError:
+                if temp.exists():
+                    temp.unlink()
+                if index == len(candidates) - 1:
+                    raise
+        return -1
+    
+    def materialize(self, source: Path, target: Path) -> str:
+        """Put source's bytes at target, reusing identical content already in the store."""
+        record = self.source_record(source)
+        if record is None:
+            raise OSError(f"cannot read {source}")
+        
+        rel = target.relative_to(self.output_dir).as_posix()
+        current = self.resolve(rel)
+        source_rel = str(source.relative_to(self.source_dir)) if self.source_dir else str(source)
+        if current and current['sha256'] == record['sha256']:
+            self._index(rel, dict(current, source=source_rel))
+            outcome = 'unchanged'
+        else:
+            twin = self._twin(record['sha256'], rel)
+            if twin:
+                used = self._place(target, [(reflink, twin), (os.link, twin), (shutil.copy2, source)])
+                outcome = 'linked' if used < 2 else 'copied'
+            else:
+                self._place(target, [(reflink, source), (shutil.copy2, source)])
+                outcome = 'copied'
+            self._index(rel, dict(file_record(target), source=source_rel))
+        
+        with self.lock:
+            self.stats[outcome] += 1
+        return outcome
+    
+    def deduplicate(self):
+        """Collapse identical files already in assets/ onto a single copy."""
+        with self.lock:
+            groups = [sorted(paths) for paths in self.by_hash.values() if len(paths) > 1]
+        
+        for keep, *duplicates in groups:
+            keep_path = self.output_dir / keep
+            keep_stat = keep_path.stat()
+            for rel in duplicates:
+                path = self.output_dir / rel
+                stat = path.stat()
+                if (stat.st_dev, stat.st_ino) == (keep_stat.st_dev, keep_stat.st_ino):
+                    continue
+                try:
+                    self._place(path, [(reflink, keep_path), (os.link, keep_path)])
+                except OSError:
+                    continue
+                self._index(rel, dict(file_record(path), source=self.outputs[rel].get('source')))
+                self.stats['deduplicated'] += 1
+    
+    def save(self):
+        """Write the asset manifest."""
+        with self.lock:
+            manifest = {
+                'version': self.VERSION,
+                'outputs': self.outputs,
+                'sources': {key: record for key, record in self.sources.items() if record},
+                'by_hash': {sha: sorted(paths) for sha, paths in sorted(self.by_hash.items()) if paths}
+            }
+        write_if_changed(self.manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+
+
+class AssetIndex:
+    """Every file under assets/, keyed the ways a section's markdown may name it.
+    
+    Built once per run from the asset store, so resolving an asset link is a
+    few dictionary lookups with no filesystem probes. A link target matches,
+    in order, its source file relative to the section, a site path under
+    assets/, the file name, and the normalized name (case, %-escapes,
+    spaces and punctuation ignored).
+    """
+    
+    def __init__(self, outputs: Dict[str, Dict]):
+        self.outputs = outputs
+        self.by_source = {}
+        self.by_name = {}
+        self.by_normalized = {}
+        for rel, record in sorted(outputs.items()):
+            if record.get('source'):
+                self.by_source.setdefault(Path(record['source']).as_posix(), []).append(rel)
+            name = rel.rsplit('/', 1)[-1]
+            self.by_name.setdefault(name, []).append(rel)
+            self.by_normalized.setdefault(self.normalize(name), []).append(rel)
+    
+    @staticmethod
+    def normalize(name: str) -> str:
+        """'Access%20Control_Policy.PDF' and 'access control policy.pdf' are the same name."""
+        stem, dot, extension = unquote(name).lower().rpartition('.')
+        return re.sub(r'[^a-z0-9]+', '', stem) + dot + extension
+    
+    @staticmethod
+    def url(rel: str) -> str:
+        return '/' + quote(rel)
+    
+    def pick(self, candidates: List[str]) -> Tuple[str, List[str]]:
+        """The canonical copy among candidates, and any rival with different content.
+        
+        A file in the assets/<extension>/ directory the converter copies into
+        wins; copies with the same bytes (e.g. assets/excel/ and assets/xlsx/)
+        are not rivals.
+        """
+        def rank(rel: str):
+            directory, _, name = rel.rpartition('/')
+            return directory != 'assets/' + name.rpartition('.')[2].lower(), rel
+        
+        chosen, *others = sorted(candidates, key=rank)
+        sha256 = self.outputs[chosen]['sha256']
+        return chosen, [rel for rel in others if self.outputs[rel]['sha256'] != sha256]
+    
+    def resolve(self, target: str, source_dir: str = '') -> Tuple[Optional[str], List[str]]:
+        """(URL, rival URLs) for a local link target in a section under source_dir.
+        
+        The URL is None when no asset matches.
+        """
+        path = unquote(target.split('#', 1)[0].split('?', 1)[0]).strip()
+        if not path:
+            return None, []
+        exact = self.by_source.get(posixpath.normpath(posixpath.join(source_dir, path)))
+        if not exact:
+            # Site paths, however many ../ they climb
+            site_path = posixpath.normpath(path).lstrip('/')
+            while site_path.startswith('../'):
+                site_path = site_path[3:]
+            exact = [site_path] if site_path in self.outputs else None
+        name = path.rsplit('/', 1)[-1]
+        for candidates in (exact, self.by_name.get(name), self.by_normalized.get(self.normalize(name))):
+            if candidates:
+                chosen, rivals = self.pick(candidates)
+                return self.url(chosen), [self.url(rel) for rel in rivals]
+        return None, []
+
+
+class LinkGraph:
+    """Internal links of every page on the site, with the line each one is on.
+    
+    Generated pages are scanned from the text as it is written. Other pages
+    (hand-written docs, index, sections) are scanned once and cached against
+    their size and mtime, so validation checks every link against in-memory
+    permalink and asset sets instead of reading the site back.
+    """
+    
+    VERSION = 1
+    
+    MARKDOWN_LINK = re.compile(r'\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+    HTML_LINK = re.compile(r'\b(?:href|src)\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+    LIQUID_URL = re.compile(r'\{\{\s*["\']([^"\']*)["\']\s*\|\s*(?:relative_url|absolute_url)\s*\}\}')
+    EXTERNAL = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//)', re.IGNORECASE)
+    FENCE = re.compile(r'^\s*(```|~~~)')
+    # Files Jekyll plugins generate rather than pages we can see
+    GENERATED_URLS = {'/feed.xml', '/sitemap.xml', '/robots.txt'}
+    
+    def __init__(self, site_dir: Path, cache_path: Path, baseurl: str = ''):
+        self.site_dir = site_dir
+        self.cache_path = cache_path
+        self.baseurl = baseurl.rstrip('/')
+        self.lock = threading.Lock()
+        self.pages = {}
+        self._cached = self._load()
+    
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return {}
+        return cache.get('pages', {}) if cache.get('version') == self.VERSION else {}
+    
+    @classmethod
+    def extract(cls, text: str) -> List[Tuple[int, str, str]]:
+        """(line, kind, target) for every link in a page, skipping fenced code."""
+        links = []
+        in_fence = None
+        count_regex()
+        for number, line in enumerate(text.split('\n'), start=1):
+            fence = cls.FENCE.match(line)
+            if fence:
+                in_fence = None if in_fence == fence.group(1) else (in_fence or fence.group(1))
+                continue
+            if in_fence:
+                continue
+            if '{{' in line:
+                links.extend((number, 'liquid', target) for target in cls.LIQUID_URL.findall(line))
+            if '](' in line:
+                links.extend((number, 'markdown', target) for target in cls.MARKDOWN_LINK.findall(line)
+                             if '{{' not in target)
+            if '=' in line and ('href' in line or 'src' in line):
+                links.extend((number, 'html', target) for target in cls.HTML_LINK.findall(line)
+                             if '{{' not in target and '{%' not in target)
+        return links
+    
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.site_dir).as_posix()
+    
+    def record(self, path: Path, text: str):
+        """Scan a page from the text just written to it."""
+        stat = path.stat()
+        entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                 'links': [list(link) for link in self.extract(text)]}
+        with self.lock:
+            self.pages[self._rel(path)] = entry
+    
+    def scan(self, paths: List[Path]):
+        """Make the graph cover exactly these pages, reading only new or edited ones."""
+        wanted = {self._rel(path): path for path in paths}
+        with self.lock:
+            for rel in [rel for rel in self.pages if rel not in wanted]:
+                del self.pages[rel]
+        
+        for rel, path in wanted.items():
+            if rel in self.pages:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            cached = self._cached.get(rel)
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                with self.lock:
+                    self.pages[rel] = cached
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            self.record(path, text)
+    
+    def resolve(self, target: str, base: str) -> Optional[str]:
+        """Site path a link points at, or None for external links and bare anchors."""
+        if self.EXTERNAL.match(target):
+            return None
+        path = unquote(target.split('#', 1)[0].split('?', 1)[0])
+        if not path:
+            return None
+        if self.baseurl and (path == self.baseurl or path.startswith(self.baseurl + '/')):
+            path = path[len(self.baseurl):] or '/'
+        if not path.startswith('/'):
+            directory = base if base.endswith('/') else posixpath.dirname(base) + '/'
+            trailing = '/' if path.endswith('/') else ''
+            path = posixpath.normpath(posixpath.join(directory, path))
+            path = path + trailing if path != '/' else path
+        return path
+    
+    def check(self, permalinks: Dict[str, str], asset_exists: Callable[[str], bool]) -> List[Dict]:
+        """Diagnostics for every internal link that resolves to no page, asset or file.
+        
+        permalinks maps each page's site-relative path to its permalink.
+        """
+        known = set(permalinks.values())
+        static = {}
+        
+        def is_static_file(path: str) -> bool:
+            if path not in static:
+                static[path] = (self.site_dir / path.lstrip('/')).is_file()
+            return static[path]
+        
+        diagnostics = []
+        with self.lock:
+            pages = sorted(self.pages.items())
+        for rel, entry in pages:
+            base = permalinks.get(rel, '/')
+            for line, kind, target in entry['links']:
+                path = self.resolve(target, base)
+                if path is None:
+                    continue
+                if path.startswith('/assets/'):
+                    # The asset store indexed all of assets/; no need to stat
+                    if asset_exists(path[1:]):
+                        continue
+                    problem = 'missing_asset'
+                elif (path in known or path.rstrip('/') + '/' in known or path in self.GENERATED_URLS
+                      or is_static_file(path)):
+                    continue
+                else:
+                    problem = 'broken_link'
+                diagnostics.append({'file': rel, 'line': line, 'kind': kind,
+                                    'target': target, 'resolved': path, 'problem': problem})
+        return diagnostics
+    
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {'pages': len(self.pages), 'links': sum(len(entry['links']) for entry in self.pages.values())}
+    
+    def save(self):
+        """Cache the graph for the next run."""
+        with self.lock:
+            text = json.dumps({'version': self.VERSION, 'pages': self.pages}, sort_keys=True) + '\n'
+        write_if_changed(self.cache_path, text)
+
+
+class CrossReferenceRewriter:
+    """Point links that mention a section title at that section, in one scan per document.
+    
+    All titles and raw titles are compiled into a single Aho-Corasick automaton,
+    so each link text is matched against every section at once. When a link
+    mentions several sections the last one in section order wins, which is what
+    the old one-regex-per-section rewrite produced.
+    """
+    
+    LINK_PATTERN = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+    
+    def __init__(self, sections: List[Dict]):
+        self.permalinks = []
+        self.transitions = [{}]
+        self.fail = [0]
+        self.best = [-1]
+        
+        for index, section in enumerate(sections):
+            self.permalinks.append(section.get('permalink', f"/{section['slug']}/"))
+            for pattern in (section['raw_title'], section['title']):
+                if pattern:
+                    self._add_pattern(pattern, index)
+        self._build_failure_links()
+    
+    def _add_pattern(self, pattern: str, index: int):
+        node = 0
+        for char in pattern:
+            next_node = self.transitions[node].get(char)
+            if next_node is None:
+                next_node = len(self.transitions)
+                self.transitions.append({})
+                self.fail.append(0)
+                self.best.append(-1)
+                self.transitions[node][char] = next_node
+            node = next_node
+        self.best[node] = max(self.best[node], index)
+    
+    def _build_failure_links(self):
+        queue = list(self.transitions[0].values())
+        for node in queue:
+            for char, child in self.transitions[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.transitions[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                # A node also matches everything its failure chain matches
+                self.best[child] = max(self.best[child], self.best[self.fail[child]])
+                queue.append(child)
+    
+    def match(self, text: str) -> int:
+        """Return the index of the last section mentioned in text, or -1."""
+        node = 0
+        best = -1
+        for char in text:
+            while node and char not in self.transitions[node]:
+                node = self.fail[node]
+            node = self.transitions[node].get(char, 0)
+            if self.best[node] > best:
+                best = self.best[node]
+        return best
+    
+    def rewrite(self, content: str) -> str:
+        """Rewrite every section-mentioning link in a single pass over content."""
+        def replace(match):
+            index = self.match(match.group(1))
+            if index < 0:
+                return match.group(0)
+            return f'[{match.group(1)}]({self.permalinks[index]})'
+        
+        count_regex()
+        return self.LINK_PATTERN.sub(replace, content)
+
 
 class ImprovedCISOToJekyllConverter:
-    def __init__(self, source_dir: str, output_dir: str):
+    def __init__(self, source_dir: str, output_dir: str, force: bool = False, jobs: int = 1,
+                 permalink_policy: Optional[List[str]] = None, nav_output: str = 'auto',
+                 stream: bool = False, check_external: bool = False, preview: bool = False):
         self.source_dir = Path(source_dir)
         self.output_dir = Path(output_dir)
+        self.force = force
+        self.jobs = max(1, jobs)
+        # Streaming: keep no section text between processing and writing
+        self.stream = stream
+        # Request stale external links; otherwise only cached results are reported
+        self.check_external = check_external
+        # Also render docs/ to _preview/ in Python, for a look without Jekyll
+        self.preview = preview
+        self.permalink_policy = [rule for rule in permalink_policy or DEFAULT_PERMALINK_POLICY if rule != 'path'] + ['path']
+        unknown = [rule for rule in self.permalink_policy if rule not in PERMALINK_RULES]
+        if unknown:
+            raise ValueError(f"Unknown permalink rule(s): {', '.join(unknown)}")
+        if nav_output not in NAV_OUTPUTS:
+            raise ValueError(f"Unknown navigation output: {nav_output}")
+        self.nav_output = nav_output
+        self.manifest_path = self.output_dir / BUILD_CACHE_DIR / 'manifest.json'
+        self._page_cache = None
+        self._page_index = None
+        self._other_pages = None
+        self._link_graph = None
+        self._search_index = None
+        self._workbook_pages = None
+        self._related_pages = None
+        self._asset_store = None
+        self._asset_index = None
+        self._asset_owners = {}
+        self._worker = threading.local()
+        self.profiler = build_profile.BuildProfiler()
         self.sections = []
-        self.errors = []
-        self.warnings = []
+        self.link_diagnostics = []
+        self.external_link_stats = {}
+        self.dropped_pages = []
+        self._errors = []
+        self._warnings = []
         
         # Define navigation categories based on content analysis
         self.nav_categories = {
-            "Getting Started": {
-                "keywords": ["getting started", "overview", "introduction"],
-                "sections": [],
-                "description": "Basic introduction and getting started guide"
-            },
-            "Risk & Threat Management": {
-                "keywords": ["risk", "threat", "adversary", "attack surface"],
-                "sections": [],
-                "description": "Risk assessment and threat intelligence"
-            },
-            "Security Controls": {
-                "keywords": ["cis18", "controls", "architecture", "engineering", "product security", "business process"],
-                "sections": [],
-                "description": "Technical security controls and architecture"
-            },
-            "Security Program": {
-                "keywords": ["management", "leadership", "awareness", "operations", "incident response"],
-                "sections": [],
-                "description": "Security program management and operations"
-            },
-            "Compliance & Resilience": {
-                "keywords": ["governance", "compliance", "continuity", "disaster recovery", "vulnerability"],
-                "sections": [],
-                "description": "Compliance, governance, and resilience planning"
-            },
-            "Advanced Topics": {
-                "keywords": ["frameworks", "careers", "cyber insurance", "resources"],
-                "sections": [],
-                "description": "Advanced topics and career development"
+            name: {
+                'keywords': list(info['keywords']),
+                'sections': [],
+                'description': info['description']
             }
+            for name, info in NAV_CATEGORIES.items()
         }
+        self.category_engine = CategoryEngine.from_nav_categories(self.nav_categories)
     
-    def find_sections(self) -> List[Dict]:
-        """Find all numbered section directories."""
-        sections = []
+    @property
+    def errors(self) -> List[str]:
+        """Errors for the current section task, or for the whole run outside one."""
+        return getattr(self._worker, 'errors', self._errors)
+    
+    @property
+    def warnings(self) -> List[str]:
+        """Warnings for the current section task, or for the whole run outside one."""
+        return getattr(self._worker, 'warnings', self._warnings)
+    
+    def log(self, message: str):
+        """Print a progress line, buffering it while inside a parallel section task."""
+        buffer = getattr(self._worker, 'log', None)
+        if buffer is None:
+            print(message)
+        else:
+            buffer.append(message)
+    
+    def run_section_tasks(self, task: Callable, items: List) -> List:
+        """Run task over items, in parallel when --jobs > 1.
         
-        for i in range(1, 23):  # 01-22
-            dir_patterns = [
-                f"{i:02d} - *",
-                f"{i} - *"
-            ]
-            
-            found = False
-            for pattern in dir_patterns:
-                matching_dirs = list(self.source_dir.glob(pattern))
-                if matching_dirs:
-                    for dir_path in matching_dirs:
-                        if dir_path.is_dir():
-                            sections.append({
-                                'number': i,
-                                'path': dir_path,
-                                'name': dir_path.name
-                            })
-                            found = True
-                            break
-                if found:
-                    break
-            
-            if not found:
-                self.warnings.append(f"Section {i:02d} not found")
+        Results, errors, warnings and progress output are merged back in item
+        order, so a parallel run reports exactly what a serial run would.
+        """
+        if self.jobs == 1 or len(items) < 2:
+            return [task(item) for item in items]
+        
+        def run_buffered(item):
+            self._worker.errors, self._worker.warnings, self._worker.log = [], [], []
+            try:
+                with build_profile.worker_profile():
+                    result = task(item)
+                return result, self._worker.errors, self._worker.warnings, self._worker.log
+            finally:
+                del self._worker.errors, self._worker.warnings, self._worker.log
+        
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            outcomes = list(pool.map(run_buffered, items))
+        
+        results = []
+        for result, errors, warnings, log in outcomes:
+            self._errors.extend(errors)
+            self._warnings.extend(warnings)
+            for message in log:
+                print(message)
+            results.append(result)
+        return results
+    
+    def iter_sections(self, warnings: Optional[List[str]] = None,
+                      parent: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield numbered section directories depth-first, in number order.
+        
+        Each directory is listed exactly once: the listing that finds a
+        section's subsections also gives its readme and assets, and a
+        section's subsections are only listed when the iterator reaches it.
+        Gaps and duplicate numbers are appended to warnings when given.
+        """
+        directory = parent['path'] if parent else self.source_dir
+        candidates = {}
+        for entry in parent['dirs'] if parent else self.list_directory(directory)[1]:
+            match = SECTION_DIR_PATTERN.match(entry.name)
+            if match:
+                candidates.setdefault(int(match.group(1)), []).append(entry)
         
-        sections.sort(key=lambda x: x['number'])
-        return sections
+        prefix = f"{parent['key']}." if parent else ''
+        for number in range(1, max(candidates, default=0) + 1):
+            if number not in candidates:
+                if warnings is not None:
+                    warnings.append(f"Section {prefix}{number:02d} not found")
+                continue
+            # Prefer the zero-padded name, as "NN - *" was always tried first
+            entries = sorted(candidates[number], key=lambda entry: (not entry.name.startswith(f"{number:02d} "), entry.name))
+            if len(entries) > 1 and warnings is not None:
+                others = ', '.join(entry.name for entry in entries[1:])
+                warnings.append(f"Duplicate section number {prefix}{number:02d}: using {entries[0].name}, ignoring {others}")
+            
+            path = Path(entries[0].path)
+            files, dirs = self.list_directory(path)
+            section = {
+                'key': f"{prefix}{number:02d}",
+                'number': number,
+                'section_number': parent['section_number'] if parent else number,
+                'parent': parent['key'] if parent else None,
+                'depth': parent['depth'] + 1 if parent else 0,
+                'path': path,
+                'name': path.name,
+                'files': files,
+                'dirs': dirs
+            }
+            yield section
+            yield from self.iter_sections(warnings, section)
+    
+    def list_directory(self, directory: Path) -> Tuple[List[str], List[os.DirEntry]]:
+        """File names and subdirectory entries of a directory, from one scan."""
+        files, dirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        dirs.append(entry)
+                    elif entry.is_file():
+                        files.append(entry.name)
+        except OSError as e:
+            self.errors.append(f"Could not list {directory}: {e}")
+        return sorted(files), dirs
+    
+    def find_sections(self) -> List[Dict]:
+        """Find all numbered section directories and their subsections."""
+        return list(self.iter_sections(self.warnings))
     
     def extract_title_from_content(self, content: str) -> str:
         """Extract clean title from markdown content."""
-        lines = content.split('\n')
-        
-        # Look for H1 title
-        for line in lines:
-            line = line.strip()
-            if line.startswith('# '):
-                title = line[2:].strip()
-                # Clean up markdown artifacts
-                title = re.sub(r'\*\*', '', title)  # Remove **bold**
-                title = re.sub(r'---', '', title)   # Remove ---
-                title = re.sub(r'#+$', '', title)   # Remove trailing #
-                return title.strip()
+        # Look for H1 title, reading only as far as the first one
+        count_regex()
+        match = H1_PATTERN.search(content)
+        if match:
+            title = match.group(1).strip()
+            count_regex(3)
+            # Clean up markdown artifacts
+            title = re.sub(r'\*\*', '', title)  # Remove **bold**
+            title = re.sub(r'---', '', title)   # Remove ---
+            title = re.sub(r'#+$', '', title)   # Remove trailing #
+            return title.strip()
         
         return "Untitled Section"
     
@@ -105,6 +752,7 @@ class ImprovedCISOToJekyllConverter:
         """Convert title to URL-friendly slug."""
         # Convert to lowercase and replace spaces with hyphens
         slug = title.lower()
+        count_regex(3)
         slug = re.sub(r'[^a-z0-9\s-]', '', slug)
         slug = re.sub(r'\s+', '-', slug)
         slug = re.sub(r'-+', '-', slug)
@@ -124,44 +772,23 @@ class ImprovedCISOToJekyllConverter:
     
     def categorize_section(self, title: str, content: str) -> str:
         """Automatically categorize a section based on title and content."""
-        title_lower = title.lower()
-        content_lower = content.lower()
-        
-        # Score each category
-        category_scores = {}
-        
-        for category_name, category_info in self.nav_categories.items():
-            score = 0
-            keywords = category_info['keywords']
-            
-            for keyword in keywords:
-                if keyword in title_lower:
-                    score += 10  # Title matches are worth more
-                if keyword in content_lower:
-                    score += 3   # Content matches are worth less
-            
-            category_scores[category_name] = score
-        
-        # Return the category with highest score
-        if max(category_scores.values()) == 0:
-            # No matches, put in Getting Started by default
-            return "Getting Started"
+        category, _ = self.category_engine.categorize(title, content)
+        return category
+    
+    def find_content_file(self, section_path: Path, files: Optional[List[str]] = None) -> Optional[Path]:
+        """Find the readme file for a section (multiple naming patterns)."""
+        for filename in README_FILES:
+            potential_file = section_path / filename
+            found = filename in files if files is not None else potential_file.exists()
+            if found:
+                return potential_file
         
-        return max(category_scores, key=category_scores.get)
+        return None
     
     def process_section(self, section: Dict) -> Optional[Dict]:
         """Process a single section directory."""
         section_path = section['path']
-        
-        # Find readme file (multiple naming patterns)
-        readme_files = ['Readme.md', 'README.md', 'readme.md']
-        content_file = None
-        
-        for filename in readme_files:
-            potential_file = section_path / filename
-            if potential_file.exists():
-                content_file = potential_file
-                break
+        content_file = self.find_content_file(section_path, section.get('files'))
         
         if not content_file:
             self.errors.append(f"No content file found in {section_path}")
@@ -170,6 +797,7 @@ class ImprovedCISOToJekyllConverter:
         try:
             with open(content_file, 'r', encoding='utf-8') as f:
                 content = f.read()
+            count_read(len(content))
         except Exception as e:
             self.errors.append(f"Error reading {content_file}: {e}")
             return None
@@ -179,25 +807,40 @@ class ImprovedCISOToJekyllConverter:
         title = self.clean_title(raw_title)
         slug = self.slugify_title(title)
         
-        # Categorize the section
-        category = self.categorize_section(title, content)
+        # Categorize the section, keeping the scores for debugging misclassification
+        category, category_scores = self.category_engine.categorize(title, content)
+        count_regex(2)  # title and body tokenization
+        
+        # Index the text for search while it is in memory
+        search_terms = document_terms(title, content)
+        search_summary = summarize(content)
         
         # Copy assets if they exist
-        self.copy_section_assets(section_path)
+        self.copy_section_assets(section_path, section.get('files'))
         
-        return {
+        section_info = {
+            'key': section['key'],
             'number': section['number'],
+            'section_number': section['section_number'],
+            'parent': section['parent'],
             'title': title,
             'raw_title': raw_title,
             'slug': slug,
             'category': category,
-            'content': content,
+            'category_scores': category_scores,
+            'search_terms': search_terms,
+            'search_summary': search_summary,
             'source_file': content_file
         }
+        # Streaming re-reads the source when the page is written
+        if not self.stream:
+            section_info['content'] = content
+        return section_info
     
     def clean_title(self, title: str) -> str:
         """Clean up title for navigation display."""
         # Remove common artifacts
+        count_regex(3)
         title = re.sub(r'[*#_]+', '', title)  # Remove markdown chars
         title = re.sub(r'---', '', title)      # Remove dashes
         title = re.sub(r'\s+', ' ', title)     # Normalize whitespace
@@ -221,54 +864,175 @@ class ImprovedCISOToJekyllConverter:
             
         return title
     
-    def copy_section_assets(self, section_path: Path):
+    def list_section_assets(self, section_path: Path, files: Optional[List[str]] = None) -> List[Path]:
+        """List a section's downloadable assets, from its discovery listing when given."""
+        if files is None:
+            files = self.list_directory(section_path)[0]
+        assets = []
+        for filename in files:
+            name, dot, extension = filename.rpartition('.')
+            if dot and name and extension in ASSET_TYPES:
+                assets.append(section_path / filename)
+        return assets
+    
+    def asset_target(self, asset_name: str) -> Path:
+        """Where an asset lands in the site, e.g. assets/pdf/<name>.pdf."""
+        return self.output_dir / 'assets' / asset_name.rpartition('.')[2] / asset_name
+    
+    @property
+    def asset_store(self) -> AssetStore:
+        """Content-addressed asset store, built on first use."""
+        if self._asset_store is None:
+            self._asset_store = AssetStore(
+                self.output_dir, self.output_dir / BUILD_CACHE_DIR / 'assets.json', self.source_dir
+            )
+        return self._asset_store
+    
+    def copy_section_assets(self, section_path: Path, files: Optional[List[str]] = None):
         """Copy assets from a section to the main assets directory."""
-        asset_types = ['pdf', 'doc', 'docx', 'xls', 'xlsx', 'png', 'jpg', 'jpeg']
-        
-        for asset_type in asset_types:
-            for asset_file in section_path.glob(f'*.{asset_type}'):
-                target_dir = self.output_dir / 'assets' / asset_type
-                target_dir.mkdir(parents=True, exist_ok=True)
-                
-                target_file = target_dir / asset_file.name
-                try:
-                    shutil.copy2(asset_file, target_file)
-                except Exception as e:
-                    self.warnings.append(f"Could not copy asset {asset_file}: {e}")
+        for asset_file in self.list_section_assets(section_path, files):
+            target_file = self.asset_target(asset_file.name)
+            # Several sections may ship a file with the same name; the
+            # last one in section order wins, whatever order tasks run in
+            if self._asset_owners.get(target_file, section_path) != section_path:
+                continue
+            try:
+                self.asset_store.materialize(asset_file, target_file)
+            except Exception as e:
+                self.warnings.append(f"Could not copy asset {asset_file}: {e}")
     
-    def update_internal_links(self, content: str) -> str:
+    @property
+    def asset_index(self) -> AssetIndex:
+        """Lookup table of every asset, built on first use once sections have copied theirs."""
+        if self._asset_index is None:
+            with self.asset_store.lock:
+                self._asset_index = AssetIndex(dict(self.asset_store.outputs))
+        return self._asset_index
+    
+    def update_internal_links(self, content: str, source_file: Optional[Path] = None) -> str:
         """Update internal links to use Jekyll permalinks."""
-        # Update asset links
-        content = re.sub(
-            r'\[([^\]]*)\]\([^)]*\.(pdf|docx?|xlsx?)([^)]*)\)',
-            lambda m: f'[{m.group(1)}](/assets/{m.group(2)}/{m.group(1).replace(" ", "%20")}.{m.group(2)}{m.group(3)})',
-            content, flags=re.IGNORECASE
-        )
+        source_dir = source_file.parent.relative_to(self.source_dir).as_posix() if source_file else ''
+        
+        def replace(match):
+            target = match.group(2)
+            if LinkGraph.EXTERNAL.match(target.strip()):
+                return match.group(0)
+            url, rivals = self.asset_index.resolve(target, source_dir)
+            if url is None:
+                # Left as written; validation reports it as broken
+                return match.group(0)
+            if rivals:
+                self.warnings.append(f"Ambiguous asset link {target} in {source_dir or '.'}: "
+                                     f"using {url}, also matches {', '.join(rivals)}")
+            opening = match.group(1).rstrip('<')
+            return opening + url + match.group(3).lstrip('>')
+        
+        # Update asset links to the files actually copied under assets/
+        count_regex()
+        content = ASSET_LINK_PATTERN.sub(replace, content)
         
         # Update section links - this will be handled after all sections are processed
         return content
     
+    @property
+    def page_cache(self) -> PageMetadataCache:
+        """Page metadata from the last run, shared with rebuild_navigation.py."""
+        if self._page_cache is None:
+            self._page_cache = PageMetadataCache(self.output_dir)
+        return self._page_cache
+    
+    @property
+    def page_index(self) -> FrontMatterIndex:
+        """Front matter index of docs/, built on first use."""
+        if self._page_index is None:
+            self._page_index = FrontMatterIndex(self.output_dir / 'docs', cache=self.page_cache)
+        return self._page_index
+    
+    @property
+    def other_pages(self) -> FrontMatterIndex:
+        """Front matter index of pages that are not section pages: the top of the
+        site (index, sections, ...) and anything nested below docs/."""
+        if self._other_pages is None:
+            self._other_pages = FrontMatterIndex(
+                self.output_dir, ('*.markdown', 'docs/*/**/*.markdown'), cache=self.page_cache
+            )
+        return self._other_pages
+    
+    @property
+    def link_graph(self) -> LinkGraph:
+        """Links of every page, built on first use from the cache of the last run."""
+        if self._link_graph is None:
+            self._link_graph = LinkGraph(
+                self.output_dir, self.output_dir / BUILD_CACHE_DIR / 'links.json', self.site_baseurl()
+            )
+        return self._link_graph
+    
+    @property
+    def search_index(self) -> SearchIndex:
+        """Search terms of every page, built on first use from the cache of the last run."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.output_dir)
+        return self._search_index
+    
+    @property
+    def related_pages(self) -> RelatedPages:
+        """Similarity signatures of the sections, built on first use from the cache of the last run."""
+        if self._related_pages is None:
+            self._related_pages = RelatedPages(self.output_dir)
+        return self._related_pages
+    
+    @property
+    def workbook_pages(self) -> WorkbookPages:
+        """Browsable pages of the sections' XLSX workbooks, with their cache, built on first use."""
+        if self._workbook_pages is None:
+            self._workbook_pages = WorkbookPages(self.output_dir)
+        return self._workbook_pages
+    
+    def section_workbooks(self, sections: List[Dict]) -> List[Tuple[Path, str, str]]:
+        """(path, source path, sha256) of each XLSX workbook the sections ship.
+        
+        As with assets, the last section in order wins a file name.
+        """
+        owners = {}
+        for section in sections:
+            for asset_file in self.list_section_assets(section['path'], section.get('files')):
+                if asset_file.suffix.lower() == '.xlsx':
+                    owners[asset_file.name] = asset_file
+        workbooks = []
+        for asset_file in owners.values():
+            # Hashed once per run, and not at all when its stat is unchanged
+            record = self.asset_store.source_record(asset_file)
+            if record:
+                workbooks.append((asset_file, asset_file.relative_to(self.source_dir).as_posix(), record['sha256']))
+        return workbooks
+    
+    def index_for_search(self, section_info: Dict):
+        """Hand a rebuilt section's terms to the search index, dropping them from the section.
+        
+        A page that lost its permalink to another stays in the index with no
+        terms, so it is not re-read on every run just to be indexed.
+        """
+        terms = section_info.pop('search_terms', {})
+        summary = section_info.pop('search_summary', '')
+        if section_info.get('superseded_by'):
+            terms, summary = {}, ''
+        self.search_index.add(section_info['key'], section_info['title'], section_info['permalink'], terms, summary)
+    
+    def site_baseurl(self) -> str:
+        """baseurl from _config.yml, which hard-coded links may include."""
+        return site_baseurl(self.output_dir)
+    
     def find_existing_page(self, section_number: int, generated_slug: str) -> Optional[Path]:
         """Find the preferred markdown file for a section number."""
-        docs_dir = self.output_dir / 'docs'
-        if not docs_dir.exists():
-            return None
-
-        matches = []
-        for md_file in docs_dir.glob('*.markdown'):
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            if re.search(rf'^section_number:\s*{section_number}\s*$', content, flags=re.MULTILINE):
-                matches.append(md_file)
-
+        matches = self.page_index.find_by_section_number(section_number)
         if not matches:
             return None
 
         preferred_matches = [match for match in matches if match.stem != generated_slug]
         if preferred_matches:
-            return sorted(preferred_matches)[0]
+            return preferred_matches[0]
 
-        return sorted(matches)[0]
+        return matches[0]
 
     def split_front_matter(self, content: str) -> Tuple[Optional[str], str]:
         """Split markdown content into front matter and body."""
@@ -280,6 +1044,7 @@ class ImprovedCISOToJekyllConverter:
     def extract_permalink_from_front_matter(self, front_matter: Optional[str], fallback_slug: str) -> str:
         """Extract permalink from front matter, falling back to slug-based permalink."""
         if front_matter:
+            count_regex()
             match = re.search(r'^permalink:\s*(.+)$', front_matter, flags=re.MULTILINE)
             if match:
                 permalink = match.group(1).strip().strip('"\'')
@@ -287,8 +1052,11 @@ class ImprovedCISOToJekyllConverter:
                     return permalink
         return f'/{fallback_slug}/'
     
-    def generate_markdown_file(self, section_info: Dict) -> bool:
-        """Generate Jekyll markdown file for a section."""
+    def resolve_output_page(self, section_info: Dict) -> bool:
+        """Decide which file a section is written to, and its permalink and front matter."""
+        if section_info.get('parent'):
+            return self.resolve_subsection_page(section_info)
+        
         docs_dir = self.output_dir / 'docs'
         autogenerated_path = docs_dir / f"{section_info['slug']}.markdown"
 
@@ -297,12 +1065,11 @@ class ImprovedCISOToJekyllConverter:
         if existing:
             output_path = existing
             try:
-                existing_content = output_path.read_text(encoding='utf-8')
+                front_matter = self.page_index.read_front_matter(output_path)
             except Exception as e:
                 self.errors.append(f"Error reading existing page {output_path}: {e}")
                 return False
 
-            front_matter, _ = self.split_front_matter(existing_content)
             if front_matter is None:
                 self.warnings.append(f"Existing page {output_path.name} is missing front matter; regenerating it")
                 permalink = f'/{output_path.stem}/'
@@ -318,7 +1085,8 @@ section_number: {section_info['number']}
                 permalink = self.extract_permalink_from_front_matter(front_matter, output_path.stem)
 
             if autogenerated_path.exists() and autogenerated_path != output_path:
-                autogenerated_path.unlink()
+                remove_output(autogenerated_path)
+                self.page_index.remove(autogenerated_path)
         else:
             output_path = autogenerated_path
             permalink = f"/{section_info['slug']}/"
@@ -331,81 +1099,179 @@ section_number: {section_info['number']}
 ---
 """
         
-        # Update content with proper links
-        updated_content = self.update_internal_links(section_info['content'])
         section_info['output_path'] = output_path
         section_info['permalink'] = permalink
         section_info['slug'] = output_path.stem
+        section_info['front_matter'] = front_matter
+        return True
+    
+    def resolve_subsection_page(self, section_info: Dict) -> bool:
+        """Place a subsection under its parent's page, as docs/<parent>/<slug>.markdown."""
+        parent_page = section_info.get('parent_page')
+        if not parent_page:
+            self.errors.append(f"Section {section_info['key']} skipped: its parent section has no page")
+            return False
         
+        parent_path, parent_permalink = parent_page
+        output_path = parent_path.with_suffix('') / f"{section_info['slug']}.markdown"
+        permalink = f"{parent_permalink.rstrip('/')}/{section_info['slug']}/"
+        front_matter = None
+        if output_path.exists():
+            try:
+                front_matter = self.page_index.read_front_matter(output_path)
+            except Exception as e:
+                self.errors.append(f"Error reading existing page {output_path}: {e}")
+                return False
+        
+        if front_matter is None:
+            front_matter = f"""---
+layout: page
+title: "{section_info['title']}"
+permalink: {permalink}
+nav_category: "{section_info['category']}"
+section_number: {section_info['section_number']}
+---
+"""
+        else:
+            permalink = self.extract_permalink_from_front_matter(front_matter, section_info['slug'])
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        section_info['output_path'] = output_path
+        section_info['permalink'] = permalink
+        section_info['front_matter'] = front_matter
+        return True
+    
+    def generate_markdown_file(self, section_info: Dict,
+                               rewriter: Optional[CrossReferenceRewriter] = None,
+                               previous_output: Optional[Dict] = None) -> bool:
+        """Generate Jekyll markdown file for a section.
+        
+        The page is assembled in memory and written only if its bytes
+        changed; section_info['written'] records which happened.
+        """
+        if 'front_matter' not in section_info and not self.resolve_output_page(section_info):
+            return False
+        
+        # The text is released once the page is written
+        content = section_info.pop('content', None)
+        if content is None:
+            try:
+                with open(section_info['source_file'], 'r', encoding='utf-8') as f:
+                    content = f.read()
+                count_read(len(content))
+            except OSError as e:
+                self.errors.append(f"Error reading {section_info['source_file']}: {e}")
+                return False
+        
+        # Update content with proper links, including cross-references to
+        # other sections, before the page is written
+        updated_content = self.update_internal_links(content, section_info['source_file'])
+        if rewriter:
+            updated_content = rewriter.rewrite(updated_content)
+        
+        output_path = section_info['output_path']
+        front_matter = section_info['front_matter']
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(front_matter + updated_content)
+            page = front_matter + updated_content
+            section_info['written'] = write_if_changed(output_path, page, previous_output)
+            index = self.other_pages if section_info.get('parent') else self.page_index
+            index.refresh(output_path, front_matter)
+            self.link_graph.record(output_path, page)
             return True
         except Exception as e:
             self.errors.append(f"Error writing {output_path}: {e}")
             return False
     
-    def generate_config_navigation(self) -> str:
-        """Generate improved Jekyll navigation configuration."""
-        nav_config = '# Navigation Bar\nnavbar-links:\n'
+    def resolve_permalink_collisions(self, rebuilt_sections: List[Dict]) -> List[Dict]:
+        """Give every permalink under docs/ a single page, chosen by the precedence policy.
         
-        # Generate categorized navigation
-        for category_name, category_info in self.nav_categories.items():
-            if not category_info['sections']:
-                continue
-                
-            nav_config += f'  "{category_name}":\n'
-            
-            for section in category_info['sections']:
-                title = section['title']
-                permalink = section.get('permalink', f"/{section['slug']}/")
-                nav_config += f'    - "{title}": "{permalink}"\n'
+        Contenders are the pages about to be written plus every page already
+        under docs/. A losing page on disk is deleted; a losing section adopts
+        the winning page instead of writing its own, as sections already do
+        for hand-authored pages that carry their section_number.
+        """
+        docs_dir = self.output_dir / 'docs'
+        planned = {id(info): info for info in rebuilt_sections}
+        planned_paths = {info['output_path'] for info in rebuilt_sections}
+        section_outputs = {info['output_path'] for info in self.sections}
+        owners = {}
+        for info in self.sections:
+            owners.setdefault(normalize_permalink(info['permalink']), info['section_number'])
         
-        # Add resources section
-        nav_config += '''  Resources:
-    - Contributing: "/contributing/"
-    - GitHub Repo: "https://github.com/CroodSolutions/CISOinaBox"
-'''
+        claims = {}
         
-        return nav_config
-    
-    def update_links_between_sections(self):
-        """Update cross-references between sections."""
-        docs_dir = self.output_dir / 'docs'
+        def claim(path: Path, permalink: str, section_number: Optional[int], section: Optional[Dict] = None):
+            key = normalize_permalink(permalink)
+            claims.setdefault(key, []).append({
+                'path': path,
+                'rel': path.relative_to(self.output_dir).as_posix(),
+                'generated': path in section_outputs,
+                'section_match': owners.get(key) is not None and section_number == owners[key],
+                'section': section
+            })
         
-        for section in self.sections:
-            filepath = section.get('output_path', docs_dir / f"{section['slug']}.markdown")
-            if not filepath.exists():
+        for info in planned.values():
+            claim(info['output_path'], info['permalink'], info['section_number'], info)
+        for index in (self.page_index, self.other_pages):
+            for path, fields in index.records():
+                if path not in planned_paths and docs_dir in path.parents and fields.get('permalink'):
+                    claim(path, fields['permalink'], fields.get('section_number'))
+        
+        dropped = []
+        for permalink, pages in sorted(claims.items()):
+            if len(pages) < 2:
                 continue
-                
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Update section-to-section links
-            for other_section in self.sections:
-                # Look for references to other sections
-                patterns = [
-                    rf'\[([^\]]*{re.escape(other_section["raw_title"])}[^\]]*)\]\([^)]*\)',
-                    rf'\[([^\]]*{re.escape(other_section["title"])}[^\]]*)\]\([^)]*\)',
-                ]
-                
-                for pattern in patterns:
-                    target_permalink = other_section.get('permalink', f"/{other_section['slug']}/")
-                    content = re.sub(
-                        pattern,
-                        f'[\\1]({target_permalink})',
-                        content
-                    )
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            ranks = [[PERMALINK_RULES[rule](page) for rule in self.permalink_policy] for page in pages]
+            order = sorted(range(len(pages)), key=lambda index: ranks[index])
+            winner = pages[order[0]]
+            for index in order[1:]:
+                page = pages[index]
+                rule = next((rule for rule, mine, theirs in zip(self.permalink_policy, ranks[index], ranks[order[0]])
+                             if mine != theirs), 'same page')
+                if page['section']:
+                    page['section']['output_path'] = winner['path']
+                    page['section']['superseded_by'] = winner['rel']
+                elif page['path'] != winner['path']:
+                    remove_output(page['path'])
+                    self.page_index.remove(page['path'])
+                    self.other_pages.remove(page['path'])
+                    # An unchanged section whose page this was is served by the winner
+                    # now; it adopts that page when it is next rebuilt
+                    for info in self.sections:
+                        if info['output_path'] == page['path']:
+                            info['output_path'] = winner['path']
+                dropped.append({'permalink': permalink, 'kept': winner['rel'], 'dropped': page['rel'], 'rule': rule})
+        return dropped
+    
+    def generate_navigation(self) -> Tuple[List[Menu], List[Dict]]:
+        """Navbar menus and the ordered sections of each category."""
+        categories = {
+            category_name: [
+                {
+                    'title': section['title'],
+                    'permalink': section.get('permalink', f"/{section['slug']}/"),
+                    'section_number': section['number']
+                }
+                for section in category_info['sections']
+            ]
+            for category_name, category_info in self.nav_categories.items()
+        }
+        
+        # Hand-authored pages in docs/ are listed too, by their front matter
+        outputs = {section.get('output_path') for section in self.sections}
+        add_page_sections(categories, [(path, fields) for path, fields in self.page_index.records()
+                                       if path not in outputs])
+        
+        return build_navigation(categories)
     
     def validate_site(self) -> Dict[str, List[str]]:
         """Validate the generated site for issues."""
         validation_results = {
             'missing_files': [],
             'broken_links': [],
-            'missing_assets': []
+            'missing_assets': [],
+            'duplicate_permalinks': [],
+            'broken_external_links': []
         }
         
         # Check all markdown files exist
@@ -414,107 +1280,523 @@ section_number: {section_info['number']}
             if not filepath.exists():
                 validation_results['missing_files'].append(str(filepath))
         
-        # Check for asset references
-        docs_dir = self.output_dir / 'docs'
-        for md_file in docs_dir.glob('*.markdown'):
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find asset links
-            asset_links = re.findall(r'\[([^\]]*)\]\(/assets/([^)]+)\)', content)
-            for link_text, asset_path in asset_links:
-                full_asset_path = self.output_dir / 'assets' / asset_path
-                if not full_asset_path.exists():
-                    validation_results['missing_assets'].append(f"{asset_path} referenced in {md_file.name}")
+        # Check for pages competing for the same permalink
+        for permalink, paths in self.page_index.duplicate_permalinks().items():
+            names = ', '.join(path.name for path in paths)
+            validation_results['duplicate_permalinks'].append(f"{permalink} claimed by {names}")
+        
+        # Check every internal link against the known permalinks and assets.
+        # Pages written this run were scanned as they were written; the rest
+        # come from the link cache unless they changed on disk.
+        pages = {rel: page['permalink'] for rel, page in self.site_pages().items()}
+        self.link_graph.scan([self.output_dir / rel for rel in pages])
+        self.link_diagnostics = self.link_graph.check(pages, self.asset_store.exists)
+        
+        buckets = {'broken_link': 'broken_links', 'missing_asset': 'missing_assets'}
+        for diagnostic in self.link_diagnostics:
+            validation_results[buckets[diagnostic['problem']]].append(
+                f"{diagnostic['file']}:{diagnostic['line']}: {diagnostic['target']}"
+            )
+        
+        validation_results['broken_external_links'] = self.check_external_links()
         
         return validation_results
     
+    def render_preview(self, menus: List[Menu]):
+        """Render the docs/ pages to _preview/, re-rendering only pages that changed."""
+        from preview_render import PREVIEW_DIR, PreviewRenderer
+        
+        paths = [self.output_dir / rel for rel in self.site_pages() if rel.startswith('docs/')]
+        stats = PreviewRenderer(self.output_dir).render(paths, menus)
+        print(f"👁️  Preview: {stats['rendered']} page(s) rendered, {stats['unchanged']} unchanged, "
+              f"{stats['removed']} removed → {PREVIEW_DIR}/")
+    
+    def site_pages(self) -> Dict[str, Dict]:
+        """Permalink and title of every page, by path relative to the site."""
+        pages = {}
+        for index in (self.other_pages, self.page_index):
+            for path, fields in index.records():
+                rel = path.relative_to(self.output_dir).as_posix()
+                pages[rel] = {'permalink': fields.get('permalink') or '/' + rel.rsplit('.', 1)[0] + '.html',
+                              'title': fields.get('title') or path.stem}
+        return pages
+    
+    def update_related_pages(self, page_hashes: Dict[str, str]):
+        """Write each page's backlinks (from the link graph) and related sections
+        (from their search terms) to _data/ for the layout.
+        
+        page_hashes maps section keys to the hash of their page, which keys
+        the cached similarity signatures.
+        """
+        pages = self.site_pages()
+        by_permalink = {page['permalink']: page for page in pages.values()}
+        
+        backlinks = {}
+        with self.link_graph.lock:
+            graph = sorted(self.link_graph.pages.items())
+        for rel, entry in graph:
+            source = pages.get(rel)
+            if not source:
+                continue
+            targets = {self.link_graph.resolve(target, source['permalink']) for _, _, target in entry['links']}
+            for target in sorted(target for target in targets if target):
+                page = by_permalink.get(target) or by_permalink.get(target.rstrip('/') + '/')
+                if page and page is not source:
+                    backlinks.setdefault(page['permalink'], []).append(
+                        {'title': source['title'], 'url': source['permalink']})
+        for links in backlinks.values():
+            links.sort(key=lambda link: (link['title'], link['url']))
+        
+        # Pages another page replaced have no terms and no related sections
+        sections = {section_info['key']: section_info for section_info in self.sections}
+        with self.search_index.lock:
+            docs = {key: self.search_index.docs[key]['terms'] for key in sections if key in self.search_index.docs}
+        related = {
+            sections[key]['permalink']: [{'title': sections[other]['title'], 'url': sections[other]['permalink']}
+                                         for other, _ in matches]
+            for key, matches in self.related_pages.related(docs, page_hashes).items()
+        }
+        
+        written = self.related_pages.write(related, backlinks)
+        stats = self.related_pages.stats
+        print(f"🧭 Related pages: {stats['related']} section(s) with related sections, "
+              f"{stats['backlinks']} page(s) with backlinks{' (updated)' if written else ''}; "
+              f"{stats['signatures_computed']} signature(s) computed, {stats['pairs_compared']} pair(s) compared")
+    
+    def check_external_links(self) -> List[str]:
+        """Broken external links of the pages and assets/*.txt, from the link checker's cache.
+        
+        Stale URLs are only requested with check_external, so a build never
+        waits on the network unless asked to.
+        """
+        checker = ExternalLinkChecker(self.output_dir / BUILD_CACHE_DIR / 'external-links.json')
+        if not self.check_external and not checker.results:
+            return []
+        
+        with self.link_graph.lock:
+            urls = external_urls(self.link_graph.pages)
+        for rel in sorted(rel for rel in self.asset_store.outputs if rel.endswith('.txt')):
+            with open(self.output_dir / rel, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+            count_read(len(text))
+            text_urls(text, rel, urls)
+        
+        results = checker.check(urls, offline=not self.check_external)
+        self.external_link_stats = dict(checker.stats)
+        if self.check_external:
+            checker.save(keep=urls)
+            stats = checker.stats
+            print(f"🌐 External links: {stats['checked']} checked, {stats['cached']} from cache, "
+                  f"{stats['broken']} broken")
+        
+        return [f"{rel}:{line}: {url} ({describe(record)})"
+                for url, record in sorted(results.items()) if record['ok'] is False
+                for rel, line in urls[url]]
+    
+    
+    def update_navigation(self, menus: List[Menu], categories: List[Dict]) -> bool:
+        """Write navigation to _data/navigation.yml or _config.yml, only if it changed."""
+        path, written = write_navigation(self.output_dir, menus, categories, self.nav_output)
+        name = path.relative_to(self.output_dir).as_posix()
+        if written:
+            print(f"💾 Updated {name} with improved navigation")
+        else:
+            print(f"💾 Navigation unchanged, {name} left as is")
+        return written
+    
+    def generator_fingerprint(self) -> str:
+        """Hash of the converter's and BUILD_MODULES' source, so code changes invalidate the manifest."""
+        digest = hashlib.sha256()
+        build_dir = Path(__file__).resolve().parent
+        for module_file in [Path(__file__).resolve()] + [build_dir / f'{name}.py' for name in BUILD_MODULES]:
+            digest.update(hash_file(module_file).encode('ascii'))
+        return digest.hexdigest()
+    
+    def load_manifest(self) -> Dict:
+        """Load the build manifest from the previous run, if it is still usable."""
+        empty = {
+            'version': MANIFEST_VERSION,
+            'generator': self.generator_fingerprint(),
+            'link_table': None,
+            'sections': {}
+        }
+        if self.force or not self.manifest_path.exists():
+            return empty
+        
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            manifest = json.loads(text)
+        except (OSError, ValueError) as e:
+            self.warnings.append(f"Ignoring unreadable build manifest {self.manifest_path}: {e}")
+            return empty
+        
+        if manifest.get('version') != empty['version'] or manifest.get('generator') != empty['generator']:
+            return empty
+        return manifest
+    
+    def save_manifest(self, manifest: Dict):
+        """Persist the build manifest for the next run."""
+        text = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+        try:
+            write_if_changed(self.manifest_path, text)
+        except OSError as e:
+            self.warnings.append(f"Could not write build manifest {self.manifest_path}: {e}")
+    
+    def scan_section_inputs(self, section: Dict, previous: Optional[Dict]) -> Dict:
+        """Fingerprint a section's readme and assets without reading unchanged files."""
+        previous = previous or {}
+        content_file = self.find_content_file(section['path'], section.get('files'))
+        
+        inputs = {
+            'source': str(content_file.relative_to(self.source_dir)) if content_file else None,
+            'source_record': None,
+            'assets': {}
+        }
+        if content_file:
+            same_source = previous.get('source') == inputs['source']
+            inputs['source_record'] = file_record(content_file, previous.get('source_record') if same_source else None)
+        
+        for asset_file in self.list_section_assets(section['path'], section.get('files')):
+            record = self.asset_store.source_record(asset_file)
+            if record:
+                inputs['assets'][asset_file.name] = record
+        
+        return inputs
+    
+    def section_is_dirty(self, inputs: Dict, previous: Optional[Dict]) -> bool:
+        """Check whether a section's inputs or outputs changed since the last build."""
+        if not previous or not inputs['source_record']:
+            return True
+        if previous.get('source') != inputs['source']:
+            return True
+        if previous['source_record'].get('sha256') != inputs['source_record']['sha256']:
+            return True
+        
+        previous_assets = previous.get('assets', {})
+        if set(previous_assets) != set(inputs['assets']):
+            return True
+        for name, record in inputs['assets'].items():
+            if previous_assets[name].get('sha256') != record['sha256']:
+                return True
+            target = self.asset_target(name).relative_to(self.output_dir).as_posix()
+            if not self.asset_store.exists(target):
+                return True
+        
+        # Hand edits to the generated page also force a rebuild
+        previous_output = previous.get('output_record') or {}
+        output_record = file_record(self.output_dir / previous['output'], previous_output)
+        if not output_record or output_record['sha256'] != previous_output.get('sha256'):
+            return True
+        
+        return False
+    
+    def section_from_manifest(self, section: Dict, previous: Dict) -> Dict:
+        """Rebuild a section's metadata from the manifest without reading its content."""
+        return {
+            'key': section['key'],
+            'number': section['number'],
+            'section_number': section['section_number'],
+            'parent': section['parent'],
+            'name': section['name'],
+            'title': previous['title'],
+            'raw_title': previous['raw_title'],
+            'slug': previous['slug'],
+            'category': previous['category'],
+            'category_scores': previous.get('category_scores', {}),
+            'source_file': self.source_dir / previous['source'],
+            'output_path': self.output_dir / previous['output'],
+            'permalink': previous['permalink']
+        }
+    
+    def manifest_entry(self, section_info: Dict, inputs: Dict, previous: Optional[Dict]) -> Dict:
+        """Build the manifest record for a section after it has been generated."""
+        previous_output = previous.get('output_record') if previous else None
+        return {
+            'name': section_info.get('name'),
+            'source': inputs['source'],
+            'source_record': inputs['source_record'],
+            'assets': inputs['assets'],
+            'output': str(section_info['output_path'].relative_to(self.output_dir)),
+            'output_record': file_record(section_info['output_path'], previous_output),
+            'title': section_info['title'],
+            'raw_title': section_info['raw_title'],
+            'slug': section_info['slug'],
+            'permalink': section_info['permalink'],
+            'category': section_info['category'],
+            'category_scores': section_info.get('category_scores', {})
+        }
+    
+    def section_summary(self, section_info: Dict) -> Dict:
+        """A section's metadata for the report, without its text."""
+        summary = {field: section_info.get(field) for field in REPORT_FIELDS}
+        summary['output'] = section_info['output_path'].relative_to(self.output_dir).as_posix()
+        return summary
+    
+    def link_table_fingerprint(self, sections: List[Dict]) -> str:
+        """Hash the titles, permalinks and asset paths that link rewriting depends on."""
+        table = [
+            [section['key'], section['title'], section['raw_title'], section.get('permalink')]
+            for section in sections
+        ]
+        with self.asset_store.lock:
+            table.append(sorted([rel, record.get('source')] for rel, record in self.asset_store.outputs.items()))
+        return hashlib.sha256(json.dumps(table).encode('utf-8')).hexdigest()
+    
+    def timed_section(self, key: str, stage: str, task: Callable, *args):
+        """Run one stage of a section's work, attributing its cost to that section."""
+        with self.profiler.section(key, stage):
+            return task(*args)
+    
+    def build_section(self, section: Dict) -> Optional[Dict]:
+        """Process a section and resolve the page it will be written to."""
+        self.log(f"📝 Processing section {section['key']}: {section['name']}")
+        section_info = self.process_section(section)
+        if section_info:
+            section_info['parent_page'] = section.get('parent_page')
+        
+        if not section_info or not self.resolve_output_page(section_info):
+            self.log(f"  ❌ Failed to process section {section['key']}")
+            return None
+        
+        section_info['name'] = section['name']
+        return section_info
+    
     def convert(self) -> Dict:
         """Main conversion method."""
+        with build_profile.activate(self.profiler):
+            report = self._convert()
+        report['profile'] = self.profiler.to_dict()
+        return report
+    
+    def _convert(self) -> Dict:
         print("🚀 Starting improved CISOinaBox to Jekyll conversion...")
         
-        # Find all sections
-        raw_sections = self.find_sections()
-        print(f"📁 Found {len(raw_sections)} sections")
+        with self.profiler.phase('discovery'):
+            # Find all sections
+            raw_sections = self.find_sections()
+            print(f"📁 Found {len(raw_sections)} sections")
+        
+        with self.profiler.phase('scanning'):
+            # Work out which sections changed since the last build
+            manifest = self.load_manifest()
+            previous_sections = manifest['sections']
+            if self.force:
+                print("🧹 Forcing a full rebuild")
+        
+            # Build the page index and asset store up front rather than racing to
+            # build them in workers
+            self.page_index
+            self.other_pages
+            self.link_graph
+            self.search_index
+            self.asset_store
+            section_inputs = dict(zip(
+                [section['key'] for section in raw_sections],
+                self.run_section_tasks(
+                    lambda section: self.timed_section(
+                        section['key'], 'scan', self.scan_section_inputs,
+                        section, previous_sections.get(section['key'])
+                    ),
+                    raw_sections
+                )
+            ))
         
-        # Process each section
-        for section in raw_sections:
-            print(f"📝 Processing section {section['number']:02d}: {section['name']}")
-            section_info = self.process_section(section)
+            built = {}
+            dirty_sections = []
+            for section in raw_sections:
+                key = section['key']
+                # A section the search index lacks is re-read to index it
+                if self.section_is_dirty(section_inputs[key], previous_sections.get(key)) \
+                        or not self.search_index.has(key):
+                    dirty_sections.append(section)
+                else:
+                    print(f"♻️  Unchanged section {key}: {section['name']}")
+        
+        def parent_page(key: str) -> Optional[Tuple[Path, str]]:
+            if key in built:
+                return (built[key]['output_path'], built[key]['permalink']) if built[key] else None
+            if key in previous_sections:
+                return self.output_dir / previous_sections[key]['output'], previous_sections[key]['permalink']
+            return None
+        
+        def build_sections(sections: List[Dict]):
+            for section in sections:
+                for name in section_inputs[section['key']]['assets']:
+                    self._asset_owners[self.asset_target(name)] = section['path']
+            def build(section: Dict) -> Optional[Dict]:
+                return self.timed_section(section['key'], 'process', self.build_section, section)
             
-            if section_info:
-                self.sections.append(section_info)
-                # Add to appropriate category
+            # Subsections are placed under their parent's page, so parents
+            # are resolved first; each level still runs in parallel
+            for depth in sorted({section['depth'] for section in sections}):
+                level = [section for section in sections if section['depth'] == depth]
+                for section in level:
+                    if section['parent']:
+                        section['parent_page'] = parent_page(section['parent'])
+                for section, section_info in zip(level, self.run_section_tasks(build, level)):
+                    built[section['key']] = section_info
+        
+        with self.profiler.phase('processing'):
+            build_sections(dirty_sections)
+        
+        def current_sections() -> List[Dict]:
+            sections = []
+            for section in raw_sections:
+                key = section['key']
+                if key in built:
+                    if built[key]:
+                        sections.append(built[key])
+                elif key in previous_sections:
+                    sections.append(self.section_from_manifest(section, previous_sections[key]))
+            return sections
+        
+        with self.profiler.phase('processing'):
+            # Titles or permalinks changed: every page's cross-links may be stale
+            link_table = self.link_table_fingerprint(current_sections())
+            if link_table != manifest.get('link_table'):
+                build_sections([section for section in raw_sections if section['key'] not in built])
+                link_table = self.link_table_fingerprint(current_sections())
+        
+        self.sections = current_sections()
+        for section_info in self.sections:
+            if not section_info.get('parent'):
                 self.nav_categories[section_info['category']]['sections'].append(section_info)
-                self.nav_categories[section_info['category']]['sections'].sort(key=lambda x: x['number'])
-                
-                # Generate markdown file
-                if self.generate_markdown_file(section_info):
-                    print(f"  ✅ Generated {section_info['slug']}.markdown")
+        for category_info in self.nav_categories.values():
+            category_info['sections'].sort(key=lambda x: x['number'])
+        
+        with self.profiler.phase('writing'):
+            # Generate pages with cross-links resolved in memory
+            print("🔗 Writing pages with cross-references...")
+            rewriter = CrossReferenceRewriter(self.sections)
+            rebuilt_sections = [built[section['key']] for section in raw_sections if built.get(section['key'])]
+            
+            # One page per permalink, decided before anything is written
+            self.dropped_pages = self.resolve_permalink_collisions(rebuilt_sections)
+            for drop in self.dropped_pages:
+                print(f"🔀 {drop['permalink']}: kept {drop['kept']}, dropped {drop['dropped']} ({drop['rule']})")
+        
+            def write_page(section_info: Dict):
+                previous = previous_sections.get(section_info['key']) or {}
+                same_output = previous.get('output') == section_info['output_path'].relative_to(self.output_dir).as_posix()
+                self.index_for_search(section_info)
+                if section_info.get('superseded_by'):
+                    section_info.pop('content', None)
+                    self.log(f"  ↪️  {section_info['slug']}.markdown not written; {section_info['superseded_by']} "
+                             f"serves {section_info['permalink']}")
+                elif self.generate_markdown_file(section_info, rewriter,
+                                                 previous.get('output_record') if same_output else None):
+                    if section_info['written']:
+                        self.log(f"  ✅ Generated {section_info['slug']}.markdown")
+                    else:
+                        self.log(f"  ✅ {section_info['slug']}.markdown already up to date")
                 else:
-                    print(f"  ❌ Failed to generate {section_info['slug']}.markdown")
-            else:
-                print(f"  ❌ Failed to process section {section['number']:02d}")
+                    self.log(f"  ❌ Failed to generate {section_info['slug']}.markdown")
+        
+            self.run_section_tasks(
+                lambda section_info: self.timed_section(section_info['key'], 'write', write_page, section_info),
+                rebuilt_sections
+            )
+        
+        with self.profiler.phase('manifest'):
+            # Record what was built for the next run
+            manifest['sections'] = {}
+            for section in raw_sections:
+                key = section['key']
+                if key in built:
+                    if built[key]:
+                        manifest['sections'][key] = self.manifest_entry(
+                            built[key], section_inputs[key], previous_sections.get(key)
+                        )
+                elif key in previous_sections:
+                    manifest['sections'][key] = previous_sections[key]
+            manifest['link_table'] = link_table
+            self.save_manifest(manifest)
+        
+        with self.profiler.phase('assets'):
+            self.asset_store.deduplicate()
+            self.asset_store.save()
+            asset_stats = self.asset_store.stats
+            print(f"📦 Assets: {asset_stats['copied']} copied, {asset_stats['linked']} linked, "
+                  f"{asset_stats['unchanged']} unchanged, {asset_stats['deduplicated']} deduplicated")
         
-        # Update cross-links
-        print("🔗 Updating cross-references...")
-        self.update_links_between_sections()
+        with self.profiler.phase('workbooks'):
+            # Unchanged workbooks are not opened
+            workbook_stats = self.workbook_pages.build(self.section_workbooks(raw_sections), self.search_index.has)
+            for source, message in self.workbook_pages.failures:
+                self.warnings.append(f"Could not read workbook {source}: {message}")
+            print(f"📊 Workbooks: {workbook_stats['converted']} converted, {workbook_stats['unchanged']} unchanged, "
+                  f"{workbook_stats['failed']} failed ({workbook_stats['sheets']} sheets, {workbook_stats['rows']} rows)")
         
-        # Generate navigation config
-        print("⚙️  Generating navigation configuration...")
-        nav_config = self.generate_config_navigation()
+        with self.profiler.phase('search'):
+            # Rebuilt pages were indexed as they were written; converted
+            # workbook sheets are indexed here
+            for document in self.workbook_pages.documents:
+                self.search_index.add(*document)
+            self.search_index.update([section_info['key'] for section_info in rebuilt_sections] +
+                                     [document[0] for document in self.workbook_pages.documents],
+                                     {section_info['key'] for section_info in self.sections} |
+                                     set(self.workbook_pages.doc_ids()))
+            search_stats = self.search_index.stats
+            print(f"🔎 Search index: {search_stats['indexed']} page(s) indexed, "
+                  f"{search_stats['shards_written']} of {search_stats['shards']} shards written")
         
-        # Update _config.yml
-        config_path = self.output_dir / '_config.yml'
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_content = f.read()
+        with self.profiler.phase('navigation'):
+            # Generate navigation; data mode leaves _config.yml alone
+            print("⚙️  Generating navigation configuration...")
+            menus, categories = self.generate_navigation()
         
-        # Replace navbar-links section
-        config_content = re.sub(
-            r'# Navigation Bar\nnavbar-links:.*?(?=\n\n|\n#|\Z)',
-            nav_config.strip(),
-            config_content,
-            flags=re.DOTALL
-        )
+            self.update_navigation(menus, categories)
         
-        with open(config_path, 'w', encoding='utf-8') as f:
-            f.write(config_content)
+        if self.preview:
+            with self.profiler.phase('preview'):
+                self.render_preview(menus)
         
-        print("💾 Updated _config.yml with improved navigation")
+        with self.profiler.phase('validation'):
+            # Validate the site
+            print("🔍 Validating generated site...")
+            validation_results = self.validate_site()
+            self.link_graph.save()
+            self.page_cache.save()
         
-        # Validate the site
-        print("🔍 Validating generated site...")
-        validation_results = self.validate_site()
+        with self.profiler.phase('related'):
+            # Backlinks need the link graph validation just brought up to date
+            self.update_related_pages({key: entry['output_record']['sha256']
+                                       for key, entry in manifest['sections'].items() if entry.get('output_record')})
         
         # Generate report
         report = {
             'sections_processed': len(self.sections),
+            'sections_rebuilt': len(rebuilt_sections),
+            'rebuilt': [section_info['slug'] for section_info in rebuilt_sections],
             'categories_created': len([cat for cat in self.nav_categories.values() if cat['sections']]),
             'errors': self.errors,
             'warnings': self.warnings,
             'validation': validation_results,
-            'sections': self.sections,
-            'categories': {name: {'count': len(info['sections']), 'sections': info['sections']} 
+            'links': dict(self.link_graph.stats(), diagnostics=self.link_diagnostics),
+            'external_links': self.external_link_stats,
+            'permalinks': {'policy': self.permalink_policy, 'dropped': self.dropped_pages},
+            'assets': dict(self.asset_store.stats),
+            'search': dict(self.search_index.stats),
+            'workbooks': dict(self.workbook_pages.stats),
+            'related': dict(self.related_pages.stats),
+            'sections': [self.section_summary(section_info) for section_info in self.sections],
+            'categories': {name: {'count': len(info['sections']),
+                                  'sections': [self.section_summary(section_info) for section_info in info['sections']]}
                           for name, info in self.nav_categories.items() if info['sections']}
         }
         
         return report
 
-def main():
-    """Main execution function."""
-    _script_dir = Path(__file__).resolve().parent
-    _repo_root = _script_dir.parent
-    source_dir = str(_repo_root)
-    output_dir = str(_script_dir)
-    
-    converter = ImprovedCISOToJekyllConverter(source_dir, output_dir)
-    report = converter.convert()
-    
+def print_report(report: Dict, output_dir: str, show_profile: bool = False):
+    """Print the conversion summary."""
     print("\n" + "="*60)
     print("🎉 CONVERSION COMPLETE")
     print("="*60)
     
     print(f"✅ Sections processed: {report['sections_processed']}")
+    print(f"✅ Sections rebuilt: {report['sections_rebuilt']}")
     print(f"✅ Categories created: {report['categories_created']}")
     
     if report['errors']:
@@ -527,6 +1809,12 @@ def main():
         for warning in report['warnings']:
             print(f"  • {warning}")
     
+    dropped = report['permalinks']['dropped']
+    if dropped:
+        print(f"\n🔀 PERMALINK COLLISIONS ({len(dropped)}, policy: {', '.join(report['permalinks']['policy'])}):")
+        for drop in dropped:
+            print(f"  • {drop['permalink']}: kept {drop['kept']}, dropped {drop['dropped']} ({drop['rule']})")
+    
     validation = report['validation']
     total_issues = sum(len(issues) for issues in validation.values())
     if total_issues > 0:
@@ -539,6 +1827,19 @@ def main():
                 if len(issues) > 3:
                     print(f"    ... and {len(issues) - 3} more")
     
+    profile = report.get('profile')
+    if show_profile and profile:
+        print(f"\n⏱️  PHASES ({profile['totals']['wall_ms']:.0f} ms, "
+              f"{profile['totals']['bytes_read'] // 1024} KB read, "
+              f"{profile['totals']['bytes_written'] // 1024} KB written):")
+        for phase, metrics in profile['phases'].items():
+            print(f"  {phase:<12} {metrics['wall_ms']:>8.1f} ms  {metrics['file_opens']:>5} opens  "
+                  f"{metrics['regex_ops']:>6} regex ops")
+        if 'peak_memory_bytes' in profile:
+            print(f"  peak memory: {profile['peak_memory_bytes'] / 1024 / 1024:.1f} MB")
+        for hot in profile.get('hot_functions', [])[:5]:
+            print(f"  🔥 {hot['function']}: {hot['cumulative_s']:.3f}s cumulative, {hot['calls']} calls")
+    
     print(f"\n📋 CATEGORIES CREATED:")
     for cat_name, cat_info in report['categories'].items():
         print(f"  📁 {cat_name}: {cat_info['count']} sections")
@@ -548,5 +1849,178 @@ def main():
     print(f"\n🚀 Site is ready for testing!")
     print(f"Run: cd {output_dir} && export GEM_HOME=~/tmp/gems && ~/tmp/gems/bin/bundle exec jekyll serve")
 
+
+def run_build(converter: ImprovedCISOToJekyllConverter, profile: Optional[Path] = None,
+              profile_format: str = 'json', cprofile: Optional[Path] = None, trace_memory: bool = False,
+              link_report: Optional[Path] = None) -> Dict:
+    """Convert, print the report and write the requested profile and link report."""
+    report, findings = build_profile.run_with_hooks(
+        converter.convert, cprofile_path=cprofile, trace_memory=trace_memory
+    )
+    report['profile'].update(findings)
+    print_report(report, str(converter.output_dir), show_profile=bool(profile or cprofile or trace_memory))
+    
+    if profile:
+        converter.profiler.write(profile, profile_format, findings)
+        print(f"⏱️  Wrote {profile_format} profile to {profile}")
+    
+    if link_report:
+        link_report.write_text(json.dumps(report['links'], indent=2) + '\n', encoding='utf-8')
+        print(f"🔗 Wrote link report to {link_report}")
+    return report
+
+
+def watch(source_dir: str, output_dir: str, jobs: int = 1, polling: bool = False,
+          debounce: float = 0.2, force: bool = False, permalink_policy: Optional[List[str]] = None,
+          nav_output: str = 'auto', stream: bool = False, preview: bool = False):
+    """Rebuild whatever a change touches, printing the latency of each rebuild.
+    
+    Each event runs a fresh convert(): the changed paths only name the
+    trigger, and the build manifest decides what is rebuilt (a section whose
+    sources' size and mtime still match is not re-read). Errors, warnings and
+    validation issues of every rebuild are printed; a rebuild that raises
+    prints its output and the watch goes on.
+    
+    Changes seen while a rebuild runs are kept for the next one, except the
+    rebuild's own writes: files it wrote or removed that are still as it left them.
+    """
+    import contextlib
+    import io
+    import time
+    from site_output import is_recorded_write, recording_writes
+    from site_watcher import create_watcher
+    
+    converter = ImprovedCISOToJekyllConverter(source_dir, output_dir, force=force, jobs=jobs,
+                                              permalink_policy=permalink_policy, nav_output=nav_output,
+                                              stream=stream, preview=preview)
+    print_report(converter.convert(), output_dir)
+    
+    site = Path(output_dir)
+    watched_suffixes = {'.md', '.markdown'} | {f'.{asset_type}' for asset_type in ASSET_TYPES}
+    
+    def include(path: Path) -> bool:
+        return path.name == '_config.yml' or path.suffix in watched_suffixes
+    
+    def watch_specs() -> List[Tuple[Path, bool]]:
+        specs = [(Path(source_dir), False), (site, False), (site / 'docs', True)]
+        specs.extend((section['path'], False) for section in converter.iter_sections())
+        return specs
+    
+    watcher = create_watcher(watch_specs(), include, polling=polling)
+    print(f"\n👀 Watching sections, docs/ and _config.yml ({watcher.name}); Ctrl+C to stop")
+    
+    try:
+        while True:
+            changed = watcher.wait(debounce)
+            started = time.perf_counter()
+            
+            converter = ImprovedCISOToJekyllConverter(source_dir, output_dir, jobs=jobs,
+                                                      permalink_policy=permalink_policy, nav_output=nav_output,
+                                                      stream=stream, preview=preview)
+            names = ', '.join(sorted(path.name for path in changed)[:3])
+            more = f" (+{len(changed) - 3} more)" if len(changed) > 3 else ''
+            output = io.StringIO()
+            failure = None
+            with recording_writes() as written:
+                try:
+                    with contextlib.redirect_stdout(output):
+                        report = converter.convert()
+                except Exception as e:
+                    failure = e
+            # Our own writes to docs/ and the navigation are not edits; anything
+            # else that changed during the rebuild triggers the next one
+            watcher.defer(path for path in watcher.pending() if not is_recorded_write(path, written))
+            if failure:
+                print(output.getvalue(), end='')
+                print(f"🔁 {names}{more} → ❌ rebuild failed: {type(failure).__name__}: {failure}")
+                continue
+            watcher.watch(watch_specs())
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"🔁 {names}{more} → rebuilt {report['sections_rebuilt']} section(s) in {elapsed_ms:.0f} ms")
+            for slug in report['rebuilt']:
+                print(f"  ✅ {slug}.markdown")
+            for drop in report['permalinks']['dropped']:
+                print(f"  🔀 {drop['permalink']}: dropped {drop['dropped']}")
+            for error in report['errors']:
+                print(f"  ❌ {error}")
+            for warning in report['warnings']:
+                print(f"  ⚠️  {warning}")
+            issues = [issue for issues in report['validation'].values() for issue in issues]
+            if issues:
+                print(f"  🔍 {len(issues)} validation issue(s)")
+                for issue in issues[:3]:
+                    print(f"    • {issue}")
+                if len(issues) > 3:
+                    print(f"    ... and {len(issues) - 3} more")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Convert CISOinaBox sections into the Jekyll site")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the build manifest and rebuild every section")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="process sections on N worker threads (0 = one per CPU)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after building, rebuild affected pages whenever sources change")
+    parser.add_argument('--poll', action='store_true',
+                        help="with --watch, poll file mtimes instead of using inotify")
+    parser.add_argument('--profile', metavar='PATH', type=Path,
+                        help="write per-phase and per-section timing and I/O metrics to PATH")
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help="metrics JSON, or a Chrome trace for chrome://tracing / Perfetto")
+    parser.add_argument('--cprofile', metavar='PATH', type=Path,
+                        help="run under cProfile, dump stats to PATH and report the hottest functions")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="track allocations and report peak memory")
+    parser.add_argument('--link-report', metavar='PATH', type=Path,
+                        help="write every broken internal link and missing asset, with file and line, as JSON")
+    parser.add_argument('--preview', action='store_true',
+                        help="also render docs/ to _preview/ in Python (no Jekyll needed); "
+                             "serve it with preview_server.py --preview")
+    parser.add_argument('--check-external', action='store_true',
+                        help="request external links whose cached result is stale (see link_checker.py); "
+                             "without it, validation reports cached results only")
+    parser.add_argument('--permalink-policy', metavar='RULES',
+                        type=lambda value: [rule.strip() for rule in value.split(',') if rule.strip()],
+                        default=list(DEFAULT_PERMALINK_POLICY),
+                        help="comma-separated precedence for pages claiming the same permalink, from "
+                             f"{', '.join(PERMALINK_RULES)} (default: {','.join(DEFAULT_PERMALINK_POLICY)})")
+    parser.add_argument('--stream', action='store_true',
+                        help="keep no section text between processing and writing (re-read on write), "
+                             "so peak memory stays near one section per worker")
+    parser.add_argument('--nav-output', choices=NAV_OUTPUTS, default='auto',
+                        help="write navigation to _data/navigation.yml (data) or _config.yml (config); "
+                             "auto uses data once _data/navigation.yml exists")
+    args = parser.parse_args()
+    unknown = [rule for rule in args.permalink_policy if rule not in PERMALINK_RULES]
+    if unknown:
+        parser.error(f"unknown permalink rule(s): {', '.join(unknown)}")
+    
+    _script_dir = Path(__file__).resolve().parent
+    _repo_root = _script_dir.parent
+    source_dir = str(_repo_root)
+    output_dir = str(_script_dir)
+    
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.watch:
+        watch(source_dir, output_dir, jobs=jobs, polling=args.poll, force=args.force,
+              permalink_policy=args.permalink_policy, nav_output=args.nav_output, stream=args.stream,
+              preview=args.preview)
+        return
+    
+    converter = ImprovedCISOToJekyllConverter(source_dir, output_dir, force=args.force, jobs=jobs,
+                                              permalink_policy=args.permalink_policy, nav_output=args.nav_output,
+                                              stream=args.stream, check_external=args.check_external,
+                                              preview=args.preview)
+    run_build(converter, profile=args.profile, profile_format=args.profile_format, cprofile=args.cprofile,
+              trace_memory=args.tracemalloc, link_report=args.link_report)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+External link checker for the site
+
+validate_site() checks internal links against what the build already
+knows; this checks the http(s) links the pages and assets/*.txt point at.
+Requests run on asyncio over a small HTTP/1.1 client (link_requests.py):
+
+- keep-alive connections are pooled per host and reused
+- at most PER_HOST requests are in flight per host, CONCURRENCY overall
+- HEAD is tried first, then GET for servers that reject or mishandle HEAD
+- every request has a timeout, and up to MAX_REDIRECTS redirects are followed
+
+Results are cached in .build-cache/external-links.json. A working link is
+fresh for --ttl-hours and a failing one for FAILURE_TTL_HOURS at most;
+only stale or new URLs are requested, so a build with a fresh cache never
+touches the network.
+
+Usage:
+    python3 link_checker.py                          # check the site's external links
+    python3 link_checker.py --offline                # report from the cache only
+    python3 link_checker.py http://127.0.0.1:8000/a  # check the given URLs
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_profile import count_read
+from page_metadata import BUILD_CACHE_DIR
+from site_output import write_if_changed
+
+DEFAULT_TTL_HOURS = 7 * 24
+FAILURE_TTL_HOURS = 24
+TIMEOUT = 10.0
+PER_HOST = 4
+CONCURRENCY = 32
+# Bare URLs in plain-text files; trailing sentence punctuation is not part of them
+URL_PATTERN = re.compile(r'https?://[^\s<>"\'()\[\]]+', re.IGNORECASE)
+
+# {url: [(page, line), ...]}
+Sources = Dict[str, List[Tuple[str, int]]]
+
+
+def external_urls(pages: Dict[str, Dict]) -> Sources:
+    """Where each http(s) link occurs, from LinkGraph page entries."""
+    urls = {}
+    for rel, entry in sorted(pages.items()):
+        for line, _, target in entry['links']:
+            if target.lower().startswith(('http://', 'https://')):
+                urls.setdefault(target, []).append((rel, line))
+    return urls
+
+
+def text_urls(text: str, rel: str, urls: Optional[Sources] = None) -> Sources:
+    """Add the bare URLs of a plain-text file to urls."""
+    urls = {} if urls is None else urls
+    for number, line in enumerate(text.split('\n'), start=1):
+        for url in URL_PATTERN.findall(line):
+            urls.setdefault(url.rstrip('.,;:!?'), []).append((rel, number))
+    return urls
+
+
+class ExternalLinkChecker:
+    """Cached results for external URLs, refreshed concurrently when they go stale."""
+
+    VERSION = 1
+
+    def __init__(self, cache_path: Path, ttl_hours: float = DEFAULT_TTL_HOURS, timeout: float = TIMEOUT,
+                 per_host: int = PER_HOST, concurrency: int = CONCURRENCY):
+        self.cache_path = cache_path
+        self.ttl = ttl_hours * 3600
+        self.failure_ttl = min(ttl_hours, FAILURE_TTL_HOURS) * 3600
+        self.timeout = timeout
+        self.per_host = per_host
+        self.concurrency = concurrency
+        self.results = self._load()
+        self.stats = {'urls': 0, 'cached': 0, 'checked': 0, 'broken': 0, 'unchecked': 0}
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return {}
+        return cache.get('urls', {}) if cache.get('version') == self.VERSION else {}
+
+    def is_fresh(self, url: str, now: float) -> bool:
+        record = self.results.get(url)
+        if not record:
+            return False
+        return now - record['checked'] < (self.ttl if record['ok'] else self.failure_ttl)
+
+    def check(self, urls: Iterable[str], offline: bool = False, force: bool = False) -> Dict[str, Dict]:
+        """Results for urls, requesting the stale ones unless offline.
+
+        URLs never checked have no result while offline.
+        """
+        urls = sorted(set(urls))
+        now = time.time()
+        stale = [url for url in urls if force or not self.is_fresh(url, now)]
+        if stale and not offline:
+            from link_requests import check_urls
+            for url, record in zip(stale, check_urls(stale, self.timeout, self.per_host, self.concurrency)):
+                self.results[url] = record
+            self.stats['checked'] = len(stale)
+        results = {url: self.results[url] for url in urls if url in self.results}
+        self.stats['urls'] = len(urls)
+        self.stats['cached'] = len(urls) - self.stats['checked']
+        self.stats['unchecked'] = len(urls) - len(results)
+        self.stats['broken'] = sum(1 for record in results.values() if record['ok'] is False)
+        return results
+
+    def save(self, keep: Optional[Iterable[str]] = None):
+        """Write the cache, dropping URLs no longer linked when keep is given."""
+        if keep is not None:
+            keep = set(keep)
+            self.results = {url: record for url, record in self.results.items() if url in keep}
+        write_if_changed(self.cache_path, json.dumps({'version': self.VERSION, 'urls': self.results},
+                                                     indent=1, sort_keys=True) + '\n')
+
+
+def describe(record: Dict) -> str:
+    """'404', '301 -> 404 at https://...', or the error, for reports."""
+    outcome = str(record['status']) if record['status'] is not None else record.get('error', 'failed')
+    return f"{outcome} at {record['final_url']}" if record.get('final_url') else outcome
+
+
+def site_external_urls(site_dir: Path) -> Sources:
+    """External links of the site, from the link graph cache the converter saves plus assets/*.txt."""
+    try:
+        pages = json.loads((site_dir / BUILD_CACHE_DIR / 'links.json').read_text(encoding='utf-8')).get('pages', {})
+    except (OSError, ValueError):
+        pages = {}
+    urls = external_urls(pages)
+    for path in sorted((site_dir / 'assets').glob('**/*.txt')):
+        text_urls(path.read_text(encoding='utf-8', errors='replace'), path.relative_to(site_dir).as_posix(), urls)
+    return urls
+
+
+def main() -> int:
+    site_root = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Check the site's external links, caching the results")
+    parser.add_argument('urls', nargs='*', help="check these URLs instead of the site's")
+    parser.add_argument('--site', type=Path, default=site_root, help="site directory (default: this one)")
+    parser.add_argument('--ttl-hours', type=float, default=DEFAULT_TTL_HOURS,
+                        help=f"re-check working links older than this (default {DEFAULT_TTL_HOURS})")
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help=f"seconds per request (default {TIMEOUT:g})")
+    parser.add_argument('--per-host', type=int, default=PER_HOST, help=f"requests in flight per host (default {PER_HOST})")
+    parser.add_argument('--force', action='store_true', help="re-check every URL, fresh or not")
+    parser.add_argument('--offline', action='store_true', help="make no requests; report cached results")
+    args = parser.parse_args()
+
+    sources = {url: [] for url in args.urls} if args.urls else site_external_urls(args.site)
+    checker = ExternalLinkChecker(args.site / BUILD_CACHE_DIR / 'external-links.json', args.ttl_hours,
+                                  args.timeout, args.per_host)
+    started = time.perf_counter()
+    results = checker.check(sources, offline=args.offline, force=args.force)
+    checker.save(keep=None if args.urls else sources)
+    stats = checker.stats
+    print(f"🌐 External links: {stats['urls']} URLs, {stats['checked']} checked in "
+          f"{time.perf_counter() - started:.1f}s, {stats['cached']} from cache, "
+          f"{stats['unchecked']} never checked, {stats['broken']} broken")
+    for url, record in sorted(results.items()):
+        if record['ok'] is False:
+            where = ', '.join(f'{rel}:{line}' for rel, line in sources[url][:3])
+            print(f"  ❌ {url} ({describe(record)}){f'  [{where}]' if where else ''}")
+    return 1 if stats['broken'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
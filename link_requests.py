@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+The HTTP side of link_checker.py: just enough HTTP/1.1 on asyncio streams
+to learn each URL's status
+
+Kept apart because asyncio and ssl take longer to import than a warm
+build takes to run; link_checker.py only imports this when a URL is stale
+and it is allowed to request it.
+"""
+
+import asyncio
+import ssl
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+
+MAX_REDIRECTS = 5
+USER_AGENT = 'CISOinaBox-link-checker/1.0 (+https://github.com/CroodSolutions/CISOinaBox)'
+
+REDIRECTS = {301, 302, 303, 307, 308}
+# Rate limiting says nothing about the page; such links are neither
+# reported nor trusted for long
+INCONCLUSIVE = {429}
+# A GET body up to this size is read so its connection can be reused
+DRAIN_LIMIT = 64 * 1024
+
+
+class HTTPClient:
+    """Just enough HTTP/1.1 to learn a URL's status, over pooled keep-alive connections."""
+
+    def __init__(self, timeout: float, per_host: int, concurrency: int):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.slots = asyncio.Semaphore(concurrency)
+        self.pools = {}
+        self.ssl_context = ssl.create_default_context()
+
+    def _pool(self, key: Tuple[str, str, int]) -> Dict:
+        if key not in self.pools:
+            self.pools[key] = {'slots': asyncio.Semaphore(self.per_host), 'idle': []}
+        return self.pools[key]
+
+    async def request(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        """Status and headers of url; the body is not read unless it is small."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ''
+        port = parts.port or (443 if scheme == 'https' else 80)
+        host_header = host.encode('idna').decode('ascii') + (f':{parts.port}' if parts.port else '')
+        target = quote(parts.path or '/', safe="/%:@!$&'()*+,;=~-._") + \
+            (f"?{quote(parts.query, safe='/%:@!$&()*+,;=?~-._')}" if parts.query else '')
+        pool = self._pool((scheme, host, port))
+        # The host's slot first: a request queued behind a busy host must
+        # not hold one of the global slots other hosts could be using
+        async with pool['slots'], self.slots:
+            # An idle connection the server has since closed gets one retry on a new one
+            for _ in range(2):
+                reused = bool(pool['idle'])
+                if reused:
+                    reader, writer = pool['idle'].pop()
+                else:
+                    reader, writer = await asyncio.open_connection(
+                        host, port, ssl=self.ssl_context if scheme == 'https' else None)
+                try:
+                    status, headers, reusable = await self._exchange(reader, writer, method, host_header, target)
+                except (OSError, EOFError, ValueError):
+                    writer.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if reusable:
+                    pool['idle'].append((reader, writer))
+                else:
+                    writer.close()
+                return status, headers
+        raise ConnectionError('connection closed')
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        method: str, host: str, target: str) -> Tuple[int, Dict[str, str], bool]:
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n"
+                     f"Accept: */*\r\nConnection: keep-alive\r\n\r\n".encode('ascii'))
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('connection closed')
+        version, status = status_line.split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        reusable = version == b'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if method != 'HEAD' and reusable:
+            length = headers.get('content-length', '')
+            if length.isdigit() and int(length) <= DRAIN_LIMIT and 'transfer-encoding' not in headers:
+                await reader.readexactly(int(length))
+            else:
+                reusable = False
+        return int(status), headers, reusable
+
+    async def check(self, url: str) -> Dict:
+        """Result record for url: status, ok (None if inconclusive), error and final URL."""
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                # A slow server is as slow for GET; only an error status or a
+                # dropped connection is worth a second try
+                try:
+                    status, headers = await asyncio.wait_for(self.request('HEAD', current), self.timeout)
+                except (ConnectionError, EOFError, ValueError):
+                    status, headers = None, {}
+                if status is None or status >= 400:
+                    status, headers = await asyncio.wait_for(self.request('GET', current), self.timeout)
+                if status in REDIRECTS and headers.get('location'):
+                    current = urljoin(current, headers['location'])
+                    continue
+                ok = None if status in INCONCLUSIVE else status < 400
+                return self.record(url, current, status, ok)
+            return self.record(url, current, None, False, f'more than {MAX_REDIRECTS} redirects')
+        except asyncio.TimeoutError:
+            return self.record(url, current, None, False, f'timed out after {self.timeout:g}s')
+        except (OSError, EOFError, ValueError, UnicodeError) as e:
+            return self.record(url, current, None, False, f'{type(e).__name__}: {e}'.rstrip(': '))
+
+    @staticmethod
+    def record(url: str, final_url: str, status: Optional[int], ok: Optional[bool],
+               error: Optional[str] = None) -> Dict:
+        record = {'status': status, 'ok': ok, 'checked': round(time.time())}
+        if error:
+            record['error'] = error
+        if final_url != url:
+            record['final_url'] = final_url
+        return record
+
+    def close(self):
+        for pool in self.pools.values():
+            for _, writer in pool['idle']:
+                writer.close()
+            pool['idle'].clear()
+
+
+def check_urls(urls: List[str], timeout: float, per_host: int, concurrency: int) -> List[Dict]:
+    """Result records for urls, in order, checked concurrently."""
+    async def check_all() -> List[Dict]:
+        client = HTTPClient(timeout, per_host, concurrency)
+        try:
+            return await asyncio.gather(*(client.check(url) for url in urls))
+        finally:
+            client.close()
+
+    return asyncio.run(check_all())
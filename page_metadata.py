@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Page front matter index and the persistent metadata cache shared by the
+converter and rebuild_navigation.py
+
+Each page's title, permalink, category and section number are cached in
+.build-cache/pages.json against the file's size and mtime, so a page's
+front matter is parsed only when the page is new or has changed.
+
+Usage:
+    python3 page_metadata.py            # list the cached metadata of docs/*.markdown
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_profile import count_read, count_regex
+from site_output import write_if_changed
+
+# Build cache lives in a dot-directory so Jekyll never publishes it
+BUILD_CACHE_DIR = '.build-cache'
+
+
+class PageMetadataCache:
+    """Parsed front matter fields of every page, keyed by path relative to the site.
+
+    An entry is reused while the page's size and mtime match the ones it was
+    recorded with. Entries for pages that no longer exist are dropped on save.
+    """
+
+    VERSION = 1
+
+    def __init__(self, site_dir: Path, path: Optional[Path] = None):
+        self.site_dir = site_dir
+        self.path = path or site_dir / BUILD_CACHE_DIR / 'pages.json'
+        self.lock = threading.Lock()
+        self.previous = self._load()
+        self.entries = dict(self.previous)
+        self.stats = {'hits': 0, 'parsed': 0}
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return {}
+        return cache.get('pages', {}) if cache.get('version') == self.VERSION else {}
+
+    def _key(self, path: Path) -> str:
+        return path.relative_to(self.site_dir).as_posix()
+
+    def lookup(self, path: Path, stat: os.stat_result) -> Optional[Dict]:
+        """Cached fields for a page whose size and mtime are unchanged."""
+        key = self._key(path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                return None
+            self.stats['hits'] += 1
+            return dict(entry['fields'])
+
+    def store(self, path: Path, stat: os.stat_result, fields: Dict):
+        with self.lock:
+            self.entries[self._key(path)] = {
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'fields': dict(fields)
+            }
+            self.stats['parsed'] += 1
+
+    def discard(self, path: Path):
+        with self.lock:
+            self.entries.pop(self._key(path), None)
+
+    def save(self):
+        """Write the cache if anything in it changed."""
+        with self.lock:
+            for key in [key for key in self.entries if not (self.site_dir / key).is_file()]:
+                del self.entries[key]
+            if self.entries == self.previous:
+                return
+            text = json.dumps({'version': self.VERSION, 'pages': self.entries}, sort_keys=True) + '\n'
+        write_if_changed(self.path, text)
+
+
+class FrontMatterIndex:
+    """Front matter of the site's pages, read once per run and kept current as pages change."""
+
+    FIELDS = ('title', 'permalink', 'nav_category', 'section_number')
+
+    def __init__(self, docs_dir: Path, patterns: Tuple[str, ...] = ('*.markdown',),
+                 cache: Optional[PageMetadataCache] = None):
+        self.docs_dir = docs_dir
+        self.cache = cache
+        self.lock = threading.RLock()
+        self.pages = {}
+        self.by_section_number = {}
+        self.by_permalink = {}
+        self.by_slug = {}
+        self.by_title = {}
+
+        if docs_dir.exists():
+            for md_file in sorted({path for pattern in patterns for path in docs_dir.glob(pattern)}):
+                if not any(part.startswith(('.', '_')) for part in md_file.relative_to(docs_dir).parts):
+                    self.refresh(md_file)
+
+    @staticmethod
+    def read_front_matter(path: Path) -> Optional[str]:
+        """Read only the front matter block at the top of a file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            first = f.readline()
+            lines = [first]
+            if first.rstrip('\n') == '---':
+                for line in f:
+                    lines.append(line)
+                    if line.rstrip('\n') == '---':
+                        count_read(sum(len(line) for line in lines))
+                        return ''.join(lines)
+        count_read(sum(len(line) for line in lines))
+        return None
+
+    @classmethod
+    def parse_front_matter(cls, front_matter: Optional[str]) -> Dict:
+        """Extract the fields the converter cares about from a front matter block."""
+        fields = {}
+        if not front_matter:
+            return fields
+
+        count_regex()
+        for match in re.finditer(r'^([a-z_]+):[ \t]*(.*?)[ \t]*$', front_matter, flags=re.MULTILINE):
+            key, value = match.groups()
+            if key in cls.FIELDS:
+                fields[key] = value.strip('"\'')
+
+        if 'section_number' in fields:
+            try:
+                fields['section_number'] = int(fields['section_number'])
+            except ValueError:
+                del fields['section_number']
+        return fields
+
+    def refresh(self, path: Path, front_matter: Optional[str] = None):
+        """(Re)index a page, reading its front matter from disk unless it is supplied
+        or the metadata cache already holds it."""
+        try:
+            stat = path.stat() if self.cache else None
+        except OSError:
+            self.remove(path)
+            return
+
+        fields = None
+        if front_matter is None and self.cache:
+            fields = self.cache.lookup(path, stat)
+        if fields is None:
+            if front_matter is None:
+                try:
+                    front_matter = self.read_front_matter(path)
+                except OSError:
+                    self.remove(path)
+                    return
+            fields = self.parse_front_matter(front_matter)
+            if self.cache:
+                self.cache.store(path, stat, fields)
+
+        fields['slug'] = path.stem
+        with self.lock:
+            self.remove(path, keep_cached=True)
+            self.pages[path] = fields
+            for key, table in self._lookups():
+                if fields.get(key) is not None:
+                    table.setdefault(fields[key], set()).add(path)
+
+    def remove(self, path: Path, keep_cached: bool = False):
+        """Drop a page that was deleted or is about to be rewritten."""
+        if self.cache and not keep_cached:
+            self.cache.discard(path)
+        with self.lock:
+            fields = self.pages.pop(path, None)
+            if not fields:
+                return
+
+            for key, table in self._lookups():
+                paths = table.get(fields.get(key))
+                if paths:
+                    paths.discard(path)
+                    if not paths:
+                        del table[fields[key]]
+
+    def _lookups(self):
+        return (
+            ('section_number', self.by_section_number),
+            ('permalink', self.by_permalink),
+            ('slug', self.by_slug),
+            ('title', self.by_title),
+        )
+
+    def _find(self, table: Dict, key) -> List[Path]:
+        with self.lock:
+            return sorted(table.get(key, ()))
+
+    def find_by_section_number(self, section_number: int) -> List[Path]:
+        return self._find(self.by_section_number, section_number)
+
+    def find_by_permalink(self, permalink: str) -> List[Path]:
+        return self._find(self.by_permalink, permalink)
+
+    def find_by_slug(self, slug: str) -> List[Path]:
+        return self._find(self.by_slug, slug)
+
+    def find_by_title(self, title: str) -> List[Path]:
+        return self._find(self.by_title, title)
+
+    def duplicate_permalinks(self) -> Dict[str, List[Path]]:
+        """Permalinks claimed by more than one page."""
+        with self.lock:
+            return {
+                permalink: sorted(paths)
+                for permalink, paths in sorted(self.by_permalink.items())
+                if len(paths) > 1
+            }
+
+    def paths(self) -> List[Path]:
+        with self.lock:
+            return sorted(self.pages)
+
+    def permalinks(self) -> Dict[Path, Optional[str]]:
+        with self.lock:
+            return {path: fields.get('permalink') for path, fields in sorted(self.pages.items())}
+
+    def records(self) -> List[Tuple[Path, Dict]]:
+        """(path, fields) for every page, in path order."""
+        with self.lock:
+            return [(path, dict(fields)) for path, fields in sorted(self.pages.items())]
+
+
+def main():
+    """Print the metadata of docs/*.markdown, parsing only pages the cache does not cover."""
+    site_dir = Path(__file__).resolve().parent
+    cache = PageMetadataCache(site_dir)
+    index = FrontMatterIndex(site_dir / 'docs', cache=cache)
+    cache.save()
+    for path, fields in index.records():
+        print(f"{path.relative_to(site_dir)}: {fields.get('section_number', '-')} "
+              f"{fields.get('title', '')!r} {fields.get('permalink', '')} [{fields.get('nav_category', '')}]")
+    print(f"📦 {cache.stats['hits']} cached, {cache.stats['parsed']} parsed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Precompress the built site (_site)
+
+Writes a .gz sibling (and a .br sibling when the brotli module is installed)
+next to every compressible file in _site, for hosts that serve precompressed
+files (nginx gzip_static/brotli_static, Netlify, Caddy's precompressed) and
+for preview_server.py. Files are compressed in parallel; a file whose
+siblings were made from the same bytes last time is skipped, judged by its
+size and mtime or, when those moved, by its hash. Siblings of files that no
+longer exist are removed.
+
+Usage:
+    python3 precompress.py               # compress _site on one thread per CPU
+    python3 precompress.py --jobs 1 --site path/to/_site
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from build_profile import count_read
+from page_metadata import BUILD_CACHE_DIR
+from site_output import write_if_changed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Text formats; PDFs, XLSX files and images are already compressed
+COMPRESSIBLE_SUFFIXES = {
+    '.html', '.htm', '.css', '.js', '.mjs', '.json', '.xml', '.svg', '.txt',
+    '.md', '.csv', '.map', '.ico', '.webmanifest', '.rss', '.atom',
+}
+MIN_BYTES = 1024
+
+# Content-Encoding -> sibling suffix
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings() -> List[str]:
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def sibling(path: Path, encoding: str) -> Path:
+    return path.with_name(path.name + ENCODINGS[encoding])
+
+
+def precompressed(path: Path, encoding: str) -> Optional[Path]:
+    """The sibling of path in this encoding, if one exists and is not older than path."""
+    candidate = sibling(path, encoding)
+    try:
+        return candidate if candidate.stat().st_mtime_ns >= path.stat().st_mtime_ns else None
+    except OSError:
+        return None
+
+
+class Precompressor:
+    """Keeps compressed siblings of a site's files in step with the files themselves."""
+
+    VERSION = 1
+
+    def __init__(self, site_dir: Path, manifest_path: Path, jobs: int = 1):
+        self.site_dir = site_dir
+        self.manifest_path = manifest_path
+        self.jobs = max(1, jobs)
+        self.encodings = available_encodings()
+        self.previous = self._load()
+        self.files = {}
+        self.stats = {'compressed': 0, 'unchanged': 0, 'skipped': 0, 'removed': 0, 'saved_bytes': 0}
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            manifest = json.loads(text)
+        except (OSError, ValueError):
+            return {}
+        return manifest.get('files', {}) if manifest.get('version') == self.VERSION else {}
+
+    def candidates(self) -> List[Path]:
+        """Compressible files under the site, skipping dot-directories."""
+        found = []
+        for root, dirs, files in os.walk(self.site_dir):
+            dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+            for name in sorted(files):
+                path = Path(root) / name
+                if path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                    found.append(path)
+        return found
+
+    def _siblings_current(self, path: Path, record: Dict, fresh: bool = True) -> bool:
+        """Whether every sibling the record lists is on disk (and, if fresh, not older than path)."""
+        for encoding in self.encodings:
+            size = record['encoded'].get(encoding)
+            if size is None:
+                continue
+            target = precompressed(path, encoding) if fresh else sibling(path, encoding)
+            if not target or not target.exists() or target.stat().st_size != size:
+                return False
+        return record.get('encodings') == self.encodings
+
+    def process(self, path: Path) -> Tuple[str, Dict]:
+        """Bring one file's siblings up to date, returning (rel, record)."""
+        rel = path.relative_to(self.site_dir).as_posix()
+        stat = path.stat()
+        record = self.previous.get(rel)
+        if record and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns \
+                and self._siblings_current(path, record):
+            return rel, dict(record, status='unchanged')
+
+        data = path.read_bytes()
+        count_read(len(data))
+        sha256 = hashlib.sha256(data).hexdigest()
+        if record and record['sha256'] == sha256 and self._siblings_current(path, record, fresh=False):
+            # Same bytes rewritten (e.g. by a full jekyll build): keep the
+            # siblings and just mark them as current again
+            for encoding in record['encoded']:
+                os.utime(sibling(path, encoding))
+            return rel, dict(record, size=stat.st_size, mtime_ns=stat.st_mtime_ns, status='unchanged')
+
+        encoded = {}
+        for encoding in ENCODINGS:
+            target = sibling(path, encoding)
+            if encoding in self.encodings and len(data) >= MIN_BYTES:
+                body = compress(data, encoding)
+                # Not worth serving if it barely shrinks
+                if len(body) < len(data) * 0.95:
+                    if not write_if_changed(target, body):
+                        os.utime(target)
+                    encoded[encoding] = len(body)
+                    continue
+            if target.exists():
+                target.unlink()
+        return rel, {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256,
+                     'encodings': self.encodings, 'encoded': encoded,
+                     'status': 'compressed' if encoded else 'skipped'}
+
+    def run(self) -> Dict:
+        paths = self.candidates()
+        if self.jobs == 1:
+            results = [self.process(path) for path in paths]
+        else:
+            # zlib and brotli release the GIL while compressing
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(pool.map(self.process, paths))
+
+        for rel, record in results:
+            status = record.pop('status')
+            self.stats[status] += 1
+            if status == 'compressed':
+                self.stats['saved_bytes'] += record['size'] - record['encoded'].get('gzip', record['size'])
+            self.files[rel] = record
+
+        # Siblings whose source file is gone
+        for rel in sorted(self.previous.keys() - self.files.keys()):
+            for encoding in ENCODINGS:
+                target = sibling(self.site_dir / rel, encoding)
+                if target.exists():
+                    target.unlink()
+                    self.stats['removed'] += 1
+
+        write_if_changed(self.manifest_path,
+                         json.dumps({'version': self.VERSION, 'files': self.files}, indent=2, sort_keys=True) + '\n')
+        return self.stats
+
+
+def precompress_site(site_dir: Path, jobs: int = 0) -> int:
+    """Precompress a built site and print what was done."""
+    if not site_dir.is_dir():
+        print(f"❌ {site_dir} does not exist; build the site first (bundle exec jekyll build)")
+        return 1
+
+    manifest_path = site_dir.resolve().parent / BUILD_CACHE_DIR / 'precompress.json'
+    precompressor = Precompressor(site_dir, manifest_path, jobs=jobs or os.cpu_count() or 1)
+    stats = precompressor.run()
+    print(f"🗜️  Precompressed ({', '.join(precompressor.encodings)}): {stats['compressed']} compressed, "
+          f"{stats['unchanged']} unchanged, {stats['skipped']} too small or incompressible, "
+          f"{stats['removed']} stale siblings removed, "
+          f"{stats['saved_bytes'] / 1024:.0f} KB saved by gzip on the files compressed")
+    return 0
+
+
+def main() -> int:
+    site_root = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for the built site's compressible files")
+    parser.add_argument('--site', type=Path, default=site_root / '_site', help="built site directory (default: _site)")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="compress on N worker threads (default 0 = one per CPU)")
+    args = parser.parse_args()
+    return precompress_site(args.site, args.jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Fast authoring preview of the generated pages, without Ruby or Jekyll
+
+Renders docs/**/*.markdown straight to HTML under _preview/, one file per
+permalink, in a minimal layout with the navbar menus from the generated
+navigation. It understands the Markdown the guide uses (headings, lists,
+tables, block quotes, fenced code, links, images, emphasis, inline HTML)
+and the Liquid the pages use ({{ '/path/' | relative_url }} and site
+variables). It is a quick look while writing, not the production build:
+the theme, includes and plugins are Jekyll's business.
+
+Each page's output is cached in .build-cache/preview.json against the
+page's size, mtime and hash, and against a fingerprint of the layout and
+navigation, so after a one-page edit only that page is rendered again.
+
+Usage:
+    python3 preview_render.py          # render into _preview/
+    python3 preview_server.py --preview  # serve it with live reload
+"""
+
+import hashlib
+import html
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_profile import count_read, count_regex
+from page_metadata import BUILD_CACHE_DIR, FrontMatterIndex
+from site_navigation import Menu, read_navbar
+from site_output import site_setting, write_if_changed
+
+PREVIEW_DIR = '_preview'
+
+# Block-level syntax
+FENCE_PATTERN = re.compile(r'^ {0,3}(```+|~~~+)[ \t]*([^`\s]*)')
+HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_PATTERN = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+RULE_PATTERN = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+LIST_PATTERN = re.compile(r'^( *)([-*+]|\d{1,9}[.)])(?:[ \t]+|$)')
+TABLE_DELIMITER_PATTERN = re.compile(r'^ *\|? *:?-+:? *(?:\| *:?-+:? *)*\|? *$')
+HTML_BLOCK_PATTERN = re.compile(
+    r'^ {0,3}</?(?:address|article|aside|blockquote|center|details|dialog|div|dl|fieldset|figcaption|figure|'
+    r'footer|form|h[1-6]|header|hr|iframe|main|nav|ol|p|pre|script|section|style|summary|table|tbody|td|'
+    r'tfoot|th|thead|tr|ul|video)(?:[\s/>]|$)|^ {0,3}<!--', re.IGNORECASE)
+
+# Inline syntax; stashed pieces are kept as \x00N\x00 until the end
+STASH_PATTERN = re.compile(r'\x00(\d+)\x00')
+CODE_SPAN_PATTERN = re.compile(r'(`+)(.+?)\1', re.DOTALL)
+AUTOLINK_PATTERN = re.compile(r'<((?:https?|ftp|mailto):[^\s<>]+)>')
+INLINE_HTML_PATTERN = re.compile(r'</?[A-Za-z][A-Za-z0-9-]*(?:\s+[^<>]*)?/?>|<!--.*?-->', re.DOTALL)
+ESCAPE_PATTERN = re.compile(r'\\([!"#$%&\'()*+,\-./:;<=>?@\[\\\]^_`{|}~])')
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"([^"]*)")?\s*\)')
+LINK_PATTERN = re.compile(r'\[((?:[^\[\]]|\[[^\[\]]*\])*)\]\(\s*<?([^()\s>]*(?:\([^()\s]*\)[^()\s>]*)*)>?(?:\s+"([^"]*)")?\s*\)')
+STRONG_PATTERN = re.compile(r'\*\*(?=\S)(.+?)(?<=\S)\*\*|__(?=\S)(.+?)(?<=\S)__', re.DOTALL)
+EMPHASIS_PATTERN = re.compile(r'(?<![*\w])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![*\w])|(?<![_\w])_(?=\S)(.+?)(?<=\S)_(?![_\w])',
+                              re.DOTALL)
+ENTITY_PATTERN = re.compile(r'&(?!#?\w+;)')
+HARD_BREAK_PATTERN = re.compile(r'(?: {2,}|\\)\n')
+
+# Liquid: {{ 'x' | relative_url }}, {{ site.baseurl }}, {% raw %}; other tags render as nothing
+LIQUID_PATTERN = re.compile(r'\{%-?\s*raw\s*-?%\}(.*?)\{%-?\s*endraw\s*-?%\}|\{\{-?\s*(.*?)\s*-?\}\}|\{%.*?%\}', re.DOTALL)
+LIQUID_URL_PATTERN = re.compile(r'^["\']([^"\']*)["\']\s*\|\s*(relative_url|absolute_url)$')
+
+LAYOUT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} | {site_title}</title>
+<link rel="stylesheet" href="{baseurl}/assets/css/custom.css">
+<style>
+body {{ margin: 0; font: 16px/1.6 -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; color: #0e0e0e; }}
+.preview-nav {{ background: #0e0e0e; color: #fff; padding: .5rem 1rem; display: flex; flex-wrap: wrap; gap: 1rem; align-items: center; }}
+.preview-nav a {{ color: #fff; text-decoration: none; }}
+.preview-nav details {{ position: relative; }}
+.preview-nav summary {{ cursor: pointer; }}
+.preview-nav ul {{ position: absolute; z-index: 1; background: #0e0e0e; list-style: none; margin: .25rem 0 0; padding: .5rem 1rem; min-width: 18rem; }}
+.preview-page {{ max-width: 60rem; margin: 0 auto; padding: 1rem; }}
+.preview-page a {{ color: #289dff; }}
+.preview-page table {{ border-collapse: collapse; display: block; overflow-x: auto; }}
+.preview-page th, .preview-page td {{ border: 1px solid #ddd; padding: .3rem .5rem; vertical-align: top; }}
+.preview-page pre {{ background: #f6f8fa; padding: .75rem; overflow-x: auto; }}
+.preview-page blockquote {{ border-left: 4px solid #ddd; margin-left: 0; padding-left: 1rem; color: #555; }}
+.preview-page img {{ max-width: 100%; }}
+.preview-footer {{ text-align: center; color: #777; font-size: .85rem; padding: 2rem 1rem; }}
+</style>
+</head>
+<body>
+<nav class="preview-nav"><a href="{baseurl}/"><strong>{site_title}</strong></a>
+{navbar}</nav>
+<main class="preview-page">
+<h1>{title}</h1>
+{content}
+</main>
+<footer class="preview-footer">Authoring preview rendered by preview_render.py; the published site is built by Jekyll.</footer>
+</body>
+</html>
+"""
+
+
+def heading_id(text: str, used: Dict[str, int]) -> str:
+    """kramdown-style auto id: lowercase words joined by dashes, made unique on the page."""
+    base = re.sub(r'[^a-z0-9 -]', '', re.sub(r'<[^>]+>', '', html.unescape(text)).lower())
+    base = re.sub(r'^[^a-z]+', '', base).replace(' ', '-') or 'section'
+    count = used.get(base, 0)
+    used[base] = count + 1
+    return f'{base}-{count}' if count else base
+
+
+class MarkdownRenderer:
+    """The Markdown subset the guide's pages are written in, rendered to HTML."""
+
+    def __init__(self, baseurl: str = ''):
+        self.baseurl = baseurl
+        self.heading_ids = {}
+
+    def render(self, text: str) -> str:
+        self.heading_ids = {}
+        return self.blocks(text.replace('\r\n', '\n').expandtabs(4).split('\n'))
+
+    def blocks(self, lines: List[str], tight: bool = False) -> str:
+        """Render block-level lines; tight list items keep their text unwrapped."""
+        out = []
+        paragraph = []
+
+        def flush():
+            if paragraph:
+                text = self.inline('\n'.join(line.lstrip() for line in paragraph).rstrip())
+                out.append(text if tight else f'<p>{text}</p>')
+                paragraph.clear()
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+            if not stripped:
+                flush()
+                i += 1
+                continue
+
+            fence = FENCE_PATTERN.match(line)
+            if fence:
+                flush()
+                marker, language = fence.groups()
+                code = []
+                i += 1
+                while i < len(lines) and not lines[i].strip().startswith(marker):
+                    code.append(lines[i])
+                    i += 1
+                attribute = f' class="language-{html.escape(language)}"' if language else ''
+                out.append(f'<pre><code{attribute}>{html.escape(chr(10).join(code))}</code></pre>')
+                i += 1
+                continue
+
+            heading = HEADING_PATTERN.match(line)
+            if heading:
+                flush()
+                out.append(self.heading(len(heading.group(1)), heading.group(2) or ''))
+                i += 1
+                continue
+
+            setext = SETEXT_PATTERN.match(line)
+            if setext and len(paragraph) == 1:
+                out.append(self.heading(1 if setext.group(1)[0] == '=' else 2, paragraph.pop().strip()))
+                i += 1
+                continue
+
+            if RULE_PATTERN.match(line):
+                flush()
+                out.append('<hr />')
+                i += 1
+                continue
+
+            if '|' in line and i + 1 < len(lines) and '|' in lines[i + 1] \
+                    and TABLE_DELIMITER_PATTERN.match(lines[i + 1]):
+                flush()
+                end = i + 2
+                while end < len(lines) and '|' in lines[end] and lines[end].strip():
+                    end += 1
+                out.append(self.table(lines[i], lines[i + 1], lines[i + 2:end]))
+                i = end
+                continue
+
+            if stripped.startswith('>'):
+                flush()
+                quoted = []
+                while i < len(lines) and lines[i].strip().startswith('>'):
+                    quoted.append(re.sub(r'^\s*> ?', '', lines[i]))
+                    i += 1
+                out.append(f'<blockquote>\n{self.blocks(quoted)}\n</blockquote>')
+                continue
+
+            if LIST_PATTERN.match(line):
+                flush()
+                rendered, i = self.list_block(lines, i)
+                out.append(rendered)
+                continue
+
+            if HTML_BLOCK_PATTERN.match(line) and not paragraph:
+                while i < len(lines) and lines[i].strip():
+                    out.append(lines[i])
+                    i += 1
+                continue
+
+            paragraph.append(line)
+            i += 1
+
+        flush()
+        return '\n'.join(out)
+
+    def heading(self, level: int, text: str) -> str:
+        rendered = self.inline(text.strip())
+        return f'<h{level} id="{heading_id(rendered, self.heading_ids)}">{rendered}</h{level}>'
+
+    def list_block(self, lines: List[str], start: int) -> Tuple[str, int]:
+        """Render the list starting at lines[start]; returns the HTML and the next line."""
+        first = LIST_PATTERN.match(lines[start])
+        indent = len(first.group(1))
+        ordered = first.group(2)[0].isdigit()
+        items = []
+        loose = False
+        i = start
+        while i < len(lines):
+            line = lines[i]
+            marker = LIST_PATTERN.match(line)
+            if marker and len(marker.group(1)) <= indent + 1:
+                if marker.group(2)[0].isdigit() != ordered:
+                    break
+                content_offset = marker.end() if line[marker.end():].strip() else len(marker.group(1)) + len(marker.group(2)) + 1
+                items.append([line[marker.end():]])
+                i += 1
+                continue
+            if not line.strip():
+                # A blank line continues the list only if more of it follows
+                following = next((next_line for next_line in lines[i + 1:] if next_line.strip()), None)
+                next_marker = LIST_PATTERN.match(following) if following is not None else None
+                if following is None or not (
+                        (next_marker and len(next_marker.group(1)) <= indent + 1
+                         and next_marker.group(2)[0].isdigit() == ordered)
+                        or len(following) - len(following.lstrip()) > indent):
+                    break
+                loose = loose or not next_marker or len(next_marker.group(1)) <= indent + 1
+                items[-1].append('')
+                i += 1
+                continue
+            line_indent = len(line) - len(line.lstrip())
+            if line_indent > indent:
+                items[-1].append(line[min(line_indent, content_offset):])
+            elif items[-1][-1].strip() and not (HEADING_PATTERN.match(line) or FENCE_PATTERN.match(line)
+                                                or line.lstrip().startswith(('>', '|'))):
+                # Lazy continuation of the item's last paragraph
+                items[-1].append(line.strip())
+            else:
+                break
+            i += 1
+
+        tag = 'ol' if ordered else 'ul'
+        number = int(first.group(2)[:-1]) if ordered else 1
+        opening = f'<{tag} start="{number}">' if ordered and number != 1 else f'<{tag}>'
+        rendered = [opening]
+        for item in items:
+            while item and not item[-1].strip():
+                item.pop()
+            rendered.append(f'<li>{self.blocks(item, tight=not loose)}</li>')
+        rendered.append(f'</{tag}>')
+        return '\n'.join(rendered), i
+
+    @staticmethod
+    def split_row(line: str) -> List[str]:
+        line = line.strip()
+        if line.startswith('|'):
+            line = line[1:]
+        if line.endswith('|') and not line.endswith('\\|'):
+            line = line[:-1]
+        return [cell.strip().replace('\\|', '|') for cell in re.split(r'(?<!\\)\|', line)]
+
+    def table(self, header: str, delimiter: str, rows: List[str]) -> str:
+        aligns = []
+        for cell in self.split_row(delimiter):
+            left, right = cell.startswith(':'), cell.endswith(':')
+            aligns.append('center' if left and right else 'right' if right else 'left' if left else '')
+
+        def cells(line: str, tag: str) -> str:
+            values = self.split_row(line)
+            values += [''] * (len(aligns) - len(values))
+            return ''.join(
+                f'<{tag}{f" style={chr(34)}text-align: {align}{chr(34)}" if align else ""}>{self.inline(value)}</{tag}>'
+                for value, align in zip(values, aligns + [''] * (len(values) - len(aligns)))
+            )
+
+        body = '\n'.join(f'<tr>{cells(row, "td")}</tr>' for row in rows)
+        return f'<table>\n<thead>\n<tr>{cells(header, "th")}</tr>\n</thead>\n<tbody>\n{body}\n</tbody>\n</table>'
+
+    def url(self, target: str) -> str:
+        return html.escape(target, quote=True)
+
+    def inline(self, text: str) -> str:
+        """Render inline Markdown; code, links and raw HTML are stashed so later rules leave them alone."""
+        stash = []
+
+        def keep(fragment: str) -> str:
+            stash.append(fragment)
+            return f'\x00{len(stash) - 1}\x00'
+
+        count_regex(9)
+        text = CODE_SPAN_PATTERN.sub(lambda m: keep(f'<code>{html.escape(m.group(2).strip())}</code>'), text)
+        text = AUTOLINK_PATTERN.sub(
+            lambda m: keep(f'<a href="{self.url(m.group(1))}">{html.escape(m.group(1))}</a>'), text)
+        text = ESCAPE_PATTERN.sub(lambda m: keep(html.escape(m.group(1))), text)
+        text = INLINE_HTML_PATTERN.sub(lambda m: keep(m.group(0)), text)
+        text = ENTITY_PATTERN.sub('&amp;', text).replace('<', '&lt;').replace('>', '&gt;')
+
+        def image(match: re.Match) -> str:
+            alt, target, title = match.groups()
+            title_attribute = f' title="{html.escape(title)}"' if title else ''
+            return keep(f'<img src="{self.url(target)}" alt="{html.escape(alt, quote=True)}"{title_attribute} />')
+
+        def link(match: re.Match) -> str:
+            label, target, title = match.groups()
+            title_attribute = f' title="{html.escape(title)}"' if title else ''
+            return keep(f'<a href="{self.url(target)}"{title_attribute}>{self.emphasis(label)}</a>')
+
+        text = IMAGE_PATTERN.sub(image, text)
+        text = LINK_PATTERN.sub(link, text)
+        text = HARD_BREAK_PATTERN.sub('<br />\n', self.emphasis(text))
+        # Stashed pieces can hold other stashed pieces (a link around code)
+        while '\x00' in text:
+            text = STASH_PATTERN.sub(lambda m: stash[int(m.group(1))], text)
+        return text
+
+    @staticmethod
+    def emphasis(text: str) -> str:
+        text = STRONG_PATTERN.sub(lambda m: f'<strong>{m.group(1) or m.group(2)}</strong>', text)
+        return EMPHASIS_PATTERN.sub(lambda m: f'<em>{m.group(1) or m.group(2)}</em>', text)
+
+
+def render_liquid(text: str, baseurl: str, site_url: str, variables: Dict[str, str]) -> str:
+    """Expand the Liquid the pages use; anything else renders as nothing, as an unknown variable does in Jekyll."""
+    def expand(match: re.Match) -> str:
+        raw, expression = match.group(1), match.group(2)
+        if raw is not None:
+            return raw
+        if expression is None:
+            return ''
+        url = LIQUID_URL_PATTERN.match(expression)
+        if url:
+            path, filter_name = url.groups()
+            prefix = baseurl if filter_name == 'relative_url' else site_url + baseurl
+            return prefix + path if path.startswith('/') else path
+        return variables.get(expression, '')
+
+    count_regex()
+    return LIQUID_PATTERN.sub(expand, text)
+
+
+def navbar_html(menus: List[Menu], baseurl: str) -> str:
+    def href(url: str) -> str:
+        return html.escape(baseurl + url if url.startswith('/') else url, quote=True)
+
+    parts = []
+    for name, links in menus:
+        if len(links) == 1 and links[0][0] == name:
+            parts.append(f'<a href="{href(links[0][1])}">{html.escape(name)}</a>')
+        elif links:
+            items = ''.join(f'<li><a href="{href(url)}">{html.escape(title)}</a></li>' for title, url in links)
+            parts.append(f'<details><summary>{html.escape(name)}</summary><ul>{items}</ul></details>')
+    return '\n'.join(parts)
+
+
+def output_path(rel: str, permalink: Optional[str]) -> str:
+    """Where a page's HTML goes under _preview/, following its permalink as Jekyll does."""
+    if not permalink:
+        return rel.rsplit('.', 1)[0] + '.html'
+    path = permalink.strip('/')
+    if not path:
+        return 'index.html'
+    return path if path.endswith('.html') else f'{path}/index.html'
+
+
+class PreviewRenderer:
+    """Renders pages into _preview/, re-rendering only pages whose content or layout changed."""
+
+    VERSION = 1
+
+    def __init__(self, site_dir: Path, cache_path: Optional[Path] = None):
+        self.site_dir = site_dir
+        self.output_dir = site_dir / PREVIEW_DIR
+        self.cache_path = cache_path or site_dir / BUILD_CACHE_DIR / 'preview.json'
+        # Rendered at the site root: _preview/ is served on its own
+        self.baseurl = ''
+        self.site_url = site_setting(site_dir, 'url')
+        self.site_title = site_setting(site_dir, 'title') or site_dir.name
+        self.layout, self.pages = self._load()
+        self.stats = {'pages': 0, 'rendered': 0, 'unchanged': 0, 'removed': 0}
+
+    def _load(self) -> Tuple[Optional[str], Dict]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return None, {}
+        if cache.get('version') != self.VERSION:
+            return None, {}
+        return cache.get('layout'), cache.get('pages', {})
+
+    def layout_fingerprint(self, navbar: str) -> str:
+        """Hash of everything outside the page that its HTML depends on."""
+        digest = hashlib.sha256()
+        for part in (Path(__file__).read_bytes(), navbar.encode('utf-8'), self.site_title.encode('utf-8'),
+                     self.site_url.encode('utf-8')):
+            digest.update(hashlib.sha256(part).digest())
+        return digest.hexdigest()
+
+    def render(self, paths: Iterable[Path], menus: List[Menu]) -> Dict[str, int]:
+        """Bring _preview/ up to date with the given pages and navbar menus."""
+        navbar = navbar_html(menus, self.baseurl)
+        layout = self.layout_fingerprint(navbar)
+        relayout = layout != self.layout
+        pages = {}
+        for path in sorted(paths):
+            rel = path.relative_to(self.site_dir).as_posix()
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            previous = self.pages.get(rel)
+            if (previous and not relayout and previous['size'] == stat.st_size
+                    and previous['mtime_ns'] == stat.st_mtime_ns
+                    and (self.output_dir / previous['output']).exists()):
+                pages[rel] = previous
+                self.stats['unchanged'] += 1
+                continue
+
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            record = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+            if (previous and not relayout and previous['sha256'] == sha256
+                    and (self.output_dir / previous['output']).exists()):
+                # Touched but not edited
+                pages[rel] = dict(record, output=previous['output'])
+                self.stats['unchanged'] += 1
+                continue
+
+            output, page_html = self.render_page(rel, text, navbar)
+            write_if_changed(self.output_dir / output, page_html)
+            pages[rel] = dict(record, output=output)
+            self.stats['rendered'] += 1
+
+        # Pages that were deleted or moved to another permalink
+        outputs = {record['output'] for record in pages.values()}
+        for record in self.pages.values():
+            if record['output'] not in outputs and (self.output_dir / record['output']).exists():
+                (self.output_dir / record['output']).unlink()
+                self.stats['removed'] += 1
+
+        write_if_changed(self.output_dir / 'index.html', self.index_page(menus, navbar))
+        self.layout, self.pages = layout, pages
+        self.stats['pages'] = len(pages)
+        write_if_changed(self.cache_path, json.dumps({'version': self.VERSION, 'layout': layout, 'pages': pages},
+                                                     sort_keys=True, indent=1) + '\n')
+        return self.stats
+
+    def render_page(self, rel: str, text: str, navbar: str) -> Tuple[str, str]:
+        """(output path under _preview/, HTML) of a page."""
+        front_matter = None
+        body = text
+        if text.startswith('---\n'):
+            end = text.find('\n---\n', 3)
+            if end != -1:
+                front_matter, body = text[:end + 5], text[end + 5:]
+        fields = FrontMatterIndex.parse_front_matter(front_matter)
+        title = fields.get('title') or Path(rel).stem
+        variables = {'site.baseurl': self.baseurl, 'site.url': self.site_url, 'site.title': self.site_title,
+                     'page.title': title, 'page.permalink': fields.get('permalink', '')}
+        body = render_liquid(body, self.baseurl, self.site_url, variables)
+        content = MarkdownRenderer(self.baseurl).render(body)
+        return output_path(rel, fields.get('permalink')), self.page(title, content, navbar)
+
+    def page(self, title: str, content: str, navbar: str) -> str:
+        return LAYOUT.format(title=html.escape(title), site_title=html.escape(self.site_title),
+                             baseurl=self.baseurl, navbar=navbar, content=content)
+
+    def index_page(self, menus: List[Menu], navbar: str) -> str:
+        """The preview's home page: every navbar menu with its links."""
+        sections = []
+        for name, links in menus:
+            items = '\n'.join(f'<li><a href="{html.escape(self.baseurl + url if url.startswith("/") else url)}">'
+                              f'{html.escape(title)}</a></li>' for title, url in links)
+            sections.append(f'<h2>{html.escape(name)}</h2>\n<ul>\n{items}\n</ul>')
+        return self.page(f'{self.site_title} (preview)', '\n'.join(sections), navbar)
+
+
+def preview_pages(site_dir: Path) -> List[Path]:
+    """The generated pages a preview covers: docs/**/*.markdown."""
+    return sorted(path for path in (site_dir / 'docs').glob('**/*.markdown')
+                  if not any(part.startswith(('.', '_')) for part in path.relative_to(site_dir).parts))
+
+
+def main():
+    site_dir = Path(__file__).resolve().parent
+    started = time.perf_counter()
+    stats = PreviewRenderer(site_dir).render(preview_pages(site_dir), read_navbar(site_dir))
+    print(f"👁️  Preview: {stats['rendered']} page(s) rendered, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed in {(time.perf_counter() - started) * 1000:.0f} ms → {PREVIEW_DIR}/")
+    print("   Serve it with: python3 preview_server.py --preview")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
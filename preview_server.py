@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Local preview server for the built site (_site)
+
+Serves _site under the baseurl from _config.yml, so links resolve exactly as
+they do on GitHub Pages. Files are kept in an in-memory LRU cache (checked
+against their size and mtime on every request), answered with ETags so an
+unchanged page costs a 304, and compressed with brotli or gzip when the
+browser accepts it, preferring the .br/.gz siblings precompress.py leaves
+next to each file. HTML pages get a small live-reload script: when anything
+under _site changes (e.g. `jekyll build --watch` finished a rebuild), every
+open page reloads itself over a server-sent events stream.
+
+With --preview it serves _preview/ (written by preview_render.py, no Jekyll
+needed) at the root instead, taking assets/ and other static files from
+the site sources.
+
+Usage:
+    python3 preview_server.py                  # http://localhost:4000/<baseurl>/
+    python3 preview_server.py --port 4001 --poll
+    python3 preview_server.py --no-reload --cache-mb 128
+    python3 preview_server.py --preview        # the pure-Python preview, http://localhost:4000/
+"""
+
+import argparse
+import gzip
+import mimetypes
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from precompress import precompressed
+from preview_render import PREVIEW_DIR
+from site_output import site_baseurl
+from site_watcher import create_watcher
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LIVERELOAD_PATH = '/__livereload'
+LIVERELOAD_SCRIPT = (
+    '<script>new EventSource("{url}").addEventListener("reload", function () {{ location.reload(); }});</script>'
+)
+
+# Content types worth compressing; images, PDFs and office files already are
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                      'application/rss+xml', 'application/atom+xml', 'image/svg+xml')
+MIN_COMPRESS_BYTES = 1024
+
+
+def content_type(path: Path) -> str:
+    guessed, _ = mimetypes.guess_type(path.name)
+    guessed = guessed or 'application/octet-stream'
+    return f'{guessed}; charset=utf-8' if guessed.startswith('text/') or guessed.endswith(('javascript', 'json')) else guessed
+
+
+def is_compressible(mime: str) -> bool:
+    return mime.startswith(COMPRESSIBLE_TYPES)
+
+
+class FileCache:
+    """LRU cache of response bodies keyed by (path, encoding), bounded by total bytes.
+
+    An entry is served only while the file's size and mtime match the ones it
+    was built from; files larger than a quarter of the budget are not cached.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: Tuple[Path, str], version: Tuple[int, int], load: Callable[[], bytes]) -> bytes:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == version:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+
+        body = load()
+        if len(body) <= self.max_bytes // 4:
+            with self.lock:
+                previous = self.entries.pop(key, None)
+                if previous:
+                    self.size -= len(previous[1])
+                self.entries[key] = (version, body)
+                self.size += len(body)
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self.entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return body
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class LiveReload:
+    """Counts site rebuilds and wakes the browsers waiting on the event stream."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.clients = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation: int, timeout: float) -> int:
+        """The current generation, once it moves past generation or timeout expires."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class PreviewServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], site_dir: Path, baseurl: str = '',
+                 cache_bytes: int = 64 * 1024 * 1024, live_reload: bool = True, verbose: bool = False,
+                 fallback_dir: Optional[Path] = None):
+        super().__init__(address, PreviewHandler)
+        self.site_dir = site_dir.resolve()
+        # Files missing from site_dir are looked up here (a preview's assets)
+        self.fallback_dir = fallback_dir.resolve() if fallback_dir else None
+        self.baseurl = baseurl.rstrip('/')
+        self.cache = FileCache(cache_bytes)
+        self.live_reload = LiveReload() if live_reload else None
+        self.verbose = verbose
+
+    def resolve(self, url_path: str) -> Tuple[Optional[Path], Optional[str]]:
+        """(file to serve, redirect location) for a request path; (None, None) is a 404."""
+        path = unquote(url_path)
+        if self.baseurl:
+            if path in ('/', self.baseurl):
+                return None, self.baseurl + '/'
+            if not path.startswith(self.baseurl + '/'):
+                return None, None
+            path = path[len(self.baseurl):]
+
+        target = (self.site_dir / path.lstrip('/')).resolve()
+        if target != self.site_dir and self.site_dir not in target.parents:
+            return None, None
+        if self.fallback_dir and not target.exists():
+            fallback = (self.fallback_dir / path.lstrip('/')).resolve()
+            if self.fallback_dir in fallback.parents and fallback.is_file() \
+                    and not any(part.startswith(('.', '_')) for part in fallback.relative_to(self.fallback_dir).parts):
+                return fallback, None
+        if target.is_dir():
+            if not path.endswith('/'):
+                return None, self.baseurl + path + '/'
+            target = target / 'index.html'
+        elif not target.exists() and target.with_name(target.name + '.html').is_file():
+            # Jekyll permalinks without a trailing slash or extension
+            target = target.with_name(target.name + '.html')
+        return (target, None) if target.is_file() else (None, None)
+
+    def body(self, path: Path, encoding: str) -> Tuple[bytes, str]:
+        """(response body, ETag) for a file in the given content encoding ('' for identity)."""
+        stat = path.stat()
+        version = (stat.st_size, stat.st_mtime_ns)
+        # Like nginx: the file's size and mtime identify its content
+        etag = f'{stat.st_size:x}-{stat.st_mtime_ns:x}'
+
+        def load_identity() -> bytes:
+            data = path.read_bytes()
+            if self.live_reload and path.suffix == '.html':
+                script = LIVERELOAD_SCRIPT.format(url=self.baseurl + LIVERELOAD_PATH).encode('utf-8')
+                head, marker, tail = data.rpartition(b'</body>')
+                data = head + script + marker + tail if marker else data + script
+            return data
+
+        # Siblings written by precompress.py, unless the page needs the reload script
+        ready = precompressed(path, encoding) if encoding else None
+        if ready and not (self.live_reload and path.suffix == '.html'):
+            ready_stat = ready.stat()
+            body = self.cache.get((ready, ''), (ready_stat.st_size, ready_stat.st_mtime_ns), ready.read_bytes)
+            return body, f'"{etag}-{encoding}"'
+
+        identity = self.cache.get((path, ''), version, load_identity)
+        if not encoding:
+            return identity, f'"{etag}"'
+
+        def load_encoded() -> bytes:
+            if encoding == 'br':
+                return brotli.compress(identity)
+            return gzip.compress(identity, compresslevel=6, mtime=0)
+
+        return self.cache.get((path, encoding), version, load_encoded), f'"{etag}-{encoding}"'
+
+    def watch(self, polling: bool = False):
+        """Reload open pages whenever the built site changes; runs until the process exits."""
+        watcher = create_watcher([(self.site_dir, True)], polling=polling)
+        print(f"👀 Watching {self.site_dir.name}/ for rebuilds ({watcher.name})")
+        while True:
+            changed = watcher.wait(0.3)
+            self.cache.clear()
+            self.live_reload.notify()
+            print(f"🔁 {len(changed)} file(s) changed → reloading {self.live_reload.clients} page(s)")
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    server: PreviewServer
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def do_GET(self):
+        if self.server.live_reload and urlsplit(self.path).path == self.server.baseurl + LIVERELOAD_PATH:
+            self.stream_reloads()
+        else:
+            self.serve(send_body=True)
+
+    def accepted_encoding(self, mime: str, size: int) -> str:
+        if not is_compressible(mime) or size < MIN_COMPRESS_BYTES:
+            return ''
+        accepted = {part.split(';')[0].strip() for part in self.headers.get('Accept-Encoding', '').split(',')}
+        if brotli and 'br' in accepted:
+            return 'br'
+        return 'gzip' if 'gzip' in accepted else ''
+
+    def not_modified(self, etag: str) -> bool:
+        tags = {tag.strip().removeprefix('W/') for tag in self.headers.get('If-None-Match', '').split(',')}
+        return etag in tags or '*' in tags
+
+    def serve(self, send_body: bool):
+        path, redirect = self.server.resolve(urlsplit(self.path).path)
+        if redirect:
+            self.send_response(301)
+            self.send_header('Location', redirect)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        status = 200
+        if path is None:
+            status, path = 404, self.server.site_dir / '404.html'
+            if not path.is_file():
+                self.send_error(404)
+                return
+
+        mime = content_type(path)
+        try:
+            encoding = self.accepted_encoding(mime, path.stat().st_size)
+            body, etag = self.server.body(path, encoding)
+        except OSError:
+            self.send_error(404)
+            return
+
+        if status == 200 and self.not_modified(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header('Content-Type', mime)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        if is_compressible(mime):
+            self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def stream_reloads(self):
+        """Server-sent events: a 'reload' event after each rebuild, comments as keep-alives."""
+        live_reload = self.server.live_reload
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True
+
+        generation = live_reload.generation
+        with live_reload.condition:
+            live_reload.clients += 1
+        try:
+            while True:
+                current = live_reload.wait(generation, timeout=15)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(f'event: reload\ndata: {generation}\n\n'.encode('utf-8'))
+                else:
+                    self.wfile.write(b': keep-alive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with live_reload.condition:
+                live_reload.clients -= 1
+
+    def log_message(self, format: str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(site_dir: Path, port: int = 4000, host: str = '127.0.0.1', baseurl: Optional[str] = None,
+          cache_mb: int = 64, live_reload: bool = True, polling: bool = False, verbose: bool = False,
+          fallback_dir: Optional[Path] = None) -> int:
+    """Serve site_dir until interrupted."""
+    if not site_dir.is_dir():
+        print(f"❌ {site_dir} does not exist; build the site first (bundle exec jekyll build)")
+        return 1
+    if baseurl is None:
+        baseurl = site_baseurl(site_dir.resolve().parent)
+
+    server = PreviewServer((host, port), site_dir, baseurl, cache_mb * 1024 * 1024, live_reload, verbose,
+                           fallback_dir)
+    if live_reload:
+        threading.Thread(target=server.watch, args=(polling,), daemon=True).start()
+    compression = 'brotli, gzip' if brotli else 'gzip'
+    print(f"🌐 Serving {site_dir} on http://{host}:{port}{server.baseurl}/ "
+          f"({compression}{', live reload' if live_reload else ''}); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped ({server.cache.stats['hits']} cache hits, {server.cache.stats['misses']} misses)")
+    finally:
+        server.server_close()
+    return 0
+
+
+def serve_preview(site_root: Path, preview_dir: Optional[Path] = None, port: int = 4000, host: str = '127.0.0.1',
+                  baseurl: Optional[str] = None, cache_mb: int = 64, live_reload: bool = True,
+                  polling: bool = False, verbose: bool = False) -> int:
+    """Serve the pure-Python preview at the root, with static files from site_root."""
+    preview_dir = preview_dir or site_root / PREVIEW_DIR
+    if not preview_dir.is_dir():
+        print(f"❌ {preview_dir} does not exist; render it first (python3 preview_render.py)")
+        return 1
+    return serve(preview_dir, port, host, baseurl or '', cache_mb, live_reload, polling, verbose,
+                 fallback_dir=site_root)
+
+
+def main() -> int:
+    site_root = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Preview the built site with caching, compression and live reload")
+    parser.add_argument('port', nargs='?', type=int, default=4000, help="port to listen on (default: 4000)")
+    parser.add_argument('--host', default='127.0.0.1', help="address to bind (default: 127.0.0.1)")
+    parser.add_argument('--site', type=Path, default=site_root / '_site', help="built site directory (default: _site)")
+    parser.add_argument('--baseurl', help="path prefix to serve under (default: baseurl from _config.yml)")
+    parser.add_argument('--cache-mb', type=int, default=64, help="in-memory cache budget in MB (default: 64)")
+    parser.add_argument('--no-reload', action='store_true', help="do not inject live reload or watch for rebuilds")
+    parser.add_argument('--poll', action='store_true', help="poll file mtimes instead of using inotify")
+    parser.add_argument('--preview', action='store_true',
+                        help="serve the pure-Python preview (_preview/, see preview_render.py) at the root, "
+                             "with static files from the site sources")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every request")
+    args = parser.parse_args()
+    if args.preview:
+        site = args.site if args.site != site_root / '_site' else site_root / PREVIEW_DIR
+        return serve_preview(site_root, site, args.port, args.host, args.baseurl, args.cache_mb,
+                             live_reload=not args.no_reload, polling=args.poll, verbose=args.verbose)
+    return serve(args.site, args.port, args.host, args.baseurl, args.cache_mb,
+                 live_reload=not args.no_reload, polling=args.poll, verbose=args.verbose)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,106 +1,91 @@
 #!/usr/bin/env python3
 """
 Rebuild complete navigation with all sections
+
+Writes the same navigation the converter does, from the pages in docs/
+alone: for when pages were edited or removed by hand and the converter has
+not run. rebuild_navigation() takes an existing page index, so a caller
+that already holds one does not read front matter again.
 """
 
-import os
+import json
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from categorization import NAV_CATEGORIES
+from page_metadata import BUILD_CACHE_DIR, FrontMatterIndex, PageMetadataCache
+from site_navigation import add_page_sections, build_navigation, write_navigation
 
 SITE_ROOT = Path(__file__).resolve().parent
-docs_dir = SITE_ROOT / "docs"
-config_file = SITE_ROOT / "_config.yml"
 
-# Get all sections
-sections = []
-for md_file in docs_dir.glob("*.markdown"):
-    with open(md_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract info from front matter
-    title = ""
-    slug = md_file.stem
-    category = "Getting Started"
-    
-    for line in content.split('\n'):
-        line = line.strip()
-        if line.startswith('title: '):
-            title = line.replace('title: "', '').replace('"', '').strip()
-        elif line.startswith('permalink: /'):
-            slug = line.replace('permalink: /', '').strip().rstrip('/')
-        elif line.startswith('nav_category: '):
-            category = line.replace('nav_category: "', '').replace('"', '').strip()
-    
-    if title:
-        sections.append({
-            'title': title,
-            'slug': slug, 
-            'category': category
-        })
 
-# Sort by title
-sections.sort(key=lambda x: x['title'])
+def converted_sections(site_root: Path) -> Dict[str, Dict]:
+    """Top-level sections in the converter's build manifest, by page path, with their number."""
+    try:
+        with open(site_root / BUILD_CACHE_DIR / 'manifest.json', 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {entry['output']: dict(entry, number=int(key))
+            for key, entry in manifest.get('sections', {}).items()
+            if '.' not in key and entry.get('output') and entry.get('category') in NAV_CATEGORIES}
+
 
-# Define categories
-categories = {
-    "Getting Started": [],
-    "Risk & Threat Management": [], 
-    "Security Controls": [],
-    "Security Program": [],
-    "Compliance & Resilience": []
-}
+def rebuild_navigation(site_root: Path = SITE_ROOT, page_index: Optional[FrontMatterIndex] = None,
+                       nav_output: str = 'auto') -> Tuple[Path, bool, Dict[str, List[Dict]]]:
+    """Write the navigation for every page in docs/.
 
-# Auto-categorize by title keywords and slug
-for section in sections:
-    title_lower = section['title'].lower()
-    slug_lower = section['slug'].lower()
+    Returns the navigation file, whether it was written, and the sections of
+    each category.
+    """
+    # Get all sections from the page metadata cache the converter keeps; only
+    # pages added or edited since it was written have their front matter parsed
+    if page_index is None:
+        page_cache = PageMetadataCache(site_root)
+        page_index = FrontMatterIndex(site_root / "docs", cache=page_cache)
+        page_cache.save()
     
-    if ("getting started" in title_lower or "overview" in title_lower) or section['category'] == "Getting Started":
-        categories["Getting Started"].append(section)
-    elif any(kw in title_lower for kw in ["risk", "threat", "adversary", "attack surface"]):
-        categories["Risk & Threat Management"].append(section)
-    elif any(kw in title_lower for kw in ["cis18", "controls", "architecture", "engineering", "product security", "business process"]):
-        categories["Security Controls"].append(section)
-    elif any(kw in title_lower for kw in ["management", "leadership", "identity", "awareness", "operations", "incident response", "careers"]):
-        categories["Security Program"].append(section)
-    else:
-        categories["Compliance & Resilience"].append(section)
+    # Sections the converter built are listed as it listed them: under the
+    # category it scored from their whole content, which a hand-written
+    # nav_category does not override. Every other page with a title is filed
+    # by its front matter, as the converter files it.
+    converted = converted_sections(site_root)
+    categories = {name: [] for name in NAV_CATEGORIES}
+    pages = []
+    
+    for md_file, fields in page_index.records():
+        entry = converted.get(md_file.relative_to(site_root).as_posix())
+        if entry:
+            categories[entry['category']].append({'title': entry['title'], 'permalink': entry['permalink'],
+                                                  'section_number': entry['number']})
+        else:
+            pages.append((md_file, fields))
+    add_page_sections(categories, pages)
+    
+    # Numbered sections first, like the converter's, then unnumbered pages by title
+    menus, nav_categories = build_navigation(categories)
+    categories = {category['name']: category['sections'] for category in nav_categories}
+    
+    # Write to _data/navigation.yml when the site uses it, else splice _config.yml;
+    # either file is left alone (mtime included) when the navigation is unchanged
+    nav_file, written = write_navigation(site_root, menus, nav_categories, nav_output=nav_output)
+    return nav_file, written, categories
 
-# Generate navigation YAML
-nav_yaml = '# Navigation Bar\nnavbar-links:\n'
 
-for cat_name, cat_sections in categories.items():
-    if cat_sections:
-        nav_yaml += f'  "{cat_name}":\n'
-        
-        # Sort by logical order or title
-        cat_sections.sort(key=lambda x: x['title'])
-        
+def print_navigation(site_root: Path, nav_file: Path, written: bool, categories: Dict[str, List[Dict]]):
+    if written:
+        print(f"✅ Navigation rebuilt with all sections ({nav_file.relative_to(site_root)})")
+    else:
+        print(f"✅ Navigation already up to date ({nav_file.relative_to(site_root)})")
+    for cat_name, cat_sections in categories.items():
+        print(f"  📁 {cat_name}: {len(cat_sections)} sections")
         for section in cat_sections:
-            nav_yaml += f'    - "{section["title"]}": "/{section["slug"]}/"\n'
-
-# Add resources
-nav_yaml += '''  External Resources:
-    - GitHub Repo: "https://github.com/CroodSolutions/CISOinaBox"
-'''
+            print(f"    • {section['title']}")
 
-# Update config
-with open(config_file, 'r', encoding='utf-8') as f:
-    config_content = f.read()
 
-new_config = config_content
-config_start = config_content.find('# Navigation Bar')
-if config_start != -1:
-    config_end = config_content.find('\n\n#', config_start)
-    if config_end == -1:
-        config_end = len(config_content)
-    
-    new_config = config_content[:config_start] + nav_yaml.strip() + config_content[config_end:]
+def main():
+    print_navigation(SITE_ROOT, *rebuild_navigation())
 
-with open(config_file, 'w', encoding='utf-8') as f:
-    f.write(new_config)
 
-print("✅ Navigation rebuilt with all sections")
-for cat_name, cat_sections in categories.items():
-    print(f"  📁 {cat_name}: {len(cat_sections)} sections")
-    for section in cat_sections:
-        print(f"    • {section['title']}")
+if __name__ == "__main__":
+    main()
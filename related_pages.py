@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Backlinks and related sections for the site's pages
+
+Both are written to _data/ for _includes/related.html, which _config.yml
+adds after the content of every page:
+
+    _data/backlinks.json   {permalink: [{title, url}, ...]}  pages linking to the page
+    _data/related.json     {permalink: [{title, url}, ...]}  the most similar sections
+
+Similarity is the Jaccard similarity of two pages' strongest search terms,
+estimated from MinHash signatures. Signatures are split into bands, and
+only pages that share a band are compared (locality-sensitive hashing),
+so the work grows with the number of similar pairs rather than all pairs.
+A signature depends only on the page's terms and is cached in
+.build-cache/related.json against a hash of them.
+
+Usage:
+    python3 related_pages.py /disaster-recovery---dr/   # show a page's related sections and backlinks
+"""
+
+import hashlib
+import json
+import operator
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_profile import count_read
+from page_metadata import BUILD_CACHE_DIR
+from site_output import write_if_changed
+
+DATA_DIR = '_data'
+# Terms per page that go into its signature, strongest first
+SIGNATURE_TERMS = 150
+# 64 bands of 2 rows: pages about 20% alike almost always share a band
+BANDS = 64
+ROWS = 2
+RELATED_LIMIT = 5
+MIN_SIMILARITY = 0.1
+
+HASHES = BANDS * ROWS
+
+
+def strongest_terms(terms: Dict[str, int], limit: int = SIGNATURE_TERMS) -> List[str]:
+    return [term for term, _ in sorted(terms.items(), key=lambda item: (-item[1], item[0]))[:limit]]
+
+
+@lru_cache(maxsize=65536)
+def term_hashes(term: str) -> array:
+    """HASHES independent 32-bit hashes of a term, from one extendable-output digest."""
+    return array('I', hashlib.shake_128(term.encode('utf-8')).digest(HASHES * 4))
+
+
+def minhash(terms: Iterable[str]) -> List[int]:
+    """MinHash signature of a set of terms: the smallest of each of their hashes."""
+    hashes = [term_hashes(term) for term in set(terms)]
+    return list(map(min, zip(*hashes))) if hashes else []
+
+
+def similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the term sets behind two signatures."""
+    return sum(map(operator.eq, first, second)) / len(first)
+
+
+class RelatedPages:
+    """MinHash signatures of the site's sections, cached per page, and the _data/ files built from them."""
+
+    VERSION = 1
+
+    def __init__(self, site_dir: Path, cache_path: Optional[Path] = None):
+        self.site_dir = site_dir
+        self.cache_path = cache_path or site_dir / BUILD_CACHE_DIR / 'related.json'
+        self.signatures, self.matches = self._load()
+        self.stats = {'pages': 0, 'signatures_computed': 0, 'pairs_compared': 0, 'related': 0, 'backlinks': 0}
+
+    def _load(self) -> Tuple[Dict, Optional[Dict]]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return {}, None
+        if cache.get('version') != self.VERSION:
+            return {}, None
+        return cache.get('signatures', {}), cache.get('matches')
+
+    def signature(self, doc_id: str, terms: Dict[str, int], digest: Optional[str] = None) -> List[int]:
+        """The page's signature, recomputed only when its digest (the page's
+        hash, or else a hash of its terms) changed."""
+        if digest is None:
+            digest = hashlib.sha256(json.dumps(terms, separators=(',', ':')).encode('utf-8')).hexdigest()
+        cached = self.signatures.get(doc_id)
+        if cached and cached['digest'] == digest:
+            return cached['signature']
+        signature = minhash(strongest_terms(terms))
+        self.signatures[doc_id] = {'digest': digest, 'signature': signature}
+        self.stats['signatures_computed'] += 1
+        return signature
+
+    def related(self, docs: Dict[str, Dict[str, int]], digests: Optional[Dict[str, str]] = None,
+                limit: int = RELATED_LIMIT) -> Dict[str, List[Tuple[str, float]]]:
+        """The most similar other documents of each, from {doc id: terms} and
+        optionally {doc id: page hash}."""
+        digests = digests or {}
+        signatures = {doc_id: self.signature(doc_id, terms, digests.get(doc_id))
+                      for doc_id, terms in sorted(docs.items()) if terms}
+        unchanged = not self.stats['signatures_computed'] and signatures.keys() == self.signatures.keys()
+        self.signatures = {doc_id: self.signatures[doc_id] for doc_id in signatures}
+        self.stats['pages'] = len(signatures)
+        # The same pages with the same signatures have the same neighbours
+        if unchanged and self.matches is not None and self.matches.get('limit') == limit:
+            return {doc_id: [tuple(match) for match in matches] for doc_id, matches in self.matches['docs'].items()}
+
+        buckets = {}
+        for doc_id, signature in signatures.items():
+            for band in range(BANDS):
+                key = (band, *signature[band * ROWS:(band + 1) * ROWS])
+                buckets.setdefault(key, []).append(doc_id)
+        candidates = set()
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                candidates.update((first, second) for second in members[i + 1:])
+        self.stats['pairs_compared'] = len(candidates)
+
+        scored = {doc_id: [] for doc_id in signatures}
+        for first, second in candidates:
+            score = similarity(signatures[first], signatures[second])
+            if score >= MIN_SIMILARITY:
+                scored[first].append((second, score))
+                scored[second].append((first, score))
+        related = {doc_id: sorted(matches, key=lambda match: (-match[1], match[0]))[:limit]
+                   for doc_id, matches in scored.items() if matches}
+        self.matches = {'limit': limit, 'docs': related}
+        return related
+
+    def write(self, related: Dict[str, List[Dict]], backlinks: Dict[str, List[Dict]]) -> bool:
+        """Write both _data/ files and the signature cache; True if either file changed."""
+        self.stats['related'] = len(related)
+        self.stats['backlinks'] = len(backlinks)
+        written = False
+        for name, data in (('related', related), ('backlinks', backlinks)):
+            text = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False) + '\n'
+            written = write_if_changed(self.site_dir / DATA_DIR / f'{name}.json', text) or written
+        cache = {'version': self.VERSION, 'signatures': self.signatures, 'matches': self.matches}
+        write_if_changed(self.cache_path, json.dumps(cache, sort_keys=True, separators=(',', ':')) + '\n')
+        return written
+
+
+def main():
+    site_dir = Path(__file__).resolve().parent
+    if len(sys.argv) != 2:
+        print('Usage: python3 related_pages.py /permalink/')
+        sys.exit(1)
+    for name in ('related', 'backlinks'):
+        path = site_dir / DATA_DIR / f'{name}.json'
+        links = json.loads(path.read_text(encoding='utf-8')).get(sys.argv[1], []) if path.exists() else []
+        print(f"{name.capitalize()} ({len(links)}):")
+        for link in links:
+            print(f"  {link['title']}  {link['url']}")
+
+
+if __name__ == "__main__":
+    main()
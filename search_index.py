@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Sharded full-text search index for the site
+
+The converter tokenizes each section while it has the text in memory
+(document_terms()), and SearchIndex publishes an inverted index under
+search/ that assets/js/search.js queries in the browser:
+
+    search/meta.json           stemming rules, stop words and weights the client must share
+    search/docs.json           {doc id: {title, url, summary}} for every indexed page
+    search/shards/<xx>.json    {term: [[doc id, weight], ...]} for terms starting with xx
+
+A query fetches meta.json and docs.json once and then only the shards its
+terms fall in. Each document's term weights are cached in
+.build-cache/search.json, so a run that rebuilds a few sections rewrites
+just the shards holding their old or new terms.
+
+Usage:
+    python3 search_index.py "incident response"   # query the published index
+"""
+
+import json
+import math
+import re
+import sys
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from build_profile import count_read, count_regex
+from page_metadata import BUILD_CACHE_DIR
+from site_output import write_if_changed
+
+SEARCH_DIR = 'search'
+SHARD_PREFIX_LENGTH = 2
+SUMMARY_LENGTH = 200
+
+# Title words count ten times a body word, heading words three times
+FIELD_WEIGHTS = {'title': 10, 'heading': 3, 'body': 1}
+
+# (suffix, replacement, minimum stem length); the first suffix that fits is
+# replaced, then a trailing "e" is dropped, so "managed", "manages",
+# "management" and "manage" all stem to "manag". Rules that map a suffix to
+# itself stop "process" or "status" from losing their final "s".
+STEM_RULES = [
+    ('izations', 'ize', 2), ('ization', 'ize', 2), ('ational', 'ate', 2), ('ations', 'ate', 2),
+    ('ation', 'ate', 2), ('fulness', 'ful', 2), ('iveness', 'ive', 2), ('ousness', 'ous', 2),
+    ('nesses', '', 3), ('ness', '', 3), ('ments', '', 3), ('ment', '', 3),
+    ('ingly', '', 3), ('edly', '', 3), ('ings', '', 3), ('ing', '', 3),
+    ('ies', 'y', 2), ('ied', 'y', 2), ('sses', 'ss', 2), ('ss', 'ss', 0), ('us', 'us', 0), ('is', 'is', 0),
+    ('ed', '', 3), ('ly', '', 3), ('s', '', 3),
+]
+
+STOP_WORDS = frozenset(
+    'a an and are as at be been but by can do does for from has have how if in into is it its '
+    'may more most not of on or our should such than that the their them then there these they '
+    'this those to use used using was we what when where which while who will with you your'.split()
+)
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+HEADING_PATTERN = re.compile(r'^#{1,6}[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+# Link targets, HTML tags and liquid tags carry no searchable words
+MARKUP_PATTERN = re.compile(r'\]\([^)]*\)|<[^>]+>|\{[{%].*?[%}]\}', re.DOTALL)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    for suffix, replacement, min_stem in STEM_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            word = word[:-len(suffix)] + replacement
+            break
+    if len(word) > 4 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Stemmed search terms of a text, stop words removed."""
+    return [stem(word) for word in WORD_PATTERN.findall(text.lower())
+            if len(word) > 1 and word not in STOP_WORDS]
+
+
+def plain_text(content: str) -> str:
+    if content.startswith('---\n'):
+        end = content.find('\n---\n', 3)
+        if end != -1:
+            content = content[end + 5:]
+    count_regex()
+    return MARKUP_PATTERN.sub(' ', content)
+
+
+def document_terms(title: str, content: str) -> Dict[str, int]:
+    """Field-weighted term frequencies of a page."""
+    text = plain_text(content)
+    count_regex(3)
+    weights = {}
+    for field, source in (('title', title),
+                          ('heading', ' '.join(HEADING_PATTERN.findall(text))),
+                          ('body', text)):
+        # Stem each distinct word once, however often it occurs
+        for word, occurrences in Counter(WORD_PATTERN.findall(source.lower())).items():
+            if len(word) > 1 and word not in STOP_WORDS:
+                term = stem(word)
+                weights[term] = weights.get(term, 0) + occurrences * FIELD_WEIGHTS[field]
+    return weights
+
+
+def summarize(content: str) -> str:
+    """The first paragraph of body text, for result listings."""
+    # It is nearly always near the top; only look further if it is not
+    for text in (content[:8192], content[8192:]):
+        count_regex()
+        for block in re.split(r'\n\s*\n', plain_text(text)):
+            block = ' '.join(block.split()).strip('#*_>- ')
+            if len(block) > 40 and not block.startswith(('|', '!')):
+                return block if len(block) <= SUMMARY_LENGTH else block[:SUMMARY_LENGTH].rsplit(' ', 1)[0] + '…'
+    return ''
+
+
+def shard_of(term: str) -> str:
+    return term[:SHARD_PREFIX_LENGTH]
+
+
+class SearchIndex:
+    """Per-document term weights, cached between runs and published as prefix shards."""
+
+    VERSION = 1
+
+    def __init__(self, site_dir: Path, cache_path: Optional[Path] = None):
+        self.site_dir = site_dir
+        self.output_dir = site_dir / SEARCH_DIR
+        self.cache_path = cache_path or site_dir / BUILD_CACHE_DIR / 'search.json'
+        self.lock = threading.Lock()
+        self.docs, self.prefixes = self._load()
+        self.previous = dict(self.docs)
+        self.stats = {'indexed': 0, 'removed': 0, 'shards_written': 0, 'shards': len(self.prefixes)}
+
+    def _load(self) -> Tuple[Dict, Set[str]]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return {}, set()
+        # A published index that went missing has to be rebuilt from every page
+        if cache.get('version') != self.VERSION or not (self.output_dir / 'docs.json').exists():
+            return {}, set()
+        return cache.get('docs', {}), set(cache.get('prefixes', ()))
+
+    def has(self, doc_id: str) -> bool:
+        with self.lock:
+            return doc_id in self.docs
+
+    def add(self, doc_id: str, title: str, url: str, terms: Dict[str, int], summary: str = ''):
+        """Index (or re-index) a page."""
+        with self.lock:
+            self.docs[doc_id] = {'title': title, 'url': url, 'summary': summary, 'terms': terms}
+            self.stats['indexed'] += 1
+
+    def update(self, changed: Iterable[str], keep: Set[str]):
+        """Publish the index after the documents in changed were added, dropping any
+        document not in keep. Only shards holding an affected term are rewritten."""
+        with self.lock:
+            for doc_id in [doc_id for doc_id in self.docs if doc_id not in keep]:
+                del self.docs[doc_id]
+                self.stats['removed'] += 1
+
+            affected = set()
+            for doc_id in set(changed) | (self.previous.keys() - self.docs.keys()):
+                for docs in (self.previous, self.docs):
+                    affected.update(shard_of(term) for term in docs.get(doc_id, {}).get('terms', ()))
+
+            shards_dir = self.output_dir / 'shards'
+            existing = {path.stem for path in shards_dir.glob('*.json')} if shards_dir.is_dir() else set()
+            # Shards deleted since the last run are published again
+            affected |= self.prefixes - existing
+            if not affected and existing == self.prefixes:
+                return
+
+            # Postings of the affected prefixes only
+            shards = {}
+            prefixes = set()
+            for doc_id, doc in sorted(self.docs.items()):
+                for term, weight in doc['terms'].items():
+                    prefix = shard_of(term)
+                    prefixes.add(prefix)
+                    if prefix in affected:
+                        shards.setdefault(prefix, {}).setdefault(term, []).append([doc_id, weight])
+
+            for prefix, postings in sorted(shards.items()):
+                postings = {term: postings[term] for term in sorted(postings)}
+                if write_if_changed(shards_dir / f'{prefix}.json',
+                                    json.dumps(postings, separators=(',', ':'), ensure_ascii=False)):
+                    self.stats['shards_written'] += 1
+            for prefix in existing - prefixes:
+                (shards_dir / f'{prefix}.json').unlink()
+            self.prefixes = prefixes
+            self.stats['shards'] = len(prefixes)
+
+            # Documents without terms (pages another page replaced) are not published
+            docs = {doc_id: {key: doc[key] for key in ('title', 'url', 'summary')}
+                    for doc_id, doc in sorted(self.docs.items()) if doc['terms']}
+            meta = {
+                'version': self.VERSION, 'documents': len(docs), 'shard_prefix': SHARD_PREFIX_LENGTH,
+                'stem_rules': STEM_RULES, 'stop_words': sorted(STOP_WORDS), 'field_weights': FIELD_WEIGHTS,
+            }
+            write_if_changed(self.output_dir / 'meta.json', json.dumps(meta, indent=1) + '\n')
+            write_if_changed(self.output_dir / 'docs.json',
+                             json.dumps(docs, separators=(',', ':'), ensure_ascii=False))
+            cache = {'version': self.VERSION, 'prefixes': sorted(prefixes), 'docs': self.docs}
+            write_if_changed(self.cache_path, json.dumps(cache, sort_keys=True, separators=(',', ':')) + '\n')
+            self.previous = dict(self.docs)
+
+
+def search(site_dir: Path, query: str, limit: int = 10) -> List[Dict]:
+    """Rank pages for a query the way search.js does, reading only the shards it needs."""
+    output_dir = site_dir / SEARCH_DIR
+    docs = json.loads((output_dir / 'docs.json').read_text(encoding='utf-8'))
+    scores = {}
+    shards = {}
+    for term in set(tokenize(query)):
+        prefix = shard_of(term)
+        if prefix not in shards:
+            path = output_dir / 'shards' / f'{prefix}.json'
+            shards[prefix] = json.loads(path.read_text(encoding='utf-8')) if path.exists() else {}
+        postings = shards[prefix].get(term, [])
+        if not postings:
+            continue
+        idf = math.log(1 + len(docs) / len(postings))
+        for doc_id, weight in postings:
+            scores[doc_id] = scores.get(doc_id, 0) + idf * (1 + math.log(weight))
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [dict(docs[doc_id], id=doc_id, score=round(score, 3)) for doc_id, score in ranked]
+
+
+def main():
+    site_dir = Path(__file__).resolve().parent
+    if len(sys.argv) < 2:
+        print('Usage: python3 search_index.py "query"')
+        sys.exit(1)
+    for result in search(site_dir, ' '.join(sys.argv[1:])):
+        print(f"{result['score']:>7}  {result['title']}  {result['url']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+One entry point for building, checking and serving the site
+
+    python3 site_cli.py build            # convert sections (navigation included), precompress _site
+    python3 site_cli.py nav              # rebuild navigation from docs/ only, without converting
+    python3 site_cli.py validate         # build incrementally; exit 1 if validation found issues
+    python3 site_cli.py serve [port]     # serve _site (--build to build first, --preview for _preview/)
+    python3 site_cli.py watch            # rebuild affected pages on every source edit
+
+All stages run in this one process and share the converter's model of the
+site: `build` writes navigation once, from the sections it just converted,
+and counts pages from the index it kept current. `validate` is a build
+too (validation checks the pages the build writes), so it writes the same
+files `build` would. Modules are imported by the command that needs them,
+so `--help` and `nav` do not pay for the converter, and `serve` without
+`--build` does not import it at all.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+SITE_ROOT = Path(__file__).resolve().parent
+# site_navigation.NAV_OUTPUTS, without importing it for --help
+NAV_OUTPUTS = ('auto', 'config', 'data')
+
+
+def conversion_jobs(args: argparse.Namespace) -> int:
+    if args.jobs is None:
+        return 1
+    return args.jobs or os.cpu_count() or 1
+
+
+def converter_for(args: argparse.Namespace, check_external: bool = False, preview: bool = False):
+    """The converter configured from the conversion options, or exit with a usage error."""
+    from convert_to_jekyll_improved import ImprovedCISOToJekyllConverter
+
+    try:
+        return ImprovedCISOToJekyllConverter(str(SITE_ROOT.parent), str(SITE_ROOT), force=args.force,
+                                             jobs=conversion_jobs(args),
+                                             permalink_policy=args.permalink_policy, nav_output=args.nav_output,
+                                             stream=args.stream, check_external=check_external, preview=preview)
+    except ValueError as e:
+        args.parser.error(str(e))
+
+
+def build(args: argparse.Namespace) -> int:
+    """Convert (navigation included) and precompress _site."""
+    from convert_to_jekyll_improved import run_build
+
+    print("=== Building CISOinaBox Site ===")
+    print("\n>> Running conversion script...")
+    converter = converter_for(args, check_external=args.check_external, preview=args.preview)
+    run_build(converter, profile=args.profile, profile_format=args.profile_format,
+              cprofile=args.cprofile, trace_memory=args.tracemalloc, link_report=args.link_report)
+
+    print("\n=== Build Complete ===")
+    print(f"   Pages: {sum(1 for _ in converter.page_index.records())}\n")
+
+    # .gz/.br siblings for a site Jekyll has already built
+    if (SITE_ROOT / '_site').is_dir():
+        from precompress import precompress_site
+
+        print(">> Precompressing _site...")
+        # One thread per CPU unless --jobs says otherwise
+        precompress_site(SITE_ROOT / '_site', args.jobs or 0)
+        print()
+    return 0
+
+
+def nav(args: argparse.Namespace) -> int:
+    """Rebuild navigation from docs/, reading only front matter the page cache lacks."""
+    from rebuild_navigation import print_navigation, rebuild_navigation
+
+    print_navigation(SITE_ROOT, *rebuild_navigation(SITE_ROOT, nav_output=args.nav_output))
+    return 0
+
+
+def validate(args: argparse.Namespace) -> int:
+    """Build incrementally (writing what build writes) and fail if validation reported anything."""
+    from convert_to_jekyll_improved import run_build
+
+    report = run_build(converter_for(args, check_external=args.check_external), link_report=args.link_report)
+    issues = sum(len(issues) for issues in report['validation'].values())
+    return 1 if issues or report['errors'] else 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Serve _site, or the Python preview with --preview, optionally building first."""
+    if args.build:
+        build(args)
+        if args.preview:
+            print(f">> Serving the preview on http://localhost:{args.port}/ (not the Jekyll build)\n")
+        else:
+            print(f">> Serving site on http://localhost:{args.port} (reloads open pages when _site changes)\n")
+
+    from preview_server import serve as serve_site, serve_preview
+
+    live_reload = not args.no_reload
+    if args.preview:
+        return serve_preview(SITE_ROOT, port=args.port, host=args.host, baseurl=args.baseurl,
+                             cache_mb=args.cache_mb, live_reload=live_reload, polling=args.poll,
+                             verbose=args.verbose)
+    return serve_site(SITE_ROOT / '_site', args.port, args.host, args.baseurl, args.cache_mb,
+                      live_reload=live_reload, polling=args.poll, verbose=args.verbose)
+
+
+def watch(args: argparse.Namespace) -> int:
+    """Build, then rebuild whatever each source edit touches."""
+    from convert_to_jekyll_improved import watch as watch_site
+
+    if args.permalink_policy:
+        # The same check the converter makes, before the first build
+        converter_for(args)
+    watch_site(str(SITE_ROOT.parent), str(SITE_ROOT), jobs=conversion_jobs(args), polling=args.poll,
+               force=args.force, permalink_policy=args.permalink_policy, nav_output=args.nav_output,
+               stream=args.stream, preview=args.preview)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build, check and serve the CISOinaBox site")
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    conversion = argparse.ArgumentParser(add_help=False)
+    conversion.add_argument('--force', action='store_true',
+                            help="ignore the build manifest and rebuild every section")
+    conversion.add_argument('-j', '--jobs', type=int,
+                            help="process sections on N worker threads (default 1; 0 = one per CPU)")
+    conversion.add_argument('--permalink-policy', metavar='RULES',
+                            type=lambda value: [rule.strip() for rule in value.split(',') if rule.strip()],
+                            help="comma-separated precedence for pages claiming the same permalink "
+                                 "(see convert_to_jekyll_improved.py --help)")
+    conversion.add_argument('--stream', action='store_true',
+                            help="keep no section text between processing and writing")
+    navigation = argparse.ArgumentParser(add_help=False)
+    navigation.add_argument('--nav-output', choices=NAV_OUTPUTS, default='auto',
+                            help="write navigation to _data/navigation.yml (data) or _config.yml (config); "
+                                 "auto uses data once _data/navigation.yml exists")
+    checks = argparse.ArgumentParser(add_help=False)
+    checks.add_argument('--check-external', action='store_true',
+                        help="request external links whose cached result is stale (see link_checker.py)")
+    checks.add_argument('--link-report', metavar='PATH', type=Path,
+                        help="write every broken internal link and missing asset, with file and line, as JSON")
+    preview = argparse.ArgumentParser(add_help=False)
+    preview.add_argument('--preview', action='store_true',
+                         help="also render docs/ to _preview/ in Python (no Jekyll needed)")
+    profiling = argparse.ArgumentParser(add_help=False)
+    profiling.add_argument('--profile', metavar='PATH', type=Path,
+                           help="write per-phase and per-section timing and I/O metrics to PATH")
+    profiling.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                           help="metrics JSON, or a Chrome trace for chrome://tracing / Perfetto")
+    profiling.add_argument('--cprofile', metavar='PATH', type=Path,
+                           help="run under cProfile, dump stats to PATH and report the hottest functions")
+    profiling.add_argument('--tracemalloc', action='store_true', help="track allocations and report peak memory")
+
+    command = commands.add_parser('build', parents=[conversion, navigation, checks, preview, profiling],
+                                  help="convert sections, write navigation and precompress _site")
+    command.set_defaults(run=build)
+
+    command = commands.add_parser('nav', parents=[navigation], help="rebuild navigation from docs/")
+    command.set_defaults(run=nav)
+
+    command = commands.add_parser('validate', parents=[conversion, navigation, checks],
+                                  help="build incrementally, writing the site as build does, "
+                                       "and exit 1 if validation found issues")
+    command.set_defaults(run=validate)
+
+    command = commands.add_parser('serve', parents=[conversion, navigation, checks, preview, profiling],
+                                  help="serve _site (or _preview/ with --preview) with live reload")
+    command.add_argument('port', nargs='?', type=int, default=4000, help="port to listen on (default: 4000)")
+    command.add_argument('--build', action='store_true', help="build the site first, in this process")
+    command.add_argument('--host', default='127.0.0.1', help="address to bind (default: 127.0.0.1)")
+    command.add_argument('--baseurl', help="path prefix to serve under (default: baseurl from _config.yml)")
+    command.add_argument('--cache-mb', type=int, default=64, help="in-memory cache budget in MB (default: 64)")
+    command.add_argument('--no-reload', action='store_true', help="do not inject live reload or watch for rebuilds")
+    command.add_argument('--poll', action='store_true', help="poll file mtimes instead of using inotify")
+    command.add_argument('-v', '--verbose', action='store_true', help="log every request")
+    command.set_defaults(run=serve)
+
+    command = commands.add_parser('watch', parents=[conversion, navigation, preview],
+                                  help="rebuild affected pages on every source edit")
+    command.add_argument('--poll', action='store_true', help="poll file mtimes instead of using inotify")
+    command.set_defaults(run=watch)
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    args.parser = parser
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
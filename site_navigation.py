@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Navigation output shared by the converter and rebuild_navigation.py
+
+The navbar can live in one of two places:
+
+- config: the `navbar-links` block under "# Navigation Bar" in _config.yml,
+  which beautiful-jekyll reads directly. Jekyll treats any _config.yml edit
+  as a configuration change and regenerates the whole site.
+- data:   _data/navigation.yml, holding the navbar menus plus the ordered
+  sections of every category. _includes/nav.html renders its navbar-links
+  in place of site.navbar-links, and _config.yml is never touched, so
+  `jekyll serve --incremental` keeps regenerating only the pages that changed.
+
+Both scripts write through write_navigation(), so they splice the same
+block and emit the same format instead of overwriting each other's.
+rebuild_navigation.py files sections under the category the converter
+recorded for them, and both scripts list every other titled page in docs/
+through add_page_sections(), so from the same pages they write the same
+bytes and a rebuild after a build changes nothing.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from build_profile import count_read, count_regex
+from categorization import NAV_CATEGORIES, CategoryEngine
+from site_output import write_if_changed
+
+NAV_OUTPUTS = ('auto', 'config', 'data')
+NAV_DATA_FILE = Path('_data') / 'navigation.yml'
+
+# The navbar block in _config.yml runs to the next blank line or comment
+NAV_BLOCK_PATTERN = re.compile(r'# Navigation Bar\nnavbar-links:.*?(?=\n\n|\n#|\Z)', re.DOTALL)
+
+# `  "Menu":`, `  "Link": "/url/"` or `    - "Link": "/url/"` inside navbar-links
+NAV_ENTRY_PATTERN = re.compile(r'^( *)(- +)?("(?:[^"\\]|\\.)*"|\'(?:[^\']|\'\')*\'|[^:]+):[ \t]*(.*?)[ \t]*$')
+
+# (menu name, [(link title, url), ...]) in display order
+Menu = Tuple[str, List[Tuple[str, str]]]
+
+# The menu after the categories, in every navigation either script writes
+RESOURCES_MENU: Menu = ('Resources', [
+    ('Contributing', '/contributing/'),
+    ('GitHub Repo', 'https://github.com/CroodSolutions/CISOinaBox')
+])
+# Named in the data file's header by both scripts, which write the same navigation
+NAV_GENERATOR = 'convert_to_jekyll_improved.py'
+# Where a hand-authored page with no nav_category and no keyword in its title goes
+DEFAULT_PAGE_CATEGORY = 'Compliance & Resilience'
+
+
+def _quote(value) -> str:
+    """A YAML double-quoted scalar (JSON strings are valid YAML)."""
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def resolve_nav_output(site_dir: Path, nav_output: str = 'auto') -> str:
+    """'config' or 'data'; auto follows whichever the site already uses."""
+    if nav_output == 'auto':
+        return 'data' if (site_dir / NAV_DATA_FILE).exists() else 'config'
+    return nav_output
+
+
+def add_page_sections(categories: Dict[str, List[Dict]], pages: Iterable[Tuple[Path, Dict]]):
+    """File docs pages that are not converted sections under their front matter's nav_category.
+
+    Every page with a title is listed. A nav_category outside NAV_CATEGORIES
+    (such as 'Guide') becomes a category of its own; a page without one is
+    placed by the keywords in its title.
+    """
+    engine = None
+    for md_file, fields in pages:
+        if not fields.get('title'):
+            continue
+        category = fields.get('nav_category')
+        if not category:
+            if engine is None:
+                engine = CategoryEngine.from_nav_categories(NAV_CATEGORIES, field_weights={'title': 1},
+                                                            default=DEFAULT_PAGE_CATEGORY)
+            category, _ = engine.categorize(fields['title'])
+        categories.setdefault(category, []).append({
+            'title': fields['title'],
+            'permalink': fields.get('permalink') or f"/{md_file.stem}/",
+            'section_number': fields.get('section_number')
+        })
+
+
+def section_order(section: Dict) -> Tuple:
+    """Sort key: numbered sections by number, then pages without a number, each by title."""
+    number = section.get('section_number')
+    return number is None, number or 0, section['title']
+
+
+def build_navigation(categories: Dict[str, List[Dict]]) -> Tuple[List[Menu], List[Dict]]:
+    """Navbar menus and write_navigation()'s categories from each category's sections.
+
+    NAV_CATEGORIES come first, in their order, then any other category by
+    name; RESOURCES_MENU closes the navbar.
+    """
+    menus = []
+    nav_categories = []
+    for name in [*NAV_CATEGORIES, *sorted(set(categories) - set(NAV_CATEGORIES))]:
+        sections = sorted(categories.get(name, []), key=section_order)
+        menus.append((name, [(section['title'], section['permalink']) for section in sections]))
+        nav_categories.append({
+            'name': name,
+            'description': NAV_CATEGORIES.get(name, {}).get('description', ''),
+            'sections': [{'title': section['title'], 'permalink': section['permalink'],
+                          'section_number': section['section_number']} for section in sections]
+        })
+    menus.append(RESOURCES_MENU)
+    return menus, nav_categories
+
+
+def navbar_yaml(menus: List[Menu]) -> str:
+    """The navbar-links mapping, as beautiful-jekyll expects it."""
+    lines = ['navbar-links:']
+    for name, links in menus:
+        if links:
+            lines.append(f'  {_quote(name)}:')
+            lines.extend(f'    - {_quote(title)}: {_quote(url)}' for title, url in links)
+    return '\n'.join(lines) + '\n'
+
+
+def navigation_data_yaml(menus: List[Menu], categories: List[Dict], generator: str) -> str:
+    """_data/navigation.yml: the navbar plus each category's sections in display order.
+
+    categories holds {'name', 'description', 'sections': [{'title', 'permalink',
+    'section_number'?}]} in display order; empty categories are left out.
+    """
+    lines = [f'# Generated by {generator}; edit the section sources, not this file', navbar_yaml(menus).rstrip('\n')]
+    lines.append('categories:')
+    for category in categories:
+        if not category['sections']:
+            continue
+        lines.append(f'  - name: {_quote(category["name"])}')
+        lines.append(f'    description: {_quote(category.get("description", ""))}')
+        lines.append('    sections:')
+        for order, section in enumerate(category['sections'], 1):
+            lines.append(f'      - title: {_quote(section["title"])}')
+            lines.append(f'        permalink: {_quote(section["permalink"])}')
+            lines.append(f'        order: {order}')
+            if section.get('section_number') is not None:
+                lines.append(f'        section_number: {int(section["section_number"])}')
+    return '\n'.join(lines) + '\n'
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if value.startswith('"'):
+        return json.loads(value)
+    if value.startswith("'") and value.endswith("'"):
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def read_navbar(site_dir: Path) -> List[Menu]:
+    """The navbar menus, from wherever the site keeps them (see write_navigation).
+
+    Reads the block format navbar_yaml() writes; a menu that is a single
+    link ("Name": "/url/") comes back as a menu holding just that link.
+    """
+    path = site_dir / NAV_DATA_FILE
+    if not path.exists():
+        path = site_dir / '_config.yml'
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return []
+    count_read(len(text))
+
+    menus = []
+    in_block = False
+    for line in text.split('\n'):
+        if line.startswith('navbar-links:'):
+            in_block = True
+            continue
+        if not in_block or not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if not line.startswith(' '):
+            break
+        count_regex()
+        match = NAV_ENTRY_PATTERN.match(line)
+        if not match:
+            continue
+        indent, item, key, value = match.groups()
+        if not item and len(indent) <= 2:
+            menus.append((_unquote(key), [(_unquote(key), _unquote(value))] if value else []))
+        elif item and menus:
+            menus[-1][1].append((_unquote(key), _unquote(value)))
+    return menus
+
+
+def write_navigation(site_dir: Path, menus: List[Menu], categories: List[Dict],
+                     nav_output: str = 'auto', generator: str = NAV_GENERATOR) -> Tuple[Path, bool]:
+    """Write the navigation where the site consumes it.
+
+    Returns the file it belongs in and whether that file was written. In
+    config mode a _config.yml without a "# Navigation Bar" block is left alone.
+    """
+    if resolve_nav_output(site_dir, nav_output) == 'data':
+        path = site_dir / NAV_DATA_FILE
+        return path, write_if_changed(path, navigation_data_yaml(menus, categories, generator))
+
+    path = site_dir / '_config.yml'
+    with open(path, 'r', encoding='utf-8') as f:
+        config = f.read()
+    count_read(len(config))
+    count_regex()
+    block = '# Navigation Bar\n' + navbar_yaml(menus).rstrip('\n')
+    updated = NAV_BLOCK_PATTERN.sub(lambda _: block, config)
+    # Unchanged navigation leaves _config.yml (and its mtime) alone
+    return path, updated != config and write_if_changed(path, updated)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Atomic, write-if-changed output for generated site files
+
+Pages, _config.yml and the build cache are assembled in memory and handed
+to write_if_changed(), which leaves a file alone when it already holds the
+same bytes. Unchanged files keep their mtimes, so `jekyll build
+--incremental`, rsync and deploy steps only see real changes, and a write
+goes through a temp file and os.replace() so a crashed build never leaves
+a half-written file behind.
+
+Inside recording_writes() every file written or removed is noted with its
+state afterwards, so --watch can tell the build's own writes from edits
+made while it ran.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from build_profile import count_read, count_regex, count_write
+
+
+# {path: (mtime_ns, size) after the write, or None once removed} while recording
+_recorded_writes = None
+
+
+def file_state(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def recording_writes() -> Iterator[Dict[Path, Optional[Tuple[int, int]]]]:
+    """Note every file write_if_changed() writes and remove_output() removes."""
+    global _recorded_writes
+    _recorded_writes = recorded = {}
+    try:
+        yield recorded
+    finally:
+        _recorded_writes = None
+
+
+def is_recorded_write(path: Path, recorded: Dict[Path, Optional[Tuple[int, int]]]) -> bool:
+    """Whether path is as the recorded build left it (so a change to it was the build's own).
+
+    A directory the build wrote files into counts as its own as well.
+    """
+    if path in recorded:
+        return file_state(path) == recorded[path]
+    return path.is_dir() and any(written.parent == path for written in recorded)
+
+
+def remove_output(path: Path):
+    """Delete a generated file."""
+    path.unlink()
+    if _recorded_writes is not None:
+        _recorded_writes[path] = None
+
+
+def site_setting(site_dir: Path, key: str) -> str:
+    """A top-level scalar from the site's _config.yml ('' when unset or unreadable)."""
+    try:
+        with open(site_dir / '_config.yml', 'r', encoding='utf-8') as f:
+            config = f.read()
+    except OSError:
+        return ''
+    count_read(len(config))
+    count_regex()
+    match = re.search(rf'^{re.escape(key)}:\s*["\']?([^"\'\n#]*?)["\']?\s*(?:#.*)?$', config, flags=re.MULTILINE)
+    return match.group(1).strip() if match else ''
+
+
+def site_baseurl(site_dir: Path) -> str:
+    """baseurl from the site's _config.yml ('' when unset or unreadable)."""
+    return site_setting(site_dir, 'baseurl').rstrip('/')
+
+
+def write_if_changed(path: Path, text: Union[str, bytes], previous: Optional[Dict] = None) -> bool:
+    """Atomically write text (UTF-8) or bytes to path unless the file already holds exactly these bytes.
+
+    previous is the file's record from the last run (size, mtime_ns,
+    sha256); while the file's stat still matches it, the recorded hash
+    stands in for reading the file back. Returns whether the file was written.
+    """
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    try:
+        stat = path.stat()
+    except OSError:
+        stat = None
+
+    if stat and stat.st_size == len(data):
+        if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+            unchanged = previous.get('sha256') == hashlib.sha256(data).hexdigest()
+        else:
+            with open(path, 'rb') as f:
+                current = f.read()
+            count_read(len(current))
+            unchanged = current == data
+        if unchanged:
+            return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(temp, 'wb') as f:
+            f.write(data)
+        if stat:
+            os.chmod(temp, stat.st_mode & 0o7777)
+        os.replace(temp, path)
+    except BaseException:
+        if temp.exists():
+            temp.unlink()
+        raise
+    count_write(len(data))
+    if _recorded_writes is not None:
+        _recorded_writes[path] = file_state(path)
+    return True
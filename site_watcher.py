@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+File watchers for the converter's --watch mode
+
+Uses Linux inotify through ctypes when available and falls back to polling
+file mtimes everywhere else. Both watchers collect a debounced batch of
+changed paths, so an editor's save-rename-chmod burst triggers one rebuild.
+Changes seen during a rebuild are fetched with pending() and handed back
+with defer(); the next wait() returns them without blocking.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+# (directory, recursive) pairs to watch
+WatchSpec = Iterable[Tuple[Path, bool]]
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) snapshots of watched directories."""
+
+    name = 'polling'
+
+    def __init__(self, specs: WatchSpec, include: Optional[Callable[[Path], bool]] = None,
+                 interval: float = 0.5):
+        self.specs = list(specs)
+        self.include = include or (lambda path: True)
+        self.interval = interval
+        self.deferred = set()
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self, specs: Optional[WatchSpec] = None) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        pending = [(directory, recursive) for directory, recursive in (self.specs if specs is None else specs)]
+        while pending:
+            directory, recursive = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                path = Path(entry.path)
+                try:
+                    if entry.is_dir():
+                        snapshot[path] = (0, 0)
+                        if recursive:
+                            pending.append((path, True))
+                    elif self.include(path):
+                        stat = entry.stat()
+                        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return snapshot
+
+    def _changes(self) -> Set[Path]:
+        snapshot = self._take_snapshot()
+        changed = {
+            path for path in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = snapshot
+        return changed
+
+    def watch(self, specs: WatchSpec):
+        """Add directories to watch."""
+        added = [spec for spec in specs if spec not in self.specs]
+        self.specs.extend(added)
+        # Only the new directories' files join the snapshot; changes elsewhere stay pending
+        if added:
+            self.snapshot.update(self._take_snapshot(added))
+
+    def wait(self, debounce: float = 0.2) -> Set[Path]:
+        """Block until something changes, then return everything changed within the debounce window."""
+        changed, self.deferred = self.deferred, set()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self._changes()
+        while True:
+            time.sleep(debounce)
+            more = self._changes()
+            if not more:
+                return changed
+            changed |= more
+
+    def pending(self) -> Set[Path]:
+        """Everything changed since the last wait() or pending(), without blocking."""
+        return self._changes()
+
+    def defer(self, paths: Iterable[Path]):
+        """Have the next wait() return these changes."""
+        self.deferred.update(paths)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher, driven through ctypes so no extra package is needed."""
+
+    name = 'inotify'
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, specs: WatchSpec, include: Optional[Callable[[Path], bool]] = None):
+        library = ctypes.util.find_library('c')
+        if not library:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.include = include or (lambda path: True)
+        self.directories = {}
+        self.recursive = set()
+        self.deferred = set()
+        self.watch(specs)
+
+    def _add_watch(self, directory: Path, recursive: bool):
+        if directory in self.directories.values():
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.EVENT_MASK)
+        if wd < 0:
+            return
+        self.directories[wd] = directory
+        if recursive:
+            self.recursive.add(directory)
+            for entry in os.scandir(directory):
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    self._add_watch(Path(entry.path), True)
+
+    def watch(self, specs: WatchSpec):
+        """Add directories to watch."""
+        for directory, recursive in specs:
+            if Path(directory).is_dir():
+                self._add_watch(Path(directory), recursive)
+
+    def _read_events(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_DELETE_SELF:
+                del self.directories[wd]
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if path.name.startswith('.'):
+                continue
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and directory in self.recursive:
+                    self._add_watch(path, True)
+                changed.add(path)
+            elif self.include(path):
+                changed.add(path)
+        return changed
+
+    def wait(self, debounce: float = 0.2) -> Set[Path]:
+        """Block until something changes, then return everything changed within the debounce window."""
+        changed, self.deferred = self.deferred, set()
+        while not changed:
+            changed = self._read_events(None)
+        while True:
+            more = self._read_events(debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def pending(self) -> Set[Path]:
+        """Every queued change, without blocking."""
+        changed = set()
+        while True:
+            more = self._read_events(0)
+            if not more:
+                return changed
+            changed |= more
+
+    def defer(self, paths: Iterable[Path]):
+        """Have the next wait() return these changes."""
+        self.deferred.update(paths)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(specs: WatchSpec, include: Optional[Callable[[Path], bool]] = None,
+                   polling: bool = False, interval: float = 0.5):
+    """inotify where possible, mtime polling otherwise."""
+    specs = list(specs)
+    if not polling:
+        try:
+            return InotifyWatcher(specs, include)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(specs, include, interval)
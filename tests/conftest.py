@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The site's scripts are top-level modules; benchmarks/corpus.py builds test trees
+for path in (REPO_ROOT, REPO_ROOT / 'benchmarks'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
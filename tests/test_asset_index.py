@@ -0,0 +1,53 @@
+from convert_to_jekyll_improved import AssetIndex
+
+
+def record(sha256: str, source: str = None) -> dict:
+    return {'size': 1, 'mtime_ns': 0, 'sha256': sha256, 'source': source}
+
+
+OUTPUTS = {
+    'assets/pdf/guide.pdf': record('a', '05 - Policies/guide.pdf'),
+    'assets/docs/guide.pdf': record('b', '07 - Templates/files/guide.pdf'),
+    'assets/pdf/Access Control Policy.pdf': record('c', '05 - Policies/Access Control Policy.pdf'),
+    'assets/xlsx/register.xlsx': record('d', '02 - Risk/register.xlsx'),
+    'assets/excel/register.xlsx': record('d'),
+}
+
+
+def test_source_file_relative_to_the_section_wins():
+    index = AssetIndex(OUTPUTS)
+    assert index.resolve('files/guide.pdf', '07 - Templates') == ('/assets/docs/guide.pdf', [])
+    assert index.resolve('guide.pdf', '05 - Policies') == ('/assets/pdf/guide.pdf', [])
+
+
+def test_site_paths_resolve_however_many_levels_they_climb():
+    index = AssetIndex(OUTPUTS)
+    assert index.resolve('/assets/docs/guide.pdf') == ('/assets/docs/guide.pdf', [])
+    assert index.resolve('../../assets/docs/guide.pdf', '09 - Other') == ('/assets/docs/guide.pdf', [])
+
+
+def test_name_match_prefers_the_extension_directory_and_reports_rivals():
+    index = AssetIndex(OUTPUTS)
+    assert index.resolve('elsewhere/guide.pdf', '09 - Other') == ('/assets/pdf/guide.pdf', ['/assets/docs/guide.pdf'])
+
+
+def test_copies_with_the_same_bytes_are_not_rivals():
+    index = AssetIndex(OUTPUTS)
+    assert index.resolve('register.xlsx', '09 - Other') == ('/assets/xlsx/register.xlsx', [])
+
+
+def test_normalized_name_ignores_case_escapes_and_punctuation():
+    index = AssetIndex(OUTPUTS)
+    url = '/assets/pdf/Access%20Control%20Policy.pdf'
+    assert index.resolve('access_control-policy.PDF', '09 - Other') == (url, [])
+    assert index.resolve('Access%20Control%20Policy.pdf#page=2', '09 - Other') == (url, [])
+    assert index.resolve('ACCESS CONTROL POLICY.pdf?download=1') == (url, [])
+    assert AssetIndex.normalize('Access%20Control_Policy.PDF') == AssetIndex.normalize('access control policy.pdf')
+
+
+def test_unknown_and_empty_targets_do_not_resolve():
+    index = AssetIndex(OUTPUTS)
+    assert index.resolve('missing.pdf', '05 - Policies') == (None, [])
+    assert index.resolve('guide.docx', '05 - Policies') == (None, [])
+    assert index.resolve('#top') == (None, [])
+    assert AssetIndex({}).resolve('guide.pdf') == (None, [])
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+import convert_to_jekyll_improved
+from convert_to_jekyll_improved import AssetStore
+
+
+@pytest.fixture
+def layout(tmp_path):
+    source = tmp_path / 'source'
+    site = tmp_path / 'site'
+    (source / '05 - Policies').mkdir(parents=True)
+    site.mkdir()
+    return source, site
+
+
+def store_for(source, site) -> AssetStore:
+    return AssetStore(site, site / '.build-cache' / 'assets.json', source)
+
+
+def write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def no_reflinks(monkeypatch):
+    def unsupported(source, target):
+        raise OSError("no reflinks here")
+    monkeypatch.setattr(convert_to_jekyll_improved, 'reflink', unsupported)
+
+
+def test_copy_then_unchanged(layout):
+    source, site = layout
+    policy = write(source / '05 - Policies' / 'policy.pdf', b'%PDF policy')
+    target = site / 'assets' / 'pdf' / 'policy.pdf'
+
+    store = store_for(source, site)
+    assert store.materialize(policy, target) == 'copied'
+    assert target.read_bytes() == b'%PDF policy'
+    assert store.exists('assets/pdf/policy.pdf')
+    assert store.resolve('assets/pdf/policy.pdf')['source'] == '05 - Policies/policy.pdf'
+    mtime = target.stat().st_mtime_ns
+
+    assert store.materialize(policy, target) == 'unchanged'
+    assert target.stat().st_mtime_ns == mtime
+    assert store.stats == {'copied': 1, 'linked': 0, 'unchanged': 1, 'deduplicated': 0}
+
+
+def test_changed_source_is_copied_again(layout):
+    source, site = layout
+    policy = write(source / '05 - Policies' / 'policy.pdf', b'first')
+    target = site / 'assets' / 'pdf' / 'policy.pdf'
+    store_for(source, site).materialize(policy, target)
+
+    write(policy, b'second version')
+    assert store_for(source, site).materialize(policy, target) == 'copied'
+    assert target.read_bytes() == b'second version'
+
+
+def test_identical_content_is_linked_to_the_copy_already_in_the_store(layout, monkeypatch):
+    no_reflinks(monkeypatch)
+    source, site = layout
+    first = write(source / '05 - Policies' / 'register.xlsx', b'same bytes')
+    second = write(source / '06 - Risk' / 'register-copy.xlsx', b'same bytes')
+
+    store = store_for(source, site)
+    assert store.materialize(first, site / 'assets' / 'xlsx' / 'register.xlsx') == 'copied'
+    assert store.materialize(second, site / 'assets' / 'excel' / 'register-copy.xlsx') == 'linked'
+    assert os.path.samefile(site / 'assets' / 'xlsx' / 'register.xlsx', site / 'assets' / 'excel' / 'register-copy.xlsx')
+
+
+def test_falls_back_to_a_copy_when_links_fail(layout, monkeypatch):
+    no_reflinks(monkeypatch)
+
+    def no_hardlinks(source, target):
+        raise OSError("no hardlinks here")
+    monkeypatch.setattr(os, 'link', no_hardlinks)
+    source, site = layout
+    first = write(source / '05 - Policies' / 'a.pdf', b'same bytes')
+    second = write(source / '05 - Policies' / 'b.pdf', b'same bytes')
+
+    store = store_for(source, site)
+    store.materialize(first, site / 'assets' / 'pdf' / 'a.pdf')
+    assert store.materialize(second, site / 'assets' / 'pdf' / 'b.pdf') == 'copied'
+    assert (site / 'assets' / 'pdf' / 'b.pdf').read_bytes() == b'same bytes'
+    assert not os.path.samefile(site / 'assets' / 'pdf' / 'a.pdf', site / 'assets' / 'pdf' / 'b.pdf')
+    assert not list((site / 'assets' / 'pdf').glob('.*.tmp'))
+
+
+def test_deduplicate_collapses_identical_files(layout, monkeypatch):
+    no_reflinks(monkeypatch)
+    source, site = layout
+    write(site / 'assets' / 'pdf' / 'a.pdf', b'duplicate')
+    write(site / 'assets' / 'docs' / 'a.pdf', b'duplicate')
+    write(site / 'assets' / 'pdf' / 'other.pdf', b'unique')
+
+    store = store_for(source, site)
+    store.deduplicate()
+    assert store.stats['deduplicated'] == 1
+    assert os.path.samefile(site / 'assets' / 'pdf' / 'a.pdf', site / 'assets' / 'docs' / 'a.pdf')
+
+    store.deduplicate()
+    assert store.stats['deduplicated'] == 1
+
+
+def test_saved_manifest_spares_rehashing_unchanged_files(layout, monkeypatch):
+    source, site = layout
+    policy = write(source / '05 - Policies' / 'policy.pdf', b'%PDF policy')
+    target = site / 'assets' / 'pdf' / 'policy.pdf'
+    store = store_for(source, site)
+    store.materialize(policy, target)
+    store.save()
+
+    def hash_file(path):
+        raise AssertionError(f"{path} was hashed again")
+    monkeypatch.setattr(convert_to_jekyll_improved, 'hash_file', hash_file)
+    store = store_for(source, site)
+    assert store.resolve('assets/pdf/policy.pdf')['source'] == '05 - Policies/policy.pdf'
+    assert store.materialize(policy, target) == 'unchanged'
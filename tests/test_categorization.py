@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+import categorization
+from categorization import NAV_CATEGORIES, CategoryEngine
+
+DOCS = Path(categorization.__file__).resolve().parent / 'docs'
+
+
+@pytest.fixture
+def engine():
+    return CategoryEngine.from_nav_categories(NAV_CATEGORIES, default='Getting Started')
+
+
+def test_title_outweighs_body(engine):
+    scores = engine.score('Mapping Your Attack Surface', 'Governance matters.')
+    assert scores['Risk & Threat Management'] == 10
+    assert scores['Compliance & Resilience'] == 3
+    assert engine.categorize('Mapping Your Attack Surface', 'Governance matters.')[0] == 'Risk & Threat Management'
+
+
+def test_keyword_counts_once_per_field(engine):
+    scores = engine.score('Risk and more risk', 'risk, risks, riskier')
+    assert scores['Risk & Threat Management'] == 13
+
+
+def test_keywords_match_word_prefixes_only(engine):
+    # "risks" starts with "risk"; "asterisk" merely contains it
+    assert engine.score('Risks')['Risk & Threat Management'] == 10
+    assert engine.score('Asterisk')['Risk & Threat Management'] == 0
+
+
+def test_phrases_need_consecutive_words(engine):
+    assert engine.score('Attack surfaces')['Risk & Threat Management'] == 10
+    assert engine.score('Attack on the surface')['Risk & Threat Management'] == 0
+    assert engine.score('Surface attack')['Risk & Threat Management'] == 0
+
+
+def test_explain_lists_matches_by_field(engine):
+    details = engine.explain('Incident Response Operations', 'Covers governance and threat modelling.')
+    assert details['Security Program'] == {
+        'score': 20, 'matches': {'title': ['incident response', 'operations']}}
+    assert details['Compliance & Resilience'] == {'score': 3, 'matches': {'body': ['governance']}}
+    assert details['Risk & Threat Management'] == {'score': 3, 'matches': {'body': ['threat']}}
+    assert details['Advanced Topics'] == {'score': 0, 'matches': {}}
+
+
+def test_headings_are_not_weighted_by_default(engine):
+    content = '# Governance\n\nText.\n'
+    assert 'headings' not in engine.explain('Page', content)['Compliance & Resilience']['matches']
+
+    weighted = CategoryEngine.from_nav_categories(NAV_CATEGORIES, field_weights={'title': 10, 'headings': 5, 'body': 3})
+    assert weighted.explain('Page', content)['Compliance & Resilience'] == {
+        'score': 8, 'matches': {'headings': ['governance'], 'body': ['governance']}}
+
+
+def test_no_match_falls_back_to_default(engine):
+    assert engine.categorize('Unrelated Title', 'nothing relevant')[0] == 'Getting Started'
+    assert engine.categorize('Unrelated Title', default='Compliance & Resilience')[0] == 'Compliance & Resilience'
+
+
+def test_ties_go_to_the_earlier_category(engine):
+    # risk (Risk & Threat Management) and management (Security Program) score alike
+    assert engine.categorize('Risk Management')[0] == 'Risk & Threat Management'
+
+
+@pytest.mark.parametrize('page, category', [
+    ('business-continuity-planning---bcp', 'Compliance & Resilience'),
+    ('ciso-security-management-strategy-guide', 'Security Program'),
+    ('cyber-attacks-and-defense-threat-intelligence-adversaries-and-collective-defense', 'Risk & Threat Management'),
+    ('cyber-insurance', 'Advanced Topics'),
+    ('cybersecurity-and-it-career-pathways', 'Security Program'),
+    ('getting-started', 'Getting Started'),
+    ('governance-risk-compliance-grc-strategy-guide-for-cybersecurity-programs', 'Compliance & Resilience'),
+    ('overview-of-cis18-critical-security-controls', 'Security Controls'),
+    ('product-and-software-security', 'Security Controls'),
+    ('resources', 'Advanced Topics'),
+    ('understanding-enterprise-risk-management-erm-for-cisos', 'Security Program'),
+    ('vulnerability-management-and-risk', 'Security Program'),
+])
+def test_docs_pages_keep_their_categories(engine, page, category):
+    content = (DOCS / f'{page}.markdown').read_text(encoding='utf-8')
+    title = next(line.split(':', 1)[1].strip().strip('"\'') for line in content.splitlines()
+                 if line.startswith('title:'))
+    assert engine.categorize(title, content)[0] == category
@@ -0,0 +1,71 @@
+import pytest
+
+from bench_crossrefs import legacy_rewrite
+from convert_to_jekyll_improved import CrossReferenceRewriter
+
+
+def section(title: str, raw_title: str = None) -> dict:
+    slug = ''.join(char if char.isalnum() else '-' for char in title.lower())
+    return {'title': title, 'raw_title': raw_title or f'01 - {title}', 'slug': slug, 'permalink': f'/{slug}/'}
+
+
+def rewrite(sections, content: str) -> str:
+    """Rewrite with CrossReferenceRewriter, checking it agrees with the old regex loop."""
+    rewritten = CrossReferenceRewriter(sections).rewrite(content)
+    assert rewritten == legacy_rewrite(content, sections)
+    return rewritten
+
+
+def test_links_point_at_the_mentioned_section():
+    sections = [section('Cyber Insurance'), section('Disaster Recovery')]
+    content = 'See [Cyber Insurance](../08/Readme.md) and [the Disaster Recovery plan](x.md).'
+    assert rewrite(sections, content) == (
+        'See [Cyber Insurance](/cyber-insurance/) and [the Disaster Recovery plan](/disaster-recovery/).')
+
+
+def test_links_without_a_title_and_plain_mentions_are_left_alone():
+    sections = [section('Cyber Insurance')]
+    content = 'Cyber Insurance matters. [Home](/) and [insurance](x.md) stay.'
+    assert rewrite(sections, content) == content
+
+
+def test_raw_titles_match_too():
+    sections = [section('Cyber Insurance', raw_title='08 - Cyber Insurance Basics')]
+    assert rewrite(sections, '[08 - Cyber Insurance Basics](x.md)') == '[08 - Cyber Insurance Basics](/cyber-insurance/)'
+
+
+@pytest.mark.parametrize('titles, expected', [
+    # The longer title comes later: it wins where it appears
+    (['Risk', 'Risk Management'], ['/risk/', '/risk-management/']),
+    # The shorter title comes later: it is inside the longer one, so it wins everywhere
+    (['Risk Management', 'Risk'], ['/risk/', '/risk/']),
+])
+def test_overlapping_titles(titles, expected):
+    sections = [section(title) for title in titles]
+    content = '[Risk](a.md) [Enterprise Risk Management](b.md)'
+    assert rewrite(sections, content) == f'[Risk]({expected[0]}) [Enterprise Risk Management]({expected[1]})'
+
+
+def test_last_section_in_order_wins_wherever_it_appears_in_the_text():
+    sections = [section('Identity'), section('Cloud'), section('Vendor')]
+    content = '[Cloud and Identity](a.md) [Identity and Cloud](b.md) [Vendor, Cloud, Identity](c.md)'
+    assert rewrite(sections, content) == '[Cloud and Identity](/cloud/) [Identity and Cloud](/cloud/) ' \
+                                         '[Vendor, Cloud, Identity](/vendor/)'
+
+
+@pytest.mark.parametrize('title', ['C.I.A. Triad', 'Risk (ERM) + Metrics', '$100 Budget ^ *?', 'Back\\slash | Pipe'])
+def test_titles_with_regex_metacharacters_match_literally(title):
+    sections = [section(title)]
+    permalink = sections[0]['permalink']
+    assert rewrite(sections, f'[{title}](a.md)') == f'[{title}]({permalink})'
+    # '.' is not a wildcard and '(' is not a group
+    near_miss = title.replace('.', 'x').replace('(', '').replace('$', 'S').replace('\\', '/')
+    assert rewrite(sections, f'[{near_miss}](a.md)') == f'[{near_miss}](a.md)'
+
+
+def test_already_rewritten_links_are_stable():
+    sections = [section('Risk'), section('Risk Management'), section('Cloud')]
+    content = '[Risk Management](x.md), [Cloud](/cloud/) and [Cloud risk](/old-permalink/)'
+    once = rewrite(sections, content)
+    assert once == '[Risk Management](/risk-management/), [Cloud](/cloud/) and [Cloud risk](/cloud/)'
+    assert rewrite(sections, once) == once
@@ -0,0 +1,44 @@
+import ast
+from pathlib import Path
+
+import convert_to_jekyll_improved
+from convert_to_jekyll_improved import BUILD_MODULES, ImprovedCISOToJekyllConverter
+
+REPO_ROOT = Path(convert_to_jekyll_improved.__file__).resolve().parent
+
+
+def local_imports(module: str) -> set:
+    """Repo modules imported anywhere in module's source, at top level or inside functions."""
+    tree = ast.parse((REPO_ROOT / f'{module}.py').read_text(encoding='utf-8'))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+    return {name for name in names if (REPO_ROOT / f'{name}.py').exists()}
+
+
+def test_build_modules_cover_every_module_the_converter_imports():
+    seen, pending = set(), ['convert_to_jekyll_improved']
+    while pending:
+        for name in local_imports(pending.pop()) - seen:
+            seen.add(name)
+            pending.append(name)
+    # The watcher decides when to build, not what a build writes
+    seen -= {'convert_to_jekyll_improved', 'site_watcher'}
+    assert seen <= set(BUILD_MODULES)
+
+
+def test_fingerprint_changes_with_any_build_module(tmp_path, monkeypatch):
+    for name in ('convert_to_jekyll_improved', *BUILD_MODULES):
+        (tmp_path / f'{name}.py').write_bytes((REPO_ROOT / f'{name}.py').read_bytes())
+    monkeypatch.setattr(convert_to_jekyll_improved, '__file__', str(tmp_path / 'convert_to_jekyll_improved.py'))
+    converter = object.__new__(ImprovedCISOToJekyllConverter)
+
+    fingerprints = {converter.generator_fingerprint()}
+    for name in BUILD_MODULES:
+        with open(tmp_path / f'{name}.py', 'a', encoding='utf-8') as f:
+            f.write('\n# edited\n')
+        fingerprints.add(converter.generator_fingerprint())
+    assert len(fingerprints) == len(BUILD_MODULES) + 1
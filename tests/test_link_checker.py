@@ -0,0 +1,132 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from link_checker import ExternalLinkChecker
+from link_requests import check_urls
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """/ok, /missing, /no-head (405 to HEAD), /moved (301 to /ok) and /slow (0.2 s)."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.respond(head=True)
+
+    def do_GET(self):
+        self.respond(head=False)
+
+    def respond(self, head: bool):
+        server = self.server
+        with server.lock:
+            server.log.append((self.command, self.path, time.monotonic()))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if self.path.split('?')[0] == '/slow':
+                time.sleep(0.2)
+            status, headers = 200, {}
+            if self.path == '/missing':
+                status = 404
+            elif self.path == '/no-head' and head:
+                status = 405
+            elif self.path == '/moved':
+                status, headers = 301, {'Location': '/ok'}
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            if not head:
+                self.wfile.write(b'ok')
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.log = []
+    server.active = server.peak = 0
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def servers():
+    started = [start_server(), start_server()]
+    yield started
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def url(server: ThreadingHTTPServer, path: str) -> str:
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_redirects_and_head_fallback(servers):
+    server = servers[0]
+    ok, missing, no_head, moved = check_urls(
+        [url(server, '/ok'), url(server, '/missing'), url(server, '/no-head'), url(server, '/moved')],
+        timeout=5, per_host=4, concurrency=8)
+    assert (ok['status'], ok['ok']) == (200, True)
+    assert (missing['status'], missing['ok']) == (404, False)
+    assert (no_head['status'], no_head['ok']) == (200, True)
+    assert (moved['status'], moved['ok'], moved['final_url']) == (200, True, url(server, '/ok'))
+    requests = [(method, path) for method, path, _ in server.log]
+    assert ('HEAD', '/no-head') in requests and ('GET', '/no-head') in requests
+    # HEAD succeeded, so no GET was needed
+    assert ('GET', '/ok') not in requests
+
+
+def test_per_host_limit(servers):
+    server = servers[0]
+    records = check_urls([url(server, f'/slow?{n}') for n in range(8)], timeout=5, per_host=2, concurrency=8)
+    assert all(record['ok'] for record in records)
+    assert server.peak == 2
+
+
+def test_busy_host_does_not_hold_global_slots(servers):
+    busy, other = servers
+    urls = [url(busy, f'/slow?{n}') for n in range(4)] + [url(other, '/ok')]
+    started = time.monotonic()
+    check_urls(urls, timeout=5, per_host=1, concurrency=2)
+    # The other host is reached while the busy host's first request is still running
+    assert other.log[0][2] - started < 0.2
+
+
+def test_results_are_cached_until_stale(servers, tmp_path):
+    server = servers[0]
+    urls = [url(server, '/ok'), url(server, '/missing')]
+    cache_path = tmp_path / 'external-links.json'
+
+    checker = ExternalLinkChecker(cache_path)
+    checker.check(urls)
+    checker.save()
+    assert checker.stats['checked'] == 2 and checker.stats['broken'] == 1
+    requests = len(server.log)
+
+    checker = ExternalLinkChecker(cache_path)
+    results = checker.check(urls)
+    assert checker.stats['checked'] == 0 and checker.stats['cached'] == 2
+    assert results[url(server, '/missing')]['ok'] is False
+    assert len(server.log) == requests
+
+    # A failure goes stale before a working link does
+    for record in checker.results.values():
+        record['checked'] -= 25 * 3600
+    checker.check(urls)
+    assert checker.stats['checked'] == 1
+    assert server.log[-1][1] == '/missing'
+
+    checker.check(urls, force=True)
+    assert checker.stats['checked'] == 2
@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+
+import site_cli
+from corpus import generate_corpus
+
+PERMALINK = '/vendor-and-cloud-guide-3/'
+GENERATED = 'docs/vendor-and-cloud-guide-3.markdown'
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    corpus = generate_corpus(tmp_path / 'corpus', sections=6, doc_kb=2, cross_links=3, assets=0)
+    monkeypatch.setattr(site_cli, 'SITE_ROOT', corpus['site'])
+    return corpus['site']
+
+
+def run(monkeypatch, *args) -> int:
+    monkeypatch.setattr(sys, 'argv', ['site_cli.py', *args])
+    return site_cli.main()
+
+
+def hand_authored(site, name: str, section_number: int = None) -> str:
+    """A page in docs/ claiming section 3's permalink; returns its path relative to the site."""
+    (site / 'docs').mkdir(exist_ok=True)
+    number = f"section_number: {section_number}\n" if section_number is not None else ''
+    (site / 'docs' / name).write_text(
+        f"---\nlayout: page\ntitle: 'Hand Written'\npermalink: {PERMALINK}\n{number}---\nWritten by hand.\n",
+        encoding='utf-8')
+    return f'docs/{name}'
+
+
+@pytest.mark.parametrize('policy, name, winner, rule', [
+    # Default policy: only the section's own page carries its number
+    ([], 'hand.markdown', 'generated', 'section-number'),
+    (['section-number'], 'a-hand.markdown', 'generated', 'section-number'),
+    (['hand-authored'], 'hand.markdown', 'hand', 'hand-authored'),
+    (['generated'], 'hand.markdown', 'generated', 'generated'),
+    # path alone: the path that sorts first wins
+    (['path'], 'a-hand.markdown', 'hand', 'path'),
+    (['path'], 'zz-hand.markdown', 'generated', 'path'),
+    (['hand-authored', 'section-number'], 'hand.markdown', 'hand', 'hand-authored'),
+], ids=['default', 'section-number', 'hand-authored', 'generated', 'path-first', 'path-last', 'reordered'])
+def test_permalink_policy_picks_one_page(site, monkeypatch, capsys, policy, name, winner, rule):
+    hand = hand_authored(site, name)
+    args = ['--permalink-policy', ','.join(policy)] if policy else []
+    assert run(monkeypatch, 'validate', *args) == 0
+
+    kept, dropped = (hand, GENERATED) if winner == 'hand' else (GENERATED, hand)
+    assert f"🔀 {PERMALINK}: kept {kept}, dropped {dropped} ({rule})" in capsys.readouterr().out
+    assert (site / kept).exists()
+    assert not (site / dropped).exists()
+
+
+def test_page_carrying_the_section_number_is_adopted(site, monkeypatch, capsys):
+    hand = hand_authored(site, 'hand.markdown', section_number=3)
+    assert run(monkeypatch, 'validate') == 0
+
+    # No collision: the section writes its page at the hand-authored page's path
+    assert '🔀' not in capsys.readouterr().out
+    assert '# Vendor and Cloud Guide 3' in (site / hand).read_text(encoding='utf-8')
+    assert not (site / GENERATED).exists()
+
+
+def test_unknown_permalink_rule_is_a_usage_error(site, monkeypatch, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run(monkeypatch, 'build', '--permalink-policy', 'newest')
+    assert exit_info.value.code == 2
+    assert 'newest' in capsys.readouterr().err
@@ -0,0 +1,92 @@
+import pytest
+
+from preview_render import MarkdownRenderer, PreviewRenderer, output_path, preview_pages, render_liquid
+
+
+def render(text: str) -> str:
+    return MarkdownRenderer().render(text)
+
+
+@pytest.mark.parametrize('markdown, expected', [
+    ('# Title\n\nSome *em* and **strong** text with `co*de*` and a [link](/x/ "T").',
+     '<h1 id="title">Title</h1>\n<p>Some <em>em</em> and <strong>strong</strong> text with <code>co*de*</code> '
+     'and a <a href="/x/" title="T">link</a>.</p>'),
+    # kramdown ids: punctuation and leading non-letters dropped, repeats numbered
+    ('## Risk\n\n## Risk\n\n### 1. Steps & Things',
+     '<h2 id="risk">Risk</h2>\n<h2 id="risk-1">Risk</h2>\n<h3 id="steps--things">1. Steps &amp; Things</h3>'),
+    ('Title\n=====\n\nSub\n---', '<h1 id="title">Title</h1>\n<h2 id="sub">Sub</h2>'),
+    ('- one\n- two\n  - nested\n- three',
+     '<ul>\n<li>one</li>\n<li>two\n<ul>\n<li>nested</li>\n</ul></li>\n<li>three</li>\n</ul>'),
+    ('1. first\n\n2. second', '<ol>\n<li><p>first</p></li>\n<li><p>second</p></li>\n</ol>'),
+    ('3. three\n4. four', '<ol start="3">\n<li>three</li>\n<li>four</li>\n</ol>'),
+    ('- item\nlazy continuation', '<ul>\n<li>item\nlazy continuation</li>\n</ul>'),
+    ('| Name | Score |\n| :--- | ---: |\n| a \\| b | 1 |\n| c |',
+     '<table>\n<thead>\n<tr><th style="text-align: left">Name</th><th style="text-align: right">Score</th></tr>\n'
+     '</thead>\n<tbody>\n<tr><td style="text-align: left">a | b</td><td style="text-align: right">1</td></tr>\n'
+     '<tr><td style="text-align: left">c</td><td style="text-align: right"></td></tr>\n</tbody>\n</table>'),
+    ('> quoted **text**\n> more', '<blockquote>\n<p>quoted <strong>text</strong>\nmore</p>\n</blockquote>'),
+    ("```python\nx = '<a>'\n```", '<pre><code class="language-python">x = &#x27;&lt;a&gt;&#x27;</code></pre>'),
+    ('***', '<hr />'),
+    ('<div>\n*raw*\n</div>', '<div>\n*raw*\n</div>'),
+    ('a & b < c &amp; <span>ok</span>\\*not em\\*', '<p>a &amp; b &lt; c &amp; <span>ok</span>*not em*</p>'),
+    ('![alt "x"](/img.png) <https://example.com/a?b=1&c=2>',
+     '<p><img src="/img.png" alt="alt &quot;x&quot;" /> '
+     '<a href="https://example.com/a?b=1&amp;c=2">https://example.com/a?b=1&amp;c=2</a></p>'),
+    ('[**bold link** with `code`](/p/)', '<p><a href="/p/"><strong>bold link</strong> with <code>code</code></a></p>'),
+    ('snake_case_word and _em_', '<p>snake_case_word and <em>em</em></p>'),
+    ('line one  \nline two', '<p>line one<br />\nline two</p>'),
+], ids=['inline', 'heading-ids', 'setext', 'nested-list', 'loose-list', 'list-start', 'lazy-line', 'table',
+        'blockquote', 'fence', 'rule', 'html-block', 'escapes', 'image-autolink', 'link-label', 'intraword',
+        'hard-break'])
+def test_markdown(markdown, expected):
+    assert render(markdown) == expected
+
+
+def test_render_liquid():
+    text = ("{{ '/assets/x.pdf' | relative_url }} {{ \"/a/\" | absolute_url }} {{ 'rel' | relative_url }} "
+            "{{ site.title }}|{{ page.unknown }}|{% include x.html %}|{% raw %}{{ keep }}{% endraw %}")
+    assert render_liquid(text, '/base', 'https://example.com', {'site.title': 'CISO'}) == (
+        '/base/assets/x.pdf https://example.com/base/a/ rel CISO|||{{ keep }}')
+
+
+@pytest.mark.parametrize('permalink, expected', [
+    (None, 'docs/page.html'),
+    ('/page/', 'page/index.html'),
+    ('/', 'index.html'),
+    ('/page.html', 'page.html'),
+    ('/guide/page', 'guide/page/index.html'),
+])
+def test_output_path_follows_the_permalink(permalink, expected):
+    assert output_path('docs/page.markdown', permalink) == expected
+
+
+def test_only_changed_pages_are_rendered_again(tmp_path):
+    (tmp_path / '_config.yml').write_text('title: CISO in a Box\n', encoding='utf-8')
+    docs = tmp_path / 'docs'
+    (docs / 'guide').mkdir(parents=True)
+    (docs / 'a.markdown').write_text("---\ntitle: 'A'\npermalink: /a/\n---\n# A\n\nLinks to "
+                                     "[B]({{ '/guide/b/' | relative_url }}).\n", encoding='utf-8')
+    (docs / 'guide' / 'b.markdown').write_text("---\ntitle: 'B'\npermalink: /guide/b/\n---\nB text.\n",
+                                               encoding='utf-8')
+    menus = [('Guide', [('A', '/a/'), ('B', '/guide/b/')])]
+
+    stats = PreviewRenderer(tmp_path).render(preview_pages(tmp_path), menus)
+    assert (stats['rendered'], stats['unchanged']) == (2, 0)
+    page = (tmp_path / '_preview' / 'a' / 'index.html').read_text(encoding='utf-8')
+    assert '<a href="/guide/b/">B</a>' in page
+    assert '<title>A | CISO in a Box</title>' in page
+    assert (tmp_path / '_preview' / 'index.html').exists()
+
+    stats = PreviewRenderer(tmp_path).render(preview_pages(tmp_path), menus)
+    assert (stats['rendered'], stats['unchanged']) == (0, 2)
+
+    (docs / 'guide' / 'b.markdown').write_text("---\ntitle: 'B'\npermalink: /guide/b2/\n---\nB edited.\n",
+                                               encoding='utf-8')
+    stats = PreviewRenderer(tmp_path).render(preview_pages(tmp_path), menus)
+    assert (stats['rendered'], stats['unchanged'], stats['removed']) == (1, 1, 1)
+    assert (tmp_path / '_preview' / 'guide' / 'b2' / 'index.html').exists()
+    assert not (tmp_path / '_preview' / 'guide' / 'b' / 'index.html').exists()
+
+    # A navbar change re-renders every page
+    stats = PreviewRenderer(tmp_path).render(preview_pages(tmp_path), menus + [('More', [('C', '/c/')])])
+    assert (stats['rendered'], stats['unchanged']) == (2, 0)
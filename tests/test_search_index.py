@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from search_index import SearchIndex, document_terms, search, shard_of, stem, summarize, tokenize
+from site_output import recording_writes
+
+
+@pytest.mark.parametrize('words, expected', [
+    (['manage', 'managed', 'manages', 'management'], 'manag'),
+    (['organization', 'organizations'], 'organiz'),
+    (['responding'], 'respond'),
+    (['policies'], 'policy'),
+    (['risk', 'risks'], 'risk'),
+    # Suffix rules that keep their final "s"
+    (['process'], 'process'),
+    (['status'], 'status'),
+    (['analysis'], 'analysis'),
+    # Too short to lose a suffix
+    (['gas'], 'gas'),
+])
+def test_stem(words, expected):
+    assert {stem(word) for word in words} == {expected}
+
+
+def test_tokenize_drops_stop_words_and_single_letters():
+    assert tokenize('The Risk of a risky policy, x y') == ['risk', 'risky', 'policy']
+
+
+def test_document_terms_weight_title_headings_and_body():
+    content = ('---\ntitle: ignored\n---\n# Response Plans\n\n'
+               'Plans are [tested](https://hidden.example/) {% include note.html %} yearly.\n')
+    # Headings are body text too: "plans" counts 3 as a heading word plus 1 twice in the body
+    assert document_terms('Incident Response', content) == {
+        'incident': 10, 'respons': 14, 'plan': 5, 'test': 1, 'year': 1}
+
+
+def test_summarize_takes_the_first_real_paragraph():
+    content = ('---\ntitle: x\n---\n# Heading\n\n| a | table |\n\n![image](x.png)\n\n'
+               'This paragraph describes the page in more than forty characters.\n\nLater text.')
+    assert summarize(content) == 'This paragraph describes the page in more than forty characters.'
+
+    long = ' '.join(['word'] * 100)
+    summary = summarize(long)
+    assert summary.endswith('…') and len(summary) <= 201 and not summary[:-1].endswith(' ')
+
+
+def build_index(site, pages):
+    index = SearchIndex(site)
+    for doc_id, (title, content) in pages.items():
+        index.add(doc_id, title, f'/{doc_id}/', document_terms(title, content), summarize(content))
+    index.update(pages, set(pages))
+    return index
+
+
+PAGES = {
+    'incident': ('Incident Response', 'Contain the breach and restore operations quickly after an incident.'),
+    'insurance': ('Cyber Insurance', 'Insurance policies cover losses from a breach or ransomware.'),
+}
+
+
+def test_terms_are_published_in_prefix_shards(tmp_path):
+    index = build_index(tmp_path, PAGES)
+    shards = {path.stem: json.loads(path.read_text(encoding='utf-8'))
+              for path in (tmp_path / 'search' / 'shards').glob('*.json')}
+    assert set(shards) == index.prefixes
+    for prefix, postings in shards.items():
+        assert all(shard_of(term) == prefix for term in postings)
+    assert shards['br']['breach'] == [['incident', 1], ['insurance', 1]]
+    assert shards['in']['insuranc'] == [['insurance', 11]]
+    assert shards['in']['incident'] == [['incident', 11]]
+
+    meta = json.loads((tmp_path / 'search' / 'meta.json').read_text(encoding='utf-8'))
+    assert meta['documents'] == 2 and meta['shard_prefix'] == 2
+    assert [result['id'] for result in search(tmp_path, 'insured policy')] == ['insurance']
+    assert [result['id'] for result in search(tmp_path, 'breaches')] == ['incident', 'insurance']
+
+
+def test_update_rewrites_only_affected_shards(tmp_path):
+    build_index(tmp_path, PAGES)
+    shards_dir = tmp_path / 'search' / 'shards'
+
+    index = SearchIndex(tmp_path)
+    assert index.has('incident')
+    index.add('insurance', 'Cyber Insurance', '/insurance/',
+              document_terms('Cyber Insurance', 'Insurance policies cover ransomware and zero days.'))
+    with recording_writes() as written:
+        index.update(['insurance'], set(PAGES))
+
+    shards = {path.name for path in shards_dir.glob('*.json')}
+    assert 'ze.json' in shards and 'lo.json' not in shards
+    rewritten = {path.name for path in written if path.parent == shards_dir}
+    # "loss" and "breach" left the page and "zero" and "days" arrived; every
+    # other shard the page touches holds the same postings as before
+    assert rewritten == {'br.json', 'da.json', 'ze.json'}
+    assert index.stats['shards_written'] == 3
+
+
+def test_removed_documents_and_deleted_shards(tmp_path):
+    build_index(tmp_path, PAGES)
+    shards_dir = tmp_path / 'search' / 'shards'
+    (shards_dir / 'co.json').unlink()
+
+    index = SearchIndex(tmp_path)
+    index.update([], {'incident'})
+    assert index.stats['removed'] == 1
+    assert (shards_dir / 'co.json').exists()
+    assert not (shards_dir / 'ra.json').exists()
+    assert [result['id'] for result in search(tmp_path, 'breach')] == ['incident']
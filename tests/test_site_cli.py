@@ -0,0 +1,71 @@
+import sys
+
+import pytest
+
+import site_cli
+from corpus import generate_corpus
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    corpus = generate_corpus(tmp_path / 'corpus', sections=6, doc_kb=2, cross_links=3, assets=0)
+    site = corpus['site']
+    # An existing _data/navigation.yml puts the navigation in data mode
+    (site / '_data').mkdir()
+    (site / '_data' / 'navigation.yml').write_text('', encoding='utf-8')
+    monkeypatch.setattr(site_cli, 'SITE_ROOT', site)
+    return site
+
+
+def run(monkeypatch, *args) -> int:
+    monkeypatch.setattr(sys, 'argv', ['site_cli.py', *args])
+    return site_cli.main()
+
+
+def test_second_build_leaves_navigation_untouched(site, monkeypatch, capsys):
+    navigation = site / '_data' / 'navigation.yml'
+    assert run(monkeypatch, 'build') == 0
+    text, mtime = navigation.read_text(encoding='utf-8'), navigation.stat().st_mtime_ns
+    assert 'categories:' in text
+
+    assert run(monkeypatch, 'build') == 0
+    assert 'Navigation unchanged, _data/navigation.yml left as is' in capsys.readouterr().out
+    assert navigation.stat().st_mtime_ns == mtime
+    assert navigation.read_text(encoding='utf-8') == text
+
+
+def test_nav_after_build_writes_the_same_navigation(site, monkeypatch, capsys):
+    navigation = site / '_data' / 'navigation.yml'
+    assert run(monkeypatch, 'build') == 0
+    mtime = navigation.stat().st_mtime_ns
+
+    assert run(monkeypatch, 'nav') == 0
+    assert 'Navigation already up to date' in capsys.readouterr().out
+    assert navigation.stat().st_mtime_ns == mtime
+
+
+
+def test_navigation_lists_hand_authored_pages(site, monkeypatch, capsys):
+    docs = site / 'docs'
+    docs.mkdir(exist_ok=True)
+    (docs / 'glossary.markdown').write_text(
+        "---\nlayout: page\ntitle: 'Glossary'\npermalink: /glossary/\nnav_category: 'Guide'\n---\nTerms.\n",
+        encoding='utf-8')
+    (docs / 'governance-notes.markdown').write_text(
+        "---\nlayout: page\ntitle: 'Governance Notes'\npermalink: /governance-notes/\n---\nNotes.\n",
+        encoding='utf-8')
+    navigation = site / '_data' / 'navigation.yml'
+
+    assert run(monkeypatch, 'build') == 0
+    text, mtime = navigation.read_text(encoding='utf-8'), navigation.stat().st_mtime_ns
+    # An unknown nav_category is kept as its own menu, after the known ones
+    assert '  "Guide":\n    - "Glossary": "/glossary/"\n  "Resources":' in text
+    assert '  - name: "Guide"\n    description: ""\n' in text
+    # Without a nav_category or a section number: placed by title, after the numbered sections
+    menu = text.split('  "Compliance & Resilience":\n', 1)[1].split('\n  "', 1)[0].splitlines()
+    assert menu[-1] == '    - "Governance Notes": "/governance-notes/"'
+    assert len(menu) > 1
+
+    assert run(monkeypatch, 'nav') == 0
+    assert 'Navigation already up to date' in capsys.readouterr().out
+    assert navigation.stat().st_mtime_ns == mtime
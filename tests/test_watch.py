@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+import convert_to_jekyll_improved
+import site_watcher
+from convert_to_jekyll_improved import ImprovedCISOToJekyllConverter, watch
+from corpus import generate_corpus
+
+
+@pytest.mark.parametrize('polling', [True, False], ids=['polling', 'inotify'])
+def test_edit_during_rebuild_is_rebuilt(polling, tmp_path, monkeypatch, capsys):
+    watcher_class = site_watcher.PollingWatcher if polling else site_watcher.InotifyWatcher
+    if not polling:
+        try:
+            watcher_class([]).close()
+        except (OSError, AttributeError):
+            pytest.skip("inotify is not available")
+    corpus = generate_corpus(tmp_path / 'corpus', sections=4, doc_kb=2, cross_links=2, assets=0)
+    first, second = sorted(corpus['root'].glob('0* - */Readme.md'))[:2]
+    convert = ImprovedCISOToJekyllConverter.convert
+    calls = []
+
+    def edit(readme):
+        readme.write_text(readme.read_text(encoding='utf-8') + '\nEdited.\n', encoding='utf-8')
+
+    def convert_and_edit(self):
+        calls.append(self)
+        if len(calls) == 1:
+            # The initial build; the first edit comes once the watcher is running
+            threading.Timer(1.0, edit, (first,)).start()
+        elif len(calls) == 3:
+            raise KeyboardInterrupt
+        report = convert(self)
+        if len(calls) == 2:
+            # Saved while the rebuild for the first edit is still running
+            edit(second)
+        return report
+
+    batches = []
+    wait = watcher_class.wait
+
+    def record_wait(self, debounce=0.2):
+        batches.append(wait(self, debounce))
+        return batches[-1]
+
+    monkeypatch.setattr(convert_to_jekyll_improved.ImprovedCISOToJekyllConverter, 'convert', convert_and_edit)
+    monkeypatch.setattr(watcher_class, 'wait', record_wait)
+    thread = threading.Thread(target=watch, args=(str(corpus['root']), str(corpus['site'])),
+                              kwargs={'polling': polling}, daemon=True)
+    thread.start()
+    thread.join(timeout=20)
+
+    assert not thread.is_alive(), "the edit made during the rebuild was never rebuilt"
+    assert batches == [{first}, {second}]
@@ -0,0 +1,32 @@
+import hashlib
+import shutil
+from pathlib import Path
+
+from workbook_pages import WorkbookPages
+
+SAMPLE = Path(__file__).resolve().parent.parent / 'assets' / 'content' / \
+    '06 - Security Architecture and Engineering' / 'NGS Attack to Control Mapping.xlsx'
+
+
+def workbook(path: Path, key: str):
+    return path, key, hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_failed_workbooks_are_not_counted_as_converted(tmp_path):
+    broken = tmp_path / 'Broken.xlsx'
+    broken.write_bytes(b'not a zip file')
+    good = tmp_path / 'Mapping.xlsx'
+    shutil.copy(SAMPLE, good)
+    workbooks = [workbook(broken, '01/Broken.xlsx'), workbook(good, '02/Mapping.xlsx')]
+
+    pages = WorkbookPages(tmp_path / 'site')
+    stats = pages.build(workbooks)
+    assert (stats['converted'], stats['unchanged'], stats['failed']) == (1, 0, 1)
+    assert stats['sheets'] > 0
+    assert [key for key, _ in pages.failures] == ['01/Broken.xlsx']
+
+    # The failure is remembered by hash, and still reported as a failure
+    pages = WorkbookPages(tmp_path / 'site')
+    stats = pages.build(workbooks)
+    assert (stats['converted'], stats['unchanged'], stats['failed']) == (0, 1, 1)
+    assert [key for key, _ in pages.failures] == ['01/Broken.xlsx']
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Browsable pages for the XLSX workbooks shipped in section directories
+
+Each visible sheet of a workbook becomes a page the reader can page
+through and filter, instead of a download only:
+
+    workbooks/<workbook>/<sheet>.html             page with the first rows and the filter box
+    workbooks/<workbook>/<sheet>/rows-NNN.json    the sheet's rows, PAGE_SIZE at a time
+    workbooks/index.html                          every workbook and its sheets
+
+Sheets are read straight from the XLSX zip with incremental XML parsing,
+and rows are written out one page of rows at a time, so memory stays flat
+however long a sheet is. Only the shared-strings table is kept whole, since
+cells refer into it by position. Workbooks are cached in
+.build-cache/workbooks.json by content hash, so an unchanged workbook is not
+opened at all on the next build.
+
+Usage:
+    python3 workbook_pages.py "path/to/workbook.xlsx"   # list its sheets and row counts
+"""
+
+import html
+import itertools
+import json
+import posixpath
+import re
+import sys
+import zipfile
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from xml.etree.ElementTree import ParseError, iterparse
+from xml.parsers import expat
+
+from build_profile import count_read
+from page_metadata import BUILD_CACHE_DIR
+from search_index import FIELD_WEIGHTS, STOP_WORDS, SUMMARY_LENGTH, WORD_PATTERN, stem
+from site_output import write_if_changed
+
+WORKBOOKS_DIR = 'workbooks'
+PAGE_SIZE = 500
+# The header is the first of a sheet's first non-empty rows that is at
+# least half as full as the fullest of them
+HEADER_SCAN_ROWS = 10
+
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+# Element names as expat reports them with namespace_separator='}'
+ROW_TAG, CELL_TAG, VALUE_TAG, TEXT_TAG, PHONETIC_TAG = (MAIN_NS[1:] + name for name in ('row', 'c', 'v', 't', 'rPh'))
+
+CELL_REF_PATTERN = re.compile(r'[A-Z]+')
+
+# What a damaged or mislabelled .xlsx raises
+WORKBOOK_ERRORS = (zipfile.BadZipFile, KeyError, ValueError, IndexError, ParseError, expat.ExpatError)
+
+
+def slugify(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'sheet'
+
+
+def column_index(ref: str) -> int:
+    """Zero-based column of a cell reference: 'A7' -> 0, 'AB3' -> 27."""
+    match = CELL_REF_PATTERN.match(ref)
+    index = 0
+    for letter in match.group(0) if match else '':
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def element_text(element) -> str:
+    """Text of a shared or inline string: plain or rich text runs, without phonetic hints."""
+    parts = []
+    for child in element:
+        if child.tag == f'{MAIN_NS}t':
+            parts.append(child.text or '')
+        elif child.tag == f'{MAIN_NS}r':
+            parts.extend(node.text or '' for node in child.iter(f'{MAIN_NS}t'))
+    return ''.join(parts)
+
+
+def read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """The workbook's shared strings, in index order."""
+    try:
+        stream = archive.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with stream:
+        for _, element in iterparse(stream):
+            if element.tag == f'{MAIN_NS}si':
+                strings.append(element_text(element))
+                element.clear()
+    return strings
+
+
+def sheet_members(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """(sheet name, zip member) of every visible sheet, in workbook order."""
+    targets = {}
+    with archive.open('xl/_rels/workbook.xml.rels') as stream:
+        for _, element in iterparse(stream):
+            if element.tag == f'{PACKAGE_REL_NS}Relationship':
+                target = element.get('Target', '')
+                # Targets are relative to xl/ unless absolute within the package
+                targets[element.get('Id')] = target.lstrip('/') if target.startswith('/') else \
+                    posixpath.normpath(posixpath.join('xl', target))
+    sheets = []
+    with archive.open('xl/workbook.xml') as stream:
+        for _, element in iterparse(stream):
+            if element.tag == f'{MAIN_NS}sheet' and element.get('state', 'visible') == 'visible':
+                member = targets.get(element.get(f'{REL_NS}id'))
+                if member:
+                    sheets.append((element.get('name', ''), member))
+    return sheets
+
+
+def iter_rows(archive: zipfile.ZipFile, member: str, shared: List[str]) -> Iterator[List[str]]:
+    """Cell text of each row of a sheet, trailing blanks trimmed and gaps filled.
+
+    Rows are the bulk of a workbook, so they are read with expat callbacks
+    rather than iterparse: no element tree is built, and only the rows
+    parsed from the current 64 KB of the sheet are held at once.
+    """
+    rows = []
+    row = None
+    cell = None
+    parts = []
+    state = {'collect': False, 'phonetic': 0}
+
+    def start(name, attrs):
+        nonlocal row, cell
+        if name == ROW_TAG:
+            row = []
+        elif name == CELL_TAG:
+            cell = (attrs.get('t', 'n'), attrs.get('r'))
+            parts.clear()
+        elif name == VALUE_TAG or name == TEXT_TAG:
+            state['collect'] = not state['phonetic']
+        elif name == PHONETIC_TAG:
+            state['phonetic'] += 1
+
+    def end(name):
+        nonlocal row
+        if name == VALUE_TAG or name == TEXT_TAG:
+            state['collect'] = False
+        elif name == PHONETIC_TAG:
+            state['phonetic'] -= 1
+        elif name == CELL_TAG and row is not None:
+            kind, ref = cell
+            text = ''.join(parts)
+            if kind == 's' and text:
+                index = int(text)
+                text = shared[index] if index < len(shared) else ''
+            elif kind == 'b':
+                text = 'TRUE' if text == '1' else 'FALSE'
+            position = column_index(ref) if ref else len(row)
+            if position > len(row):
+                row.extend([''] * (position - len(row)))
+            row.append(text.strip())
+        elif name == ROW_TAG:
+            while row and not row[-1]:
+                row.pop()
+            rows.append(row)
+            row = None
+
+    def characters(data):
+        if state['collect']:
+            parts.append(data)
+
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = characters
+    parser.buffer_text = True
+    with archive.open(member) as stream:
+        while True:
+            chunk = stream.read(65536)
+            parser.Parse(chunk, not chunk)
+            yield from rows
+            rows.clear()
+            if not chunk:
+                break
+
+
+def split_header(rows: List[List[str]]) -> Tuple[List[str], List[List[str]]]:
+    """Column names from a sheet's first rows, and the data rows among them.
+
+    Rows above the header are banded titles over merged cells ("Early
+    Warning" spanning several controls); each label carries right until the
+    next one and prefixes the column names beneath it.
+    """
+    if not rows:
+        return [], []
+    filled = [sum(1 for cell in row if cell) for row in rows]
+    position = next(index for index, count in enumerate(filled) if count * 2 >= max(filled))
+    width = max(len(row) for row in rows[:position + 1])
+    prefixes = [[] for _ in range(width)]
+    for band in rows[:position]:
+        label = ''
+        for index in range(width):
+            label = band[index] if index < len(band) and band[index] else label
+            if label:
+                prefixes[index].append(label)
+    header = rows[position] + [''] * (width - len(rows[position]))
+    columns = [' / '.join(prefix + [name] if name else prefix) for prefix, name in zip(prefixes, header)]
+    return columns, rows[position + 1:]
+
+
+def render_table(columns: List[str], rows: List[List[str]]) -> str:
+    """A static HTML table, shown before (or without) JavaScript."""
+    lines = ['<table class="table table-sm workbook-table">', '<thead><tr>']
+    lines.extend(f'<th>{html.escape(column)}</th>' for column in columns)
+    lines.append('</tr></thead><tbody>')
+    for row in rows:
+        cells = row + [''] * (len(columns) - len(row))
+        lines.append('<tr>' + ''.join(f'<td>{html.escape(cell)}</td>' for cell in cells) + '</tr>')
+    lines.append('</tbody></table>')
+    return '\n'.join(lines)
+
+
+class WorkbookPages:
+    """Keeps the workbook pages under workbooks/ in step with the workbooks in the sections."""
+
+    VERSION = 1
+
+    def __init__(self, site_dir: Path, cache_path: Optional[Path] = None):
+        self.site_dir = site_dir
+        self.output_dir = site_dir / WORKBOOKS_DIR
+        self.cache_path = cache_path or site_dir / BUILD_CACHE_DIR / 'workbooks.json'
+        self.workbooks = self._load()
+        self.stats = {'workbooks': 0, 'converted': 0, 'unchanged': 0, 'failed': 0, 'sheets': 0, 'rows': 0}
+        # Search documents of the sheets converted this run
+        self.documents = []
+        # (source path, message) of workbooks that could not be read
+        self.failures = []
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            count_read(len(text))
+            cache = json.loads(text)
+        except (OSError, ValueError):
+            return {}
+        return cache.get('workbooks', {}) if cache.get('version') == self.VERSION else {}
+
+    def doc_ids(self) -> List[str]:
+        """Search document ids of every sheet page."""
+        return [f"{WORKBOOKS_DIR}/{record['slug']}/{sheet['slug']}"
+                for record in self.workbooks.values() for sheet in record['sheets']]
+
+    def is_current(self, record: Optional[Dict], sha256: str) -> bool:
+        if not record or record['sha256'] != sha256:
+            return False
+        return all((self.site_dir / rel).exists() for rel in record['files'])
+
+    def build(self, workbooks: List[Tuple[Path, str, str]],
+              is_indexed: Callable[[str], bool] = lambda doc_id: True) -> Dict:
+        """Bring the pages up to date for workbooks, given as (path, source key, sha256).
+
+        A workbook whose hash matches the cache, whose files are all in place
+        and whose sheets are all in the search index is skipped unopened.
+        """
+        previous = self.workbooks
+        self.workbooks = {}
+        slugs = set()
+        for path, key, sha256 in workbooks:
+            record = previous.get(key)
+            slug = slugify(path.stem)
+            if slug in slugs:
+                slug = slugify(key.rsplit('.', 1)[0])
+            slugs.add(slug)
+            if record and record['slug'] == slug and self.is_current(record, sha256) and all(
+                    is_indexed(f"{WORKBOOKS_DIR}/{slug}/{sheet['slug']}") for sheet in record['sheets']):
+                self.workbooks[key] = record
+                outcome = 'unchanged'
+            else:
+                self.workbooks[key] = self.convert(path, slug, sha256)
+                outcome = 'converted'
+            # A broken workbook is remembered by hash, not reopened every run
+            if self.workbooks[key].get('error'):
+                self.failures.append((key, self.workbooks[key]['error']))
+                outcome = 'failed'
+            self.stats[outcome] += 1
+
+        self.stats['workbooks'] = len(self.workbooks)
+        self.stats['sheets'] = sum(len(record['sheets']) for record in self.workbooks.values())
+        self.stats['rows'] = sum(sheet['rows'] for record in self.workbooks.values() for sheet in record['sheets'])
+        has_sheets = any(record['sheets'] for record in self.workbooks.values())
+        if self.workbooks == previous and has_sheets == (self.output_dir / 'index.html').exists():
+            return self.stats
+
+        # Pages of workbooks that were removed or renamed
+        current = {rel for record in self.workbooks.values() for rel in record['files']}
+        for record in previous.values():
+            for rel in record['files']:
+                if rel not in current and (self.site_dir / rel).exists():
+                    (self.site_dir / rel).unlink()
+        if has_sheets:
+            write_if_changed(self.output_dir / 'index.html', self.index_page())
+        elif (self.output_dir / 'index.html').exists():
+            (self.output_dir / 'index.html').unlink()
+        if self.output_dir.exists():
+            for directory in sorted(self.output_dir.glob('**/*'), reverse=True) + [self.output_dir]:
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+
+        write_if_changed(self.cache_path, json.dumps({'version': self.VERSION, 'workbooks': self.workbooks},
+                                                     indent=2, sort_keys=True) + '\n')
+        return self.stats
+
+    def convert(self, path: Path, slug: str, sha256: str) -> Dict:
+        """Write the pages and row files of every sheet of one workbook."""
+        files = []
+        sheets = []
+        documents = len(self.documents)
+        record = {'sha256': sha256, 'name': path.name, 'title': path.stem, 'slug': slug}
+        try:
+            with zipfile.ZipFile(path) as archive:
+                shared = read_shared_strings(archive)
+                used = set()
+                for name, member in sheet_members(archive):
+                    sheet_slug = slugify(name)
+                    while sheet_slug in used:
+                        sheet_slug += '-1'
+                    used.add(sheet_slug)
+                    sheets.append(self.convert_sheet(archive, member, shared, path, slug, name, sheet_slug, files))
+        except WORKBOOK_ERRORS as e:
+            # Drop whatever the failed workbook got as far as writing
+            for rel in files:
+                (self.site_dir / rel).unlink(missing_ok=True)
+            del self.documents[documents:]
+            return dict(record, sheets=[], files=[], error=f"{type(e).__name__}: {e}")
+        return dict(record, sheets=sheets, files=sorted(files))
+
+    def convert_sheet(self, archive: zipfile.ZipFile, member: str, shared: List[str], path: Path,
+                      slug: str, name: str, sheet_slug: str, files: List[str]) -> Dict:
+        rows_dir = self.output_dir / slug / sheet_slug
+        title = f"{path.stem}: {name}"
+        terms = Counter()
+        first_page = None
+        page = []
+        pages = 0
+        count = 0
+
+        def flush():
+            nonlocal first_page, page, pages
+            if first_page is None:
+                first_page = page
+            pages += 1
+            target = rows_dir / f'rows-{pages:03d}.json'
+            write_if_changed(target, json.dumps(page, separators=(',', ':'), ensure_ascii=False))
+            files.append(target.relative_to(self.site_dir).as_posix())
+            page = []
+
+        def weigh(text: str, field: str):
+            for word, occurrences in Counter(WORD_PATTERN.findall(text.lower())).items():
+                if len(word) > 1 and word not in STOP_WORDS:
+                    terms[stem(word)] += occurrences * FIELD_WEIGHTS[field]
+
+        weigh(title, 'title')
+        rows = (row for row in iter_rows(archive, member, shared) if row)
+        columns, head_rows = split_header(list(itertools.islice(rows, HEADER_SCAN_ROWS)))
+        weigh(' '.join(columns), 'heading')
+        width = len(columns)
+        for row in itertools.chain(head_rows, rows):
+            weigh(' '.join(row), 'body')
+            width = max(width, len(row))
+            page.append(row)
+            count += 1
+            if len(page) == PAGE_SIZE:
+                flush()
+        if page or not pages:
+            flush()
+        columns += [''] * (width - len(columns))
+
+        permalink = f'/{WORKBOOKS_DIR}/{slug}/{sheet_slug}/'
+        page_path = self.output_dir / slug / f'{sheet_slug}.html'
+        write_if_changed(page_path, self.sheet_page(path, title, permalink, columns, first_page or [], count, pages))
+        files.append(page_path.relative_to(self.site_dir).as_posix())
+
+        summary = f"{count} rows of {path.name}. Columns: {', '.join(column for column in columns if column)}"
+        if len(summary) > SUMMARY_LENGTH:
+            summary = summary[:SUMMARY_LENGTH].rsplit(' ', 1)[0] + '…'
+        self.documents.append((f'{WORKBOOKS_DIR}/{slug}/{sheet_slug}', title, permalink, dict(terms), summary))
+        return {'name': name, 'slug': sheet_slug, 'permalink': permalink, 'rows': count,
+                'pages': pages, 'columns': len(columns)}
+
+    def sheet_page(self, path: Path, title: str, permalink: str, columns: List[str],
+                   first_page: List[List[str]], count: int, pages: int) -> str:
+        download = f"/assets/{path.suffix.lstrip('.').lower()}/{quote(path.name)}"
+        return f"""---
+layout: page
+title: {json.dumps(title, ensure_ascii=False)}
+permalink: {permalink}
+---
+
+<p>{count} rows from <a href="{{{{ '{download}' | relative_url }}}}">{html.escape(path.name)}</a>.
+Type in the box to filter every row.</p>
+
+<div class="workbook-sheet" data-rows="{{{{ '{permalink}' | relative_url }}}}" data-pages="{pages}"
+     data-page-size="{PAGE_SIZE}" data-count="{count}"
+     data-columns="{html.escape(json.dumps(columns, ensure_ascii=False))}">
+  <input type="search" class="form-control workbook-filter" placeholder="Filter rows" aria-label="Filter rows">
+  <div class="workbook-rows">
+{{% raw %}}
+{render_table(columns, first_page)}
+{{% endraw %}}
+  </div>
+  <nav class="workbook-pager"></nav>
+</div>
+
+<script src="{{{{ '/assets/js/workbook.js' | relative_url }}}}"></script>
+"""
+
+    def index_page(self) -> str:
+        lines = ['---', 'layout: page', 'title: Workbooks', f'permalink: /{WORKBOOKS_DIR}/', '---', '',
+                 'Spreadsheets from the guide, browsable and filterable sheet by sheet.', '']
+        for record in sorted(self.workbooks.values(), key=lambda record: record['title'].lower()):
+            if not record['sheets']:
+                continue
+            lines.append(f"## {record['title']}")
+            lines.append('')
+            for sheet in record['sheets']:
+                lines.append(f"- [{sheet['name']}]({{{{ '{sheet['permalink']}' | relative_url }}}}) ({sheet['rows']} rows)")
+            lines.append('')
+        return '\n'.join(lines)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python3 workbook_pages.py "path/to/workbook.xlsx"')
+        sys.exit(1)
+    with zipfile.ZipFile(sys.argv[1]) as archive:
+        shared = read_shared_strings(archive)
+        for name, member in sheet_members(archive):
+            rows = sum(1 for row in iter_rows(archive, member, shared) if row)
+            print(f"{rows:>7} rows  {name}")
+
+
+if __name__ == "__main__":
+    main()